@@ -3,16 +3,65 @@ en: Main file of the project for running the application.
 ru: Главный файл проекта для запуска приложения.
 """
 
-import json
+import argparse
+import builtins
+import sys
 
-from src.hh_parser import HHFindVacancy, HHVacancy, HHSalary, HHEmployer
-from src.api_parser import JobObject
-from src.user_interface import WidgetCLI, UserInterface
+from src.user_interface import UserInterface
+from src.metrics import metrics
 
 
-def run():
-    ui = UserInterface()
-    ui.start()
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="hh.ru vacancies client")
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="PATH",
+        help="collect metrics and dump them on exit (to PATH or to stdout)"
+    )
+    parser.add_argument("--stats-format", choices=["prometheus", "json"], default="prometheus")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile",
+        default=None,
+        metavar="DIR",
+        help="profile the session and write results to DIR (folded stacks, screen render times, memory)"
+    )
+    parser.add_argument("--profiler", choices=["sampling", "cprofile"], default="sampling")
+    parser.add_argument("--replay", metavar="FILE", help="replay user input from FILE, one input per line")
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] = None):
+    args = parse_args(argv)
+    if args.stats:
+        metrics.enable()
+    input_func = None
+    if args.replay:
+        from src.profiling import ScriptedInput
+        input_func = ScriptedInput.from_file(args.replay)
+    try:
+        if args.profile:
+            from src.profiling import ProfileSession
+            with ProfileSession(args.profile, args.profiler, input_func=input_func) as session:
+                session.instrument(UserInterface()).start()
+        elif input_func:
+            saved_input, builtins.input = builtins.input, input_func
+            try:
+                UserInterface().start()
+            finally:
+                builtins.input = saved_input
+        else:
+            ui = UserInterface()
+            ui.start()
+    finally:
+        if args.stats:
+            text = metrics.dump(args.stats, args.stats_format)
+            if args.stats == "-":
+                sys.stdout.write(text)
 
 
 if __name__ == "__main__":
@@ -32,6 +32,16 @@ class ApiQueryError(ApiBaseError):
 
     def __init__(self, *args, **kwargs):
         self.message = args[0] if args else "Query error"
+        self.status = kwargs.get("status")
+
+
+class CircuitOpenError(ApiBaseError):
+    """
+    ru: Класс ошибки для запроса при разомкнутом предохранителе (сервис недоступен).
+    en: Error class for a request while the circuit breaker is open (service unavailable).
+    """
+    def __init__(self, *args, **kwargs):
+        self.message = args[0] if args else "Circuit open"
 
 
 class AttrIntersectionError(ApiBaseError):
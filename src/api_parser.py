@@ -5,11 +5,38 @@ en: Module for working with API for parsing data from various sites.
     In the hh_parser module - an example is implemented based on the OpenAPI from hh.ru
 """
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import codecs
+import contextlib
+import copy
+import datetime
+import email.utils
+import json
+import random
+import threading
+import time
+
 import requests
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from src.api_errors import (
-    ApiQueryError
+    ApiQueryError,
+    CircuitOpenError
 )
+from src.metrics import metrics
+
+
+def scope_labels(self, *args, **kwargs) -> dict:
+    """
+    ru: Метки метрик запроса к API.
+    en: Metric labels of an API request.
+    """
+    return {"scope": self.breaker_scope}
 
 
 class Api(ABC):
@@ -24,6 +51,525 @@ class Api(ABC):
         pass
 
 
+def iter_json_items(chunks, key: str = "items", meta: dict = None):
+    """
+    ru: Потоковый разбор JSON-объекта (чистый Python): элементы массива по ключу key верхнего уровня
+        отдаются по одному по мере поступления байтов. Остальные поля верхнего уровня
+        после разбора записываются в словарь meta.
+    en: Streaming parsing of a JSON object (pure Python): elements of the top-level key array
+        are yielded one by one as bytes arrive. The other top-level fields
+        are written to the meta dictionary after parsing.
+    :param chunks: итератор байтовых фрагментов ответа
+    :param key: ключ массива верхнего уровня
+    :param meta: словарь для остальных полей верхнего уровня
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    raw_decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    state = {"buffer": "", "ended": False}
+
+    def read() -> bool:
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                state["buffer"] += text
+                return True
+        if not state["ended"]:
+            state["ended"] = True
+            state["buffer"] += decoder.decode(b"", final=True)
+        return False
+
+    def skip(position: int, chars: str) -> int:
+        while True:
+            buffer = state["buffer"]
+            while position < len(buffer) and buffer[position] in chars:
+                position += 1
+            if position < len(buffer) or not read():
+                return position
+
+    # поиск ключа на первом уровне вложенности / search for the key at the first nesting level
+    key_token = json.dumps(key)
+    position = depth = 0
+    in_string = escape = False
+    string_start = object_start = None
+    while True:
+        if position >= len(state["buffer"]) and not read():
+            raise ValueError(f"Key «{key}» not found")
+        char = state["buffer"][position]
+        position += 1
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+                if depth == 1 and state["buffer"][string_start:position] == key_token:
+                    colon = skip(position, " \t\r\n")
+                    if state["buffer"][colon:colon + 1] == ":":
+                        break
+        elif char == '"':
+            in_string = True
+            string_start = position - 1
+        elif char in "{[":
+            depth += 1
+            if object_start is None:
+                object_start = position
+        elif char in "}]":
+            depth -= 1
+    prefix = state["buffer"][object_start:string_start]
+    position = skip(skip(position, " \t\r\n") + 1, " \t\r\n")
+    if state["buffer"][position:position + 1] != "[":
+        raise ValueError(f"Key «{key}» is not an array")
+    state["buffer"] = state["buffer"][position + 1:]
+    position = 0
+    # элементы массива / array elements
+    while True:
+        position = skip(position, " \t\r\n,")
+        buffer = state["buffer"]
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON")
+        if buffer[position] == "]":
+            position += 1
+            break
+        try:
+            item, end = raw_decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if not read():
+                raise
+            continue
+        if end == len(buffer) and not isinstance(item, (dict, list)) and read():
+            # число могло быть обрезано на границе фрагмента / a number may be cut at a chunk boundary
+            continue
+        yield item
+        # освобождение памяти от разобранной части / freeing memory from the parsed part
+        state["buffer"] = buffer[end:]
+        position = 0
+    if meta is not None:
+        while read():
+            pass
+        meta.update(json.loads("{" + prefix + key_token + ":null" + state["buffer"][position:]))
+        meta.pop(key)
+
+
+def iter_json_items_ijson(file, key: str = "items", meta: dict = None):
+    """
+    ru: Потоковый разбор JSON-объекта через ijson (тот же результат, что и iter_json_items).
+    en: Streaming parsing of a JSON object through ijson (same result as iter_json_items).
+    :param file: файловый объект ответа
+    :param key: ключ массива верхнего уровня
+    :param meta: словарь для остальных полей верхнего уровня
+    """
+    item_prefix = f"{key}.item"
+    builder = target = None
+    for prefix, event, value in ijson.parse(file, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == target and event in ("end_map", "end_array"):
+                if target == item_prefix:
+                    yield builder.value
+                elif meta is not None:
+                    meta[target] = builder.value
+                builder = None
+            continue
+        if prefix == item_prefix or (prefix and "." not in prefix and prefix != key):
+            if event in ("start_map", "start_array"):
+                builder, target = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+            elif event != "map_key":
+                if prefix == item_prefix:
+                    yield value
+                elif meta is not None:
+                    meta[prefix] = value
+
+
+class TokenBucket:
+    """
+    ru: Ограничитель частоты запросов (token bucket).
+        Токены пополняются со скоростью rate в секунду до capacity; каждый запрос забирает один токен
+        или ждет его появления. Потокобезопасен.
+    en: Request rate limiter (token bucket).
+        Tokens are refilled at rate per second up to capacity; each request takes one token
+        or waits for it. Thread-safe.
+    """
+    def __init__(self, rate: float, capacity: int):
+        """
+        :param rate: скорость пополнения (запросов в секунду)
+        :param capacity: емкость (максимальная пачка запросов)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        ru: Получить токен (с ожиданием).
+        en: Acquire a token (with waiting).
+        :return: время ожидания в секундах
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RetryPolicy:
+    """
+    ru: Политика повторов запроса: экспоненциальная задержка со случайным разбросом (full jitter)
+        и учетом заголовка Retry-After.
+    en: Request retry policy: exponential backoff with full jitter
+        honoring the Retry-After header.
+    """
+    def __init__(
+            self,
+            retries: int = 5,
+            backoff: float = 0.5,
+            max_backoff: float = 30.0,
+            statuses: tuple = (429, 500, 502, 503, 504)
+    ):
+        """
+        :param retries: количество повторов
+        :param backoff: базовая задержка в секундах
+        :param max_backoff: максимальная задержка в секундах
+        :param statuses: коды ответа, при которых запрос повторяется
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """
+        ru: Разбор заголовка Retry-After (секунды или HTTP-дата).
+        en: Parsing the Retry-After header (seconds or HTTP date).
+        """
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        ru: Задержка перед повтором.
+        en: Delay before a retry.
+        :param attempt: номер попытки (с 0)
+        :param retry_after: значение заголовка Retry-After
+        """
+        seconds = self.parse_retry_after(retry_after)
+        if seconds is not None:
+            return min(seconds, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    ru: Предохранитель (circuit breaker) для области запросов.
+        closed - запросы проходят; после failure_threshold ошибок подряд - open:
+        запросы сразу отклоняются recovery_timeout секунд; затем half-open - проходит один пробный запрос,
+        успех замыкает предохранитель, ошибка снова размыкает.
+    en: Circuit breaker for a request scope.
+        closed - requests pass; after failure_threshold consecutive failures - open:
+        requests are rejected immediately for recovery_timeout seconds; then half-open - one trial request passes,
+        success closes the breaker, failure opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        :param failure_threshold: количество ошибок подряд для размыкания
+        :param recovery_timeout: время в секундах до пробного запроса
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def before(self, scope: str):
+        """
+        ru: Проверка перед запросом.
+        en: Check before a request.
+        :param scope: область запросов (для сообщения об ошибке)
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self.opened_at + self.recovery_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                self.trial = False
+            if self.state == self.HALF_OPEN and not self.trial:
+                self.trial = True
+                return
+            raise CircuitOpenError(f"«{scope}»: circuit {self.state}, retry in {max(remaining, 0):.0f} s")
+
+    def success(self):
+        """
+        ru: Успешный запрос.
+        en: Successful request.
+        """
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def failure(self):
+        """
+        ru: Неуспешный запрос.
+        en: Failed request.
+        """
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """
+        ru: Запрос прерван не по вине сервиса (Ctrl-C, ошибка вызывающего кода): состояние не меняется,
+            освобождается только пробный запрос half-open.
+        en: The request was interrupted not by the service (Ctrl-C, a caller error): the state does not change,
+            only the half-open trial request is released.
+        """
+        with self.lock:
+            self.trial = False
+
+
+def accept_encoding() -> str:
+    """
+    ru: Значение заголовка Accept-Encoding: gzip и deflate всегда, br - если установлен brotli.
+    en: Accept-Encoding header value: gzip and deflate always, br - if brotli is installed.
+    """
+    encodings = ["gzip", "deflate"]
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        encodings.append("br")
+        break
+    return ", ".join(encodings)
+
+
+# поддерживаемые сжатия ответа / supported response compressions
+ACCEPT_ENCODING = accept_encoding()
+
+
+class ChunksReader:
+    """
+    ru: Файловый объект поверх итератора байтовых фрагментов (для ijson).
+    en: File object over an iterator of byte chunks (for ijson).
+    """
+    def __init__(self, chunks):
+        """
+        :param chunks: итератор байтовых фрагментов
+        """
+        self.chunks = iter(chunks)
+        self.buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        ru: Прочитать до size байт.
+        en: Read up to size bytes.
+        """
+        while size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+class RequestsTransport:
+    """
+    ru: HTTP-транспорт на requests (HTTP/1.1) с пулом соединений (requests.Session).
+        requests.Session не потокобезопасна, поэтому сессия создается лениво, своя в каждом потоке.
+    en: HTTP transport based on requests (HTTP/1.1) with a connection pool (requests.Session).
+        requests.Session is not thread-safe, so the session is created lazily, one per thread.
+    """
+    name = "requests"
+
+    def __init__(self):
+        self.local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        ru: Сессия текущего потока (создается при первом запросе).
+        en: Session of the current thread (created on the first request).
+        """
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        return session
+
+    def get(self, url: str, headers: dict, params: dict, timeout: tuple, stream: bool = False):
+        """
+        ru: GET-запрос.
+        en: GET request.
+        :return: requests.Response
+        """
+        return self.session.get(url, headers=headers, params=params, timeout=timeout, stream=stream)
+
+    @staticmethod
+    def wire_bytes(response) -> int:
+        """
+        ru: Количество байт ответа, полученных по сети (до распаковки).
+        en: Number of response bytes received over the network (before decompression).
+        """
+        raw = getattr(response, "raw", None)
+        if raw is not None and hasattr(raw, "tell"):
+            try:
+                return raw.tell()
+            except (OSError, ValueError):
+                pass
+        return len(response.content)
+
+
+class HttpxResponse:
+    """
+    ru: Ответ httpx с интерфейсом requests.Response, который использует ApiBase.
+    en: httpx response with the requests.Response interface used by ApiBase.
+    """
+    def __init__(self, response):
+        """
+        :param response: httpx.Response
+        """
+        self.response = response
+        self.status_code = response.status_code
+        self.reason = response.reason_phrase
+        self.url = str(response.url)
+        self.headers = response.headers
+
+    @property
+    def content(self) -> bytes:
+        return self.response.read()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 65536):
+        return self.response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class HttpxTransport:
+    """
+    ru: HTTP-транспорт на httpx (необязательная зависимость) с поддержкой HTTP/2 (нужен пакет h2).
+        Ошибки httpx приводятся к исключениям requests, чтобы повторы и предохранитель работали одинаково.
+    en: HTTP transport based on httpx (optional dependency) with HTTP/2 support (requires the h2 package).
+        httpx errors are converted to requests exceptions so that retries and the circuit breaker work the same way.
+    """
+    name = "httpx"
+
+    def __init__(self, http2: bool = True):
+        """
+        :param http2: использовать HTTP/2
+        """
+        import httpx
+        self.httpx = httpx
+        self.client = httpx.Client(http2=http2)
+
+    def get(self, url: str, headers: dict, params: dict, timeout: tuple, stream: bool = False) -> HttpxResponse:
+        """
+        ru: GET-запрос.
+        en: GET request.
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        request = self.client.build_request(
+            "GET", url, headers=headers, params=params, timeout=self.httpx.Timeout(read, connect=connect)
+        )
+        try:
+            response = self.client.send(request, stream=stream)
+        except self.httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except self.httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        return HttpxResponse(response)
+
+    @staticmethod
+    def wire_bytes(response: HttpxResponse) -> int:
+        """
+        ru: Количество байт ответа, полученных по сети (до распаковки).
+        en: Number of response bytes received over the network (before decompression).
+        """
+        return response.response.num_bytes_downloaded or len(response.content)
+
+
+class SingleFlight:
+    """
+    ru: Объединение одинаковых одновременных вызовов (single-flight):
+        пока вызов с ключом выполняется, остальные вызовы с тем же ключом ждут его результат,
+        а не выполняют свой. Результат не кэшируется после завершения вызова.
+    en: Coalescing of identical concurrent calls (single-flight):
+        while a call with a key is in progress, other calls with the same key wait for its result
+        instead of running their own. The result is not cached after the call completes.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, function: callable) -> tuple[any, bool]:
+        """
+        ru: Выполнить функцию или дождаться результата такого же выполняющегося вызова.
+        en: Run the function or wait for the result of the same call in progress.
+        :param key: ключ вызова
+        :param function: функция без аргументов
+        :return: (результат, получен ли результат чужого вызова)
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {"event": threading.Event(), "result": None, "error": None}
+        if not leader:
+            call["event"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"], True
+        try:
+            call["result"] = function()
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call["event"].set()
+        return call["result"], False
+
+
 class ApiBase(Api):
     """
     ru: Базовый класс для работы с API.
@@ -32,14 +578,63 @@ class ApiBase(Api):
     en: Base class for working with API.
         Defines the request method and response check.
         It is recommended to use for inheritance, but you can use it independently.
+
+    ru: Ограничитель частоты (rate_limiter) и счетчики (stats) - общие для всех экземпляров.
+        Ответы 429 и 5xx, таймауты и ошибки соединения повторяются по retry_policy.
+    en: The rate limiter (rate_limiter) and counters (stats) are shared by all instances.
+        429 and 5xx responses, timeouts and connection errors are retried according to retry_policy.
     """
-    def __init__(self, scope: str, headers: dict = None):
+    # общий ограничитель частоты запросов / shared request rate limiter
+    rate_limiter = TokenBucket(rate=10, capacity=10)
+    # политика повторов / retry policy
+    retry_policy = RetryPolicy()
+    # таймаут запроса (соединение, чтение) в секундах / request timeout (connect, read) in seconds
+    timeout = (5, 30)
+    # общий HTTP-транспорт (RequestsTransport или HttpxTransport) / shared HTTP transport
+    transport = RequestsTransport()
+    # общие счетчики запросов / shared request counters
+    stats = {
+        "requests": 0,
+        "retries": 0,
+        "throttled": 0,
+        "timeouts": 0,
+        "rejected": 0,
+        "hedged": 0,
+        "not_modified": 0,
+        "coalesced": 0,
+        "wire_bytes": 0
+    }
+    # байты по сети по областям запросов / wire bytes per request scope
+    wire_bytes = {}
+    stats_lock = threading.Lock()
+    # объединение одинаковых одновременных запросов / coalescing of identical concurrent requests
+    coalesce = True
+    single_flight = SingleFlight()
+    # условные запросы (ETag / Last-Modified) / conditional requests (ETag / Last-Modified)
+    conditional = True
+    conditional_cache = OrderedDict()
+    conditional_cache_size = 256
+    # предохранители по областям запросов / circuit breakers per request scope
+    breakers = {}
+    breaker_options = {"failure_threshold": 5, "recovery_timeout": 30.0}
+    # дублирующий запрос, если ответа нет дольше p95 задержки / duplicate request if no response after p95 latency
+    hedge = False
+    hedge_default_delay = 1.0
+    hedge_min_samples = 20
+    latencies = {}
+    hedge_executor = None
+
+    def __init__(self, scope: str, headers: dict = None, breaker_scope: str = None):
         """
         ru: Инициализация класса.
         en: Class initialization.
         :param scope: request scope
+        :param breaker_scope: область предохранителя (по умолчанию - scope)
         """
         self.scope = scope
+        self.breaker_scope = breaker_scope or scope
+        # байты по сети последнего запроса / wire bytes of the last request
+        self.last_wire_bytes = 0
         self.headers = headers or {}
         self.__parameters = {}
 
@@ -61,24 +656,299 @@ class ApiBase(Api):
         """
         self.__parameters = value
 
+    @classmethod
+    def count(cls, name: str, value: int = 1):
+        """
+        ru: Увеличить общий счетчик.
+        en: Increment a shared counter.
+        """
+        with cls.stats_lock:
+            cls.stats[name] = cls.stats.get(name, 0) + value
+        metrics.inc("api_events_total", value, event=name)
+
+    @classmethod
+    def reset_stats(cls):
+        """
+        ru: Сбросить общие счетчики.
+        en: Reset shared counters.
+        """
+        with cls.stats_lock:
+            for name in cls.stats:
+                cls.stats[name] = 0
+            cls.wire_bytes.clear()
+
+    def record_wire_bytes(self, response):
+        """
+        ru: Учесть байты ответа, полученные по сети.
+        en: Account the response bytes received over the network.
+        """
+        self.last_wire_bytes = self.transport.wire_bytes(response)
+        with self.stats_lock:
+            self.stats["wire_bytes"] += self.last_wire_bytes
+            self.wire_bytes[self.breaker_scope] = self.wire_bytes.get(self.breaker_scope, 0) + self.last_wire_bytes
+        metrics.inc("api_wire_bytes_total", self.last_wire_bytes, scope=self.breaker_scope)
+
+    def cache_key(self) -> tuple:
+        """
+        ru: Ключ условного запроса (адрес и непустые параметры).
+        en: Conditional request key (url and non-empty parameters).
+        """
+        return self.scope, tuple(sorted((key, str(value)) for key, value in self.parameters.items() if value is not None))
+
+    @classmethod
+    def get_breaker(cls, scope: str) -> CircuitBreaker:
+        """
+        ru: Предохранитель области запросов (создается при первом обращении).
+        en: Circuit breaker of the request scope (created on first access).
+        """
+        with cls.stats_lock:
+            if scope not in cls.breakers:
+                cls.breakers[scope] = CircuitBreaker(**cls.breaker_options)
+            return cls.breakers[scope]
+
+    @classmethod
+    def reset_breakers(cls):
+        """
+        ru: Сбросить предохранители и статистику задержек.
+        en: Reset circuit breakers and latency statistics.
+        """
+        with cls.stats_lock:
+            cls.breakers.clear()
+            cls.latencies.clear()
+
+    def record_latency(self, seconds: float):
+        """
+        ru: Сохранить задержку успешного запроса области.
+        en: Record the latency of a successful request of the scope.
+        """
+        with self.stats_lock:
+            self.latencies.setdefault(self.breaker_scope, deque(maxlen=200)).append(seconds)
+
+    def hedge_delay(self) -> float:
+        """
+        ru: Задержка перед дублирующим запросом - p95 задержки области.
+        en: Delay before a hedged request - p95 latency of the scope.
+        """
+        with self.stats_lock:
+            samples = list(self.latencies.get(self.breaker_scope, ()))
+        samples.sort()
+        if len(samples) < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    @metrics.timed("api_request_seconds", scope_labels)
     def _query(self) -> dict:
         """
         ru: Метод запроса.
+            Запрос идет через предохранитель области (breaker_scope): при разомкнутом предохранителе
+            сразу выбрасывается CircuitOpenError. При hedge = True через p95 задержки без ответа
+            отправляется дублирующий запрос (только для идемпотентных GET) и берется первый ответ.
         en: Request method.
+            The request goes through the scope circuit breaker (breaker_scope): while it is open
+            CircuitOpenError is raised immediately. With hedge = True a duplicate request is sent
+            after p95 latency without a response (only for idempotent GETs) and the first response wins.
+
+        ru: При coalesce = True одновременные запросы с одинаковыми адресом и параметрами
+            выполняются одним HTTP-запросом; остальные получают копию его результата.
+        en: With coalesce = True concurrent requests with the same url and parameters
+            are served by one HTTP request; the others get a copy of its result.
         :return: dict
         """
-        response = requests.get(
-            self.scope,
-            headers=self.headers,
-            params=self.parameters
-        )
-        status = response.status_code
-        if status == 200:
-            return response.json()
-        else:
+        def request() -> dict:
+            return self._guarded(lambda: self._query_hedged() if self.hedge else self._query_retry())
+
+        if not self.coalesce:
+            return request()
+        result, shared = self.single_flight.do(self.cache_key(), request)
+        if shared:
+            self.count("coalesced")
+            return copy.deepcopy(result)
+        return result
+
+    def _query_stream(self, key: str = "items", meta: dict = None):
+        """
+        ru: Потоковый метод запроса: тело ответа не буферизуется целиком,
+            элементы массива по ключу key отдаются по одному (через ijson, если он установлен).
+        en: Streaming request method: the response body is not buffered entirely,
+            elements of the key array are yielded one by one (through ijson if it is installed).
+        :param key: ключ массива верхнего уровня
+        :param meta: словарь для остальных полей ответа (found, pages, ...) - заполняется после разбора
+        """
+        # результат для предохранителя записывается после разбора всего тела ответа
+        # the breaker outcome is recorded after the whole response body has been parsed
+        with self._breaker():
+            start = time.monotonic()
+            response = self._send(stream=True)
+            self.record_latency(time.monotonic() - start)
+            with response:
+                chunks = response.iter_content(chunk_size=65536)
+                if ijson is not None:
+                    yield from iter_json_items_ijson(ChunksReader(chunks), key, meta)
+                else:
+                    yield from iter_json_items(chunks, key, meta)
+                self.record_wire_bytes(response)
+
+    @contextlib.contextmanager
+    def _breaker(self):
+        """
+        ru: Контекст запроса через предохранитель области (breaker_scope): результат записывается при выходе.
+            Ошибкой считаются только ApiQueryError без статуса или со статусом повтора (429, 5xx)
+            и исключения requests.
+        en: Request context through the scope circuit breaker (breaker_scope): the outcome is recorded on exit.
+            Only ApiQueryError without a status or with a retry status (429, 5xx)
+            and requests exceptions count as failures.
+        """
+        breaker = self.get_breaker(self.breaker_scope)
+        try:
+            breaker.before(self.breaker_scope)
+        except CircuitOpenError:
+            self.count("rejected")
+            raise
+        try:
+            yield
+        except ApiQueryError as e:
+            if e.status is None or e.status in self.retry_policy.statuses:
+                breaker.failure()
+            else:
+                breaker.success()
+            raise
+        except requests.RequestException:
+            breaker.failure()
+            raise
+        except GeneratorExit:
+            # потоковый ответ закрыт до конца разбора: сервис ответил успешно
+            # a streaming response is closed before the end of parsing: the service responded successfully
+            breaker.success()
+            raise
+        except BaseException:
+            # остальные исключения (KeyboardInterrupt, SystemExit, ошибки разбора) не говорят о сбое сервиса
+            # other exceptions (KeyboardInterrupt, SystemExit, parsing errors) do not indicate a service failure
+            breaker.release()
+            raise
+        breaker.success()
+
+    def _guarded(self, request: callable):
+        """
+        ru: Выполнение запроса через предохранитель области (breaker_scope).
+        en: Executing a request through the scope circuit breaker (breaker_scope).
+        :param request: функция запроса
+        """
+        with self._breaker():
+            start = time.monotonic()
+            result = request()
+            self.record_latency(time.monotonic() - start)
+        return result
+
+    def _query_hedged(self) -> dict:
+        """
+        ru: Запрос с дублированием: первый успешный из основного и дублирующего запросов.
+        en: Hedged request: the first successful of the primary and the duplicate requests.
+        """
+        with self.stats_lock:
+            if ApiBase.hedge_executor is None:
+                ApiBase.hedge_executor = ThreadPoolExecutor(max_workers=16)
+        futures = [self.hedge_executor.submit(self._query_retry)]
+        done, _ = wait(futures, timeout=self.hedge_delay())
+        if not done:
+            self.count("hedged")
+            futures.append(self.hedge_executor.submit(self._query_retry))
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _query_retry(self) -> dict:
+        """
+        ru: Запрос с повторами и разбором JSON ответа.
+            Если для запроса сохранены ETag / Last-Modified, запрос условный:
+            ответ 304 возвращает сохраненные данные без повторной передачи тела.
+            В кэше хранятся и из него возвращаются копии, поэтому результат можно изменять.
+        en: Request with retries and parsing of the JSON response.
+            If ETag / Last-Modified are saved for the request, the request is conditional:
+            a 304 response returns the saved data without transferring the body again.
+            The cache keeps and returns copies, so callers may modify the result.
+        :return: dict
+        """
+        key = self.cache_key()
+        cached = self.conditional_cache.get(key) if self.conditional else None
+        validators = {}
+        if cached:
+            if cached["etag"]:
+                validators["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                validators["If-Modified-Since"] = cached["last_modified"]
+        response = self._send(validators=validators)
+        if response.status_code == 304 and cached:
+            self.count("not_modified")
+            self.record_wire_bytes(response)
+            return copy.deepcopy(cached["data"])
+        data = response.json()
+        self.record_wire_bytes(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self.conditional and (etag or last_modified):
+            with self.stats_lock:
+                self.conditional_cache[key] = {
+                    "etag": etag, "last_modified": last_modified, "data": copy.deepcopy(data)
+                }
+                self.conditional_cache.move_to_end(key)
+                while len(self.conditional_cache) > self.conditional_cache_size:
+                    self.conditional_cache.popitem(last=False)
+        return data
+
+    def _send(self, stream: bool = False, validators: dict = None):
+        """
+        ru: Запрос с повторами.
+            Перед каждой попыткой берется токен ограничителя частоты;
+            при 429/5xx, таймауте или ошибке соединения запрос повторяется с задержкой;
+            если повторы закончились, ошибка сети выбрасывается как ApiQueryError (status=None).
+        en: Request with retries.
+            A rate limiter token is taken before each attempt;
+            on 429/5xx, timeout or connection error the request is retried with a delay;
+            when retries run out, a network error is raised as ApiQueryError (status=None).
+        :param stream: не загружать тело ответа сразу
+        :param validators: заголовки условного запроса (If-None-Match, If-Modified-Since)
+        :return: успешный ответ (или 304 для условного запроса)
+        """
+        policy = self.retry_policy
+        headers = {"Accept-Encoding": ACCEPT_ENCODING} | self.headers | (validators or {})
+        for attempt in range(policy.retries + 1):
+            self.rate_limiter.acquire()
+            self.count("requests")
+            try:
+                response = self.transport.get(
+                    self.scope,
+                    headers=headers,
+                    params=self.parameters,
+                    timeout=self.timeout,
+                    stream=stream
+                )
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if isinstance(e, requests.exceptions.Timeout):
+                    self.count("timeouts")
+                if attempt == policy.retries:
+                    raise ApiQueryError(f"«{self.scope}»: {type(e).__name__}", status=None) from e
+                self.count("retries")
+                time.sleep(policy.delay(attempt))
+                continue
+            status = response.status_code
+            if status == 200 or (status == 304 and validators):
+                return response
+            response.close()
+            if status in policy.statuses and attempt < policy.retries:
+                if status == 429:
+                    self.count("throttled")
+                self.count("retries")
+                time.sleep(policy.delay(attempt, response.headers.get("Retry-After")))
+                continue
             type_ = response.reason
             url = response.url
-            raise ApiQueryError(f"«{url}»: [{status}] {type_}")
+            raise ApiQueryError(f"«{url}»: [{status}] {type_}", status=status)
 
 
 class ApiFindBase(ApiBase):
@@ -88,24 +958,29 @@ class ApiFindBase(ApiBase):
     en: Base class for working with search API.
         Defines methods for searching.
     """
-    def __init__(self, scope: str, headers: dict = None):
+    def __init__(self, scope: str, headers: dict = None, breaker_scope: str = None):
         self.headers = headers or {}
-        super().__init__(scope, self.headers)
+        super().__init__(scope, self.headers, breaker_scope)
 
-    def find(self, **kwargs) -> dict:
+    def find(self, stream: bool = False, meta: dict = None, **kwargs):
         """
         ru: Метод поиска.
         en: Search method.
-        :return: dict
+        :param stream: вернуть генератор элементов "items" с потоковым разбором ответа
+        :param meta: словарь для остальных полей ответа (found, pages, ...) при stream=True -
+            заполняется после разбора всего ответа
+        :return: dict (или генератор словарей при stream=True)
         """
         self.parameters = kwargs
+        if stream:
+            return self._query_stream(meta=meta)
         return self._query()
 
 
 class ApiInfoBase(ApiBase):
-    def __init__(self, scope, id_, headers=None):
+    def __init__(self, scope, id_, headers=None, breaker_scope=None):
         self.headers = headers or {}
-        super().__init__(f"{scope}/{id_}", headers)
+        super().__init__(f"{scope}/{id_}", headers, breaker_scope or scope)
 
     def info(self, id_: int | str, **kwargs) -> dict:
         self.parameters = kwargs
@@ -176,17 +1051,21 @@ class GenerateObjectsListBase(ABC):
     def generate(self):
         pass
 
+    @abstractmethod
+    def iter_generate(self):
+        pass
+
 
 class GenerateObjectsList(GenerateObjectsListBase):
     """
     ru: Класс для генерации списка объектов.
     en: Class for generating a list of objects.
     """
-    def __init__(self, items: list[dict]):
+    def __init__(self, items):
         """
         ru: Инициализация класса.
         en: Class initialization.
-        :param items: список словарей c данными / list of dictionaries with data
+        :param items: список (или итератор) словарей c данными / list (or iterator) of dictionaries with data
         """
         self.items = items
 
@@ -197,9 +1076,25 @@ class GenerateObjectsList(GenerateObjectsListBase):
         """
         return JobObject
 
+    def prepare(self, item: dict) -> dict:
+        """
+        ru: Подготовка словаря данных перед созданием объекта.
+        en: Preparing a data dictionary before creating an object.
+        """
+        return item
+
+    def iter_generate(self):
+        """
+        ru: Генерация объектов по одному (подходит для потоковых ответов).
+        en: Generating objects one by one (suitable for streaming responses).
+        """
+        object_class = self.get_object()
+        for item in self.items:
+            yield object_class.create(**self.prepare(item))
+
     def generate(self):
         """
         ru: Генерация списка объектов.
         en: Generating a list of objects.
         """
-        return [self.get_object().create(**obj) for obj in self.items]
+        return list(self.iter_generate())
@@ -0,0 +1,272 @@
+"""
+ru: Неинтерактивный (пакетный) интерфейс командной строки для запуска по расписанию (cron, CI).
+    Запуск: python -m src.cli [--db DIR] [--backend json|jsonl] [--workers N] [--rate R] [--quiet] КОМАНДА
+Команды:
+    harvest: инкрементальная выгрузка вакансий сохраненного запроса (HHHarvester;
+        таблицы справочников заполняются один раз из кэша справочников DIR/reference.json)
+    enrich: дозагрузка работодателей сохраненных вакансий (EmployerEnricher)
+    export: потоковая выгрузка сохраненных вакансий плоскими строками в NDJSON, CSV, Parquet или Arrow
+    import: пакетный импорт вакансий из выгрузок NDJSON/JSON (HHImporter, каждая таблица записывается один раз)
+    texts: преобразование описаний вакансий и работодателей в текст (HtmlTextConverter, пул процессов)
+    dedup: назначение кластеров дублей сохраненным вакансиям без кластера (VacancyDeduplicator)
+    stats: количество записей и размер файлов таблиц базы
+    Прогресс выводится в stderr, результат команды - в stdout; код возврата 1 - ошибка API, сети или отсутствует pyarrow.
+
+en: Non-interactive (batch) command line interface for scheduled runs (cron, CI).
+    Run: python -m src.cli [--db DIR] [--backend json|jsonl] [--workers N] [--rate R] [--quiet] COMMAND
+Commands:
+    harvest: incremental harvesting of vacancies of a saved query (HHHarvester;
+        reference tables are populated once from the DIR/reference.json reference cache)
+    enrich: loading employers of saved vacancies (EmployerEnricher)
+    export: streaming export of saved vacancies as flat rows to NDJSON, CSV, Parquet or Arrow
+    import: bulk import of vacancies from NDJSON/JSON dumps (HHImporter, each table is written once)
+    texts: conversion of vacancy and employer descriptions to text (HtmlTextConverter, process pool)
+    dedup: duplicate cluster assignment for saved vacancies without a cluster (VacancyDeduplicator)
+    stats: record count and file size of database tables
+    Progress goes to stderr, the command result goes to stdout; exit code 1 - API or network error or missing pyarrow.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+from src.api_errors import ApiBaseError
+from src.api_parser import ApiBase, TokenBucket
+from src.config import DB_DIR, CHECKPOINTS_PATH, VACANCY_FIELDS
+from src.data_base import BaseDB, JsonDB, JsonLinesDB
+from src.dedup import VacancyDeduplicator
+from src.export import WRITERS, export_vacancies
+from src.harvester import CheckpointStore, HHHarvester, HHQuerySplitter, MAX_RESULTS
+from src.html_text import HtmlTextConverter
+from src.importer import HHImporter
+from src.reference import ReferenceCache
+from src.utils import CreateDB, EmployerEnricher
+
+# классы базы данных по названию / database classes by name
+BACKENDS = {"json": JsonDB, "jsonl": JsonLinesDB}
+
+
+class Progress:
+    """
+    ru: Класс вывода прогресса в stderr.
+        В терминале строка перерисовывается на месте, в файле журнала (cron) пишется не чаще раза в interval секунд
+        и при завершении этапа.
+    en: Class for progress output to stderr.
+        In a terminal the line is redrawn in place, in a log file (cron) it is written at most once per interval seconds
+        and when a stage finishes.
+    """
+    def __init__(self, stream=None, quiet: bool = False, interval: float = 5.0):
+        """
+        :param stream: поток вывода (по умолчанию - sys.stderr)
+        :param quiet: не выводить прогресс
+        :param interval: интервал вывода в секундах для потока, не являющегося терминалом
+        """
+        self.stream = stream or sys.stderr
+        self.quiet = quiet
+        self.interval = interval
+        self.tty = self.stream.isatty()
+        self.last = 0.0
+
+    def __call__(self, stage: str, done: int, total: int):
+        if self.quiet:
+            return
+        line = f"{stage}: {done}/{total}"
+        if self.tty:
+            self.stream.write("\r" + line + ("\n" if done >= total else ""))
+        else:
+            now = time.monotonic()
+            if done < total and now - self.last < self.interval:
+                return
+            self.last = now
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def message(self, text: str):
+        if not self.quiet:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+
+
+def open_db(path: str, backend: str = "json") -> BaseDB:
+    """
+    ru: Открыть базу данных и создать недостающие таблицы.
+    en: Open the database and create missing tables.
+    """
+    db = BACKENDS[backend](path)
+    CreateDB(db)
+    return db
+
+
+def query_parameters(args: argparse.Namespace) -> dict:
+    """
+    ru: Параметры запроса HHFindVacancy.find из аргументов команды harvest (пустые параметры не передаются).
+    en: HHFindVacancy.find request parameters from the harvest command arguments (empty parameters are skipped).
+    """
+    parameters = {
+        "text": args.text,
+        "area": args.area,
+        "experience": args.experience,
+        "employment": args.employment,
+        "schedule": args.schedule,
+        "only_with_salary": True if args.only_with_salary else None
+    }
+    return {key: value for key, value in parameters.items() if value is not None}
+
+
+def cmd_harvest(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    harvester = HHHarvester(
+        db,
+        CheckpointStore(args.checkpoints),
+        HHQuerySplitter(max_workers=args.workers),
+        initial_days=args.initial_days,
+        dedup=VacancyDeduplicator(db) if args.dedup else None,
+        references=ReferenceCache(os.path.join(args.db, "reference.json"))
+    )
+    result = {"harvested": harvester.harvest(progress=progress, **query_parameters(args))}
+    for parameters, found in harvester.splitter.truncated:
+        progress.message(f"incomplete partition ({found} found, {MAX_RESULTS} reachable): {parameters}")
+    result["truncated"] = len(harvester.splitter.truncated)
+    if args.enrich:
+        result |= cmd_enrich(args, db, progress)
+    return result
+
+
+def cmd_enrich(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    enricher = EmployerEnricher(db, max_workers=args.workers)
+    ids = list(dict.fromkeys(record["employer_id"] for record in db.select_value(VACANCY_FIELDS["name"])))
+    enriched = enricher.enrich_ids(ids, progress)
+    for id_, error in enricher.errors.items():
+        progress.message(f"employer {id_}: {error}")
+    return {"enriched": enriched, "errors": len(enricher.errors)}
+
+
+def cmd_export(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    areas = None
+    if args.area:
+        # регион с вложенными локациями по дереву справочника / the region with nested areas by the reference tree
+        areas = ReferenceCache(os.path.join(args.db, "reference.json")).area_tree().descendants(args.area)
+    exported = export_vacancies(db, args.output, args.format, args.chunk_size, args.description, areas)
+    progress.message(f"exported: {exported}")
+    return {"exported": exported}
+
+
+def cmd_import(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    importer = HHImporter(db, args.batch_size, dedup=VacancyDeduplicator(db) if args.dedup else None)
+    report = importer.import_files(args.paths)
+    for id_, error in list(importer.errors.items())[:20]:
+        progress.message(f"vacancy {id_}: {error}")
+    return report
+
+
+def cmd_texts(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    return {"texts": HtmlTextConverter(db, processes=args.processes).populate()}
+
+
+def cmd_dedup(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    dedup = VacancyDeduplicator(db, threshold=args.threshold)
+    assigned = dedup.populate()
+    clusters = dedup.clusters()
+    return {
+        "assigned": assigned,
+        "clusters": len(clusters),
+        "duplicates": sum(len(ids) - 1 for ids in clusters.values())
+    }
+
+
+def cmd_stats(args: argparse.Namespace, db: BaseDB, progress: Progress) -> dict:
+    tables = {}
+    for field in CreateDB(db).fields:
+        file_path = db.check_area_name(field["name"])
+        tables[field["name"]] = {"records": len(db.select_value(field["name"])), "bytes": os.path.getsize(file_path)}
+    return {"tables": tables, "checkpoints": len(CheckpointStore(args.checkpoints).load())}
+
+
+COMMANDS = {
+    "harvest": cmd_harvest,
+    "enrich": cmd_enrich,
+    "export": cmd_export,
+    "import": cmd_import,
+    "texts": cmd_texts,
+    "dedup": cmd_dedup,
+    "stats": cmd_stats
+}
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Batch hh.ru vacancies client")
+    parser.add_argument("--db", default=DB_DIR, metavar="DIR", help="database directory")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="json")
+    parser.add_argument("--checkpoints", default=CHECKPOINTS_PATH, metavar="PATH", help="harvest checkpoints file")
+    parser.add_argument("--workers", type=int, default=4, help="threads for page and employer requests")
+    parser.add_argument("--rate", type=float, default=None, help="client rate limit, requests per second")
+    parser.add_argument("--quiet", action="store_true", help="do not print progress to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    harvest = commands.add_parser("harvest", help="harvest new vacancies of a saved query")
+    harvest.add_argument("--text")
+    harvest.add_argument("--area")
+    harvest.add_argument("--experience")
+    harvest.add_argument("--employment")
+    harvest.add_argument("--schedule")
+    harvest.add_argument("--only-with-salary", action="store_true")
+    harvest.add_argument("--initial-days", type=int, default=30, help="depth of the first harvest in days")
+    harvest.add_argument("--enrich", action="store_true", help="load employers after harvesting")
+    harvest.add_argument("--dedup", action="store_true", help="assign duplicate clusters while writing")
+
+    commands.add_parser("enrich", help="load employers of saved vacancies")
+
+    export = commands.add_parser("export", help="export saved vacancies")
+    export.add_argument("--format", choices=list(WRITERS), default="ndjson", help="parquet and arrow require pyarrow")
+    export.add_argument("-o", "--output", default="-", metavar="PATH", help="output file (default: stdout)")
+    export.add_argument("--chunk-size", type=int, default=10000, help="rows per written chunk")
+    export.add_argument("--description", action="store_true", help="include the HTML description")
+    export.add_argument("--area", metavar="ID", help="only vacancies of the area and its nested areas")
+
+    import_ = commands.add_parser("import", help="import vacancies from NDJSON/JSON dumps")
+    import_.add_argument("paths", nargs="+", metavar="PATH", help="NDJSON or JSON dump files")
+    import_.add_argument("--batch-size", type=int, default=10000, help="vacancies per validation batch")
+    import_.add_argument("--dedup", action="store_true", help="assign duplicate clusters while writing")
+
+    texts = commands.add_parser("texts", help="convert saved descriptions to text")
+    texts.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+
+    dedup = commands.add_parser("dedup", help="assign duplicate clusters to saved vacancies")
+    dedup.add_argument("--threshold", type=float, default=0.8, help="description similarity of near duplicates")
+
+    commands.add_parser("stats", help="table record counts and sizes")
+    args = parser.parse_args(argv)
+    if args.command == "export" and args.format in ("parquet", "arrow") and args.output == "-":
+        parser.error(f"--format {args.format} needs --output PATH")
+    return args
+
+
+def main(argv: list[str] = None) -> int:
+    args = parse_args(argv)
+    progress = Progress(quiet=args.quiet)
+    rate_limiter = ApiBase.rate_limiter
+    if args.rate:
+        ApiBase.rate_limiter = TokenBucket(args.rate, max(1, int(args.rate)))
+    try:
+        result = COMMANDS[args.command](args, open_db(args.db, args.backend), progress)
+    except (ApiBaseError, requests.RequestException, ImportError) as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+    except (OSError, ValueError) as e:
+        # недоступный или неверный файл выгрузки / missing or malformed dump file
+        if args.command != "import":
+            raise
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+    finally:
+        ApiBase.rate_limiter = rate_limiter
+    if args.command != "export" or args.output != "-":
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
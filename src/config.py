@@ -9,10 +9,17 @@ import os
 ROOT_DIR = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 # директория базы данных / database directory
 DB_DIR = os.path.join(ROOT_DIR, "data")
+# файл контрольных точек инкрементальной выгрузки / incremental harvesting checkpoints file
+CHECKPOINTS_PATH = os.path.join(DB_DIR, "checkpoints.json")
+# файл кэша справочников hh.ru / hh.ru reference data cache file
+REFERENCE_CACHE_PATH = os.path.join(DB_DIR, "reference.json")
+# локальный файл курсов валют / local currency rates file
+CURRENCY_RATES_PATH = os.path.join(DB_DIR, "currency_rates.json")
 
-# название таблиц базы с описанием полей / database tables with fields description
+# название таблиц базы с описанием полей и ключом записи / database tables with fields description and record key
 VACANCY_FIELDS = {
     "name": "vacancy",
+    "key": ["id"],
     "fields": {
         "id": "TEXT NOT NULL",
         "name": "TEXT NOT NULL",
@@ -31,6 +38,7 @@ VACANCY_FIELDS = {
 
 EMPLOYER_FIELDS = {
     "name": "employer",
+    "key": ["id"],
     "fields": {
         "id": "TEXT NOT NULL",
         "name": "TEXT NOT NULL",
@@ -44,6 +52,7 @@ EMPLOYER_FIELDS = {
 
 SALARY_FIELDS = {
     "name": "salary",
+    "key": ["vacancy_id"],
     "fields": {
         "from": "INTEGER",
         "to": "INTEGER",
@@ -55,6 +64,7 @@ SALARY_FIELDS = {
 
 AREA_FIELDS = {
     "name": "area",
+    "key": ["id"],
     "fields": {
         "id": "TEXT NOT NULL",
         "name": "TEXT NOT NULL",
@@ -64,6 +74,7 @@ AREA_FIELDS = {
 
 EXPERIENCE_FIELDS = {
     "name": "experience",
+    "key": ["id"],
     "fields": {
         "id": "TEXT NOT NULL",
         "name": "TEXT NOT NULL"
@@ -72,6 +83,7 @@ EXPERIENCE_FIELDS = {
 
 EMPLOYMENT_FIELDS = {
     "name": "employment",
+    "key": ["id"],
     "fields": {
         "id": "TEXT NOT NULL",
         "name": "TEXT NOT NULL"
@@ -80,6 +92,7 @@ EMPLOYMENT_FIELDS = {
 
 SCHEDULE_FIELDS = {
     "name": "schedule",
+    "key": ["id"],
     "fields": {
         "id": "TEXT NOT NULL",
         "name": "TEXT NOT NULL"
@@ -88,6 +101,7 @@ SCHEDULE_FIELDS = {
 
 EMPLOYER_URL_LOGO_FIELDS = {
     "name": "employer_url_logo",
+    "key": ["employer_id"],
     "fields": {
         "90": "TEXT",
         "240": "TEXT",
@@ -95,3 +109,45 @@ EMPLOYER_URL_LOGO_FIELDS = {
         "employer_id": "TEXT NOT NULL"
     }
 }
+
+EMPLOYER_SYNC_FIELDS = {
+    "name": "employer_sync",
+    "key": ["employer_id"],
+    "fields": {
+        "employer_id": "TEXT NOT NULL",
+        "synced_at": "TEXT NOT NULL"
+    }
+}
+
+ADDRESS_FIELDS = {
+    "name": "address",
+    "key": ["vacancy_id"],
+    "fields": {
+        "vacancy_id": "TEXT NOT NULL",
+        "lat": "REAL",
+        "lng": "REAL",
+        "city": "TEXT",
+        "raw": "TEXT"
+    }
+}
+
+
+DESCRIPTION_TEXT_FIELDS = {
+    "name": "description_text",
+    "key": ["id"],
+    "fields": {
+        "id": "TEXT NOT NULL",
+        "text": "TEXT NOT NULL"
+    }
+}
+
+VACANCY_CLUSTER_FIELDS = {
+    "name": "vacancy_cluster",
+    "key": ["vacancy_id"],
+    "fields": {
+        "vacancy_id": "TEXT NOT NULL",
+        "cluster_id": "TEXT NOT NULL",
+        "exact_key": "TEXT",
+        "signature": "TEXT"
+    }
+}
@@ -0,0 +1,150 @@
+"""
+ru: Модуль для приведения зарплат к базовой валюте.
+Классы:
+    CurrencyRates: таблица курсов валют из справочника hh.ru /dictionaries (поле rate валюты)
+        или из локального файла без доступа к сети, пересчет сумм в базовую валюту списком
+
+en: Module for normalizing salaries to the base currency.
+Classes:
+    CurrencyRates: currency rate table from the hh.ru /dictionaries reference (currency rate field)
+        or from a local file when offline, batch conversion of amounts to the base currency
+"""
+
+import json
+import os
+
+import requests
+
+from src.api_errors import ApiBaseError
+from src.config import CURRENCY_RATES_PATH
+from src.hh_parser import HHSalary
+from src.reference import ReferenceCache
+
+# базовая валюта hh.ru / hh.ru base currency
+BASE_CURRENCY = "RUR"
+
+
+class CurrencyRates:
+    """
+    ru: Класс таблицы курсов валют.
+        rate в hh.ru - количество единиц валюты за одну единицу базовой валюты,
+        поэтому сумма в базовой валюте = сумма / rate; множители 1 / rate считаются один раз при создании таблицы.
+    en: Class of the currency rate table.
+        The hh.ru rate is the number of currency units per one unit of the base currency,
+        so the amount in the base currency = amount / rate; the 1 / rate factors are computed once on creation.
+    """
+    def __init__(self, rates: dict[str, float], base: str = BASE_CURRENCY):
+        """
+        :param rates: курсы валют {код валюты: rate}
+        :param base: код базовой валюты
+        """
+        self.base = base
+        self.rates = dict(rates) | {base: 1.0}
+        self.factors = {code: 1 / rate for code, rate in self.rates.items() if rate}
+
+    @classmethod
+    def from_dictionaries(cls, currencies: list[dict], base: str = BASE_CURRENCY) -> "CurrencyRates":
+        """
+        ru: Таблица курсов из справочника валют hh.ru.
+        en: Rate table from the hh.ru currency dictionary.
+        :param currencies: список валют справочника /dictionaries
+        """
+        return cls({currency["code"]: currency["rate"] for currency in currencies}, base)
+
+    @classmethod
+    def from_file(cls, path: str = CURRENCY_RATES_PATH) -> "CurrencyRates":
+        """
+        ru: Таблица курсов из локального файла.
+        en: Rate table from a local file.
+        """
+        with open(path, 'r') as file:
+            data = json.load(file)
+        return cls(data["rates"], data["base"])
+
+    def save(self, path: str = CURRENCY_RATES_PATH):
+        """
+        ru: Сохранить таблицу курсов в локальный файл.
+        en: Save the rate table to a local file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({"base": self.base, "rates": self.rates}, file)
+
+    @classmethod
+    def load(cls, cache: ReferenceCache = None, path: str = CURRENCY_RATES_PATH) -> "CurrencyRates":
+        """
+        ru: Загрузить курсы из справочников hh.ru (через кэш справочников) и сохранить их в локальный файл.
+            Без доступа к сети курсы читаются из локального файла.
+        en: Load rates from the hh.ru reference data (through the reference cache) and save them to a local file.
+            When offline the rates are read from the local file.
+        :param cache: кэш справочников
+        :param path: путь к локальному файлу курсов
+        """
+        cache = cache or ReferenceCache()
+        try:
+            rates = cls.from_dictionaries(cache.items("currency"))
+        except (ApiBaseError, requests.RequestException):
+            return cls.from_file(path)
+        rates.save(path)
+        return rates
+
+    def to_base_currency(self, amounts: list, currencies: list[str]) -> list[float | None]:
+        """
+        ru: Пересчитать суммы в базовую валюту.
+            Для пустой суммы или неизвестной валюты возвращается None.
+        en: Convert amounts to the base currency.
+            None is returned for an empty amount or an unknown currency.
+        :param amounts: суммы
+        :param currencies: коды валют сумм
+        """
+        factors = self.factors
+        return [
+            amount * factors[currency] if amount is not None and currency in factors else None
+            for amount, currency in zip(amounts, currencies)
+        ]
+
+    def normalize(self, salaries: list[HHSalary]) -> list[HHSalary]:
+        """
+        ru: Пересчитать ключи сравнения зарплат в базовую валюту одним проходом.
+            После этого сортировка и сравнение зарплат в разных валютах корректны
+            и не требуют обращения к таблице курсов при каждом сравнении.
+            Зарплаты в неизвестной валюте (salary.known = False) сортируются после пересчитанных.
+        en: Recompute salary comparison keys in the base currency in a single pass.
+            After that sorting and comparing salaries in different currencies is correct
+            and needs no rate table lookup per comparison.
+            Salaries in an unknown currency (salary.known = False) sort after the converted ones.
+        :param salaries: объекты зарплат
+        """
+        salaries = [salary for salary in salaries if salary]
+        keys = self.to_base_currency([salary.value for salary in salaries], [salary.currency for salary in salaries])
+        for salary, key in zip(salaries, keys):
+            salary.set_key(key)
+        return salaries
+
+    def install(self):
+        """
+        ru: Использовать таблицу курсов для всех новых объектов зарплаты.
+        en: Use the rate table for all new salary objects.
+        """
+        HHSalary.rates = self
+
+    @staticmethod
+    def uninstall():
+        """
+        ru: Вернуть сравнение зарплат без пересчета валют.
+        en: Restore salary comparison without currency conversion.
+        """
+        HHSalary.rates = None
+
+    def average(self, salaries: list[HHSalary]) -> float | None:
+        """
+        ru: Средняя зарплата в базовой валюте.
+        en: Average salary in the base currency.
+        """
+        salaries = [salary for salary in salaries if salary]
+        values = [
+            value for value in
+            self.to_base_currency([salary.value for salary in salaries], [salary.currency for salary in salaries])
+            if value is not None
+        ]
+        return sum(values) / len(values) if values else None
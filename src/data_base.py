@@ -5,16 +5,97 @@ ru: Модуль для работы с базой данных.
         Добавляя реальные базы данных, нужно наследовать этот класс и реализовать все методы.
         Разработчик может добавить свои методы. Работать можно с любой базой в едином интерфейсе.
     JsonDB: класс для работы с базой данных в формате JSON (тестовая база).
+    JsonLinesDB: класс для работы с базой данных в формате JSON Lines с индексом для быстрого поиска по id.
 Classes:
     BaseDB: an abstract class for working with a database.
         By adding real databases, you need to inherit this class and implement all methods.
         The developer can add their own methods. You can work with any database in a single interface.
     JsonDB: class for working with a database in JSON format (test database).
+    JsonLinesDB: class for working with a database in JSON Lines format with an index for fast lookup by id.
 """
 
 from abc import ABC, abstractmethod
-import os
+import functools
+import hashlib
 import json
+import mmap
+import os
+import struct
+import typing
+
+from src.metrics import metrics
+
+
+# допустимые типы значений по типу поля из config / allowed value types by config field type
+FIELDS_TYPES = {
+    "INTEGER": int | None,
+    "TEXT": str | None,
+    "REAL": float | None,
+    "BOOLEAN": bool,
+    "BOOLEAN NOT NULL": bool | None,
+    "BLOB": bytes | None,
+    "INTEGER NOT NULL": int,
+    "TEXT NOT NULL": str,
+    "REAL NOT NULL": float,
+    "BLOB NOT NULL": bytes,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_schema(schema: tuple[tuple[str, str], ...]) -> callable:
+    """
+    ru: Скомпилировать проверку записи по схеме таблицы один раз на схему.
+        Для каждого поля заранее вычисляются точные типы значения (быстрая проверка type(value) по кортежу)
+        и тип для isinstance (только для подклассов, например bool в поле INTEGER);
+        проверка записи - один проход по кортежу (поле, точные типы, тип) без поиска по словарям типов.
+    en: Compile a record check for a table schema once per schema.
+        For each field the exact value types (fast type(value) check against a tuple)
+        and the isinstance type (only for subclasses, e.g. bool in an INTEGER field) are precomputed;
+        checking a record is a single pass over the (field, exact types, type) tuple without type dict lookups.
+    :param schema: ((поле, тип поля из config), ...)
+    :return: функция validate(record), которая вызывает TypeError для неверной записи;
+        validate.check_field(field, value) - проверка значения одного поля (например, перед обновлением)
+    """
+    names = frozenset(field for field, _ in schema)
+    checks = tuple(
+        (field, typing.get_args(FIELDS_TYPES[type_name]) or (FIELDS_TYPES[type_name],), FIELDS_TYPES[type_name])
+        for field, type_name in schema
+    )
+    field_checks = {field: (exact, allowed) for field, exact, allowed in checks}
+
+    def validate(record: dict):
+        if record.keys() != names:
+            raise TypeError("Fields do not match")
+        for field, exact, allowed in checks:
+            value = record[field]
+            if type(value) not in exact and not isinstance(value, allowed):
+                raise TypeError(f"Types do not match: {field}={value!r}")
+
+    def check_field(field: str, value: any):
+        if field not in field_checks:
+            raise TypeError("Fields do not match")
+        exact, allowed = field_checks[field]
+        if type(value) not in exact and not isinstance(value, allowed):
+            raise TypeError(f"Types do not match: {field}={value!r}")
+
+    validate.check_field = check_field
+    return validate
+
+
+def schema_validator(fields_ref: dict) -> callable:
+    """
+    ru: Скомпилированная проверка записи для описания полей таблицы (из config или заголовка файла таблицы).
+    en: Compiled record check for a table fields description (from config or the table file header).
+    """
+    return compile_schema(tuple(fields_ref.items()))
+
+
+def area_labels(self, area_name: str, *args, **kwargs) -> dict:
+    """
+    ru: Метки метрик операции с таблицей.
+    en: Metric labels of a table operation.
+    """
+    return {"area": area_name}
 
 
 class BaseDB(ABC):
@@ -30,11 +111,6 @@ class BaseDB(ABC):
     def check_area_name(self, area_name: str):
         pass
 
-    @staticmethod
-    @abstractmethod
-    def check_key_fields(fields_ref: dict, fields: dict):
-        pass
-
     @abstractmethod
     def delete_area(self, area_name: str):
         pass
@@ -47,14 +123,33 @@ class BaseDB(ABC):
     def update_value(self, area_name: str, key_name: str, value: any, where_key: str, where_value: any):
         pass
 
+    @abstractmethod
+    def upsert(self, area_name: str, data_dict: dict, key_fields: list[str], skip_none: bool = False) -> dict:
+        pass
+
+    @abstractmethod
+    def upsert_many(self, area_name: str, records: list[dict], key_fields: list[str], skip_none: bool = False) -> list:
+        pass
+
     @abstractmethod
     def delete_value(self, area_name: str, key_name: str, value: any):
         pass
 
+    @abstractmethod
+    def delete_many(self, area_name: str, key_name: str, values: list) -> int:
+        pass
+
     @abstractmethod
     def select_value(self, area_name, key_value: dict = None):
         pass
 
+    def iter_value(self, area_name: str):
+        """
+        ru: Генератор всех записей таблицы (базы с потоковым чтением переопределяют метод).
+        en: Generator of all table records (databases with streaming reads override the method).
+        """
+        yield from self.select_value(area_name)
+
 
 class JsonDB(BaseDB):
     """
@@ -70,43 +165,51 @@ class JsonDB(BaseDB):
         else:
             os.makedirs(path)
             self.path = path
-        self.fields_types = {
-            "INTEGER": int | None,
-            "TEXT": str | None,
-            "REAL": float | None,
-            "BOOLEAN": bool,
-            "BOOLEAN NOT NULL": bool | None,
-            "BLOB": bytes | None,
-            "INTEGER NOT NULL": int,
-            "TEXT NOT NULL": str,
-            "REAL NOT NULL": float,
-            "BLOB NOT NULL": bytes,
-        }
 
     @staticmethod
-    def check_key_fields(fields_ref: dict, fields: dict):
+    def check_update(fields_ref: dict, key_name: str, value: any):
         """
-        ru: Проверка полей на соответствие названием ключей
-        en: Checking fields for compliance with key names
-        :param fields_ref: Референс названий ключей каждого поля
-        :param fields: Названия ключей поля которое нужно проверить
+        ru: Проверка нового значения поля перед обновлением (скомпилированной схемой таблицы).
+        en: Checking a new field value before an update (with the compiled table schema).
+        :param fields_ref: Референс типов полей
+        :param key_name: Название поля
+        :param value: Новое значение
         """
-        if fields_ref.keys() != fields.keys():
-            return False
-        return True
+        schema_validator(fields_ref).check_field(key_name, value)
 
-    def check_type_fields(self, fields_ref: dict, fields: dict):
+    @staticmethod
+    def area_of(file_path: str) -> str:
         """
-        ru: Проверка полей на соответствие типам.
-        en: Checking fields for compliance with types.
-        :param fields_ref: Референс типов полей
-        :param fields: Поля которые нужно проверить
+        ru: Название таблицы по пути к файлу.
+        en: Table name by the file path.
         """
-        for field in fields:
-            if not isinstance(fields[field], self.fields_types[fields_ref[field]]):
-                print(fields[field], self.fields_types[fields_ref[field]])
-                return False
-        return True
+        return os.path.splitext(os.path.basename(file_path))[0]
+
+    @staticmethod
+    def load_area(file_path: str) -> list:
+        """
+        ru: Прочитать файл таблицы.
+        en: Read the table file.
+        :param file_path: Путь к файлу таблицы
+        """
+        with open(file_path, 'r') as file:
+            data = json.load(file)
+        if metrics.enabled:
+            metrics.inc("db_bytes_read_total", os.path.getsize(file_path), area=JsonDB.area_of(file_path))
+        return data
+
+    @staticmethod
+    def dump_area(file_path: str, data: list):
+        """
+        ru: Записать файл таблицы.
+        en: Write the table file.
+        :param file_path: Путь к файлу таблицы
+        :param data: Данные таблицы (первый элемент - описание полей)
+        """
+        with open(file_path, 'w') as file:
+            json.dump(data, file, ensure_ascii=False, indent=4)
+        if metrics.enabled:
+            metrics.inc("db_bytes_written_total", os.path.getsize(file_path), area=JsonDB.area_of(file_path))
 
     def check_area_name(self, area_name: str) -> bool | str:
         """
@@ -143,6 +246,7 @@ class JsonDB(BaseDB):
             raise FileNotFoundError("File not found")
         os.remove(file_path)
 
+    @metrics.timed("db_operation_seconds", area_labels)
     def add_value(self, area_name: str, data_dict: dict):
         """
         ru: Добавить данные в таблицу.
@@ -153,17 +257,13 @@ class JsonDB(BaseDB):
         file_path = self.check_area_name(area_name)
         if not file_path:
             raise FileNotFoundError("File not found")
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-        if not self.check_key_fields(data[0], data_dict):
-            raise TypeError("Fields do not match")
-        if not self.check_type_fields(data[0], data_dict):
-            raise TypeError("Types do not match")
+        data = self.load_area(file_path)
+        schema_validator(data[0])(data_dict)
         if data_dict not in data:
             data.append(data_dict)
-            with open(file_path, 'w') as file:
-                json.dump(data, file, ensure_ascii=False, indent=4)
+            self.dump_area(file_path, data)
 
+    @metrics.timed("db_operation_seconds", area_labels)
     def update_value(self, area_name: str, key_name: str, value: any, where_key: str, where_value: any):
         """
         ru: Обновить данные в таблице.
@@ -177,14 +277,88 @@ class JsonDB(BaseDB):
         file_path = self.check_area_name(area_name)
         if not file_path:
             raise FileNotFoundError("File not found")
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-        for record in data:
+        data = self.load_area(file_path)
+        self.check_update(data[0], key_name, value)
+        for record in data[1:]:
             if record[where_key] == where_value:
                 record[key_name] = value
-        with open(file_path, 'w') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        self.dump_area(file_path, data)
+
+    @staticmethod
+    def diff_record(record: dict, data_dict: dict, skip_none: bool = False) -> dict:
+        """
+        ru: Получить изменившиеся поля записи.
+        en: Get the changed fields of the record.
+        :param record: текущая запись
+        :param data_dict: новые данные
+        :param skip_none: не затирать значения пустыми (None) значениями
+        """
+        return {
+            key: value for key, value in data_dict.items()
+            if record.get(key) != value and not (skip_none and value is None)
+        }
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def upsert(self, area_name: str, data_dict: dict, key_fields: list[str], skip_none: bool = False) -> dict:
+        """
+        ru: Добавить запись или обновить изменившиеся поля записи с тем же ключом.
+        en: Insert a record or update the changed fields of the record with the same key.
+        :param area_name: Название таблицы
+        :param data_dict: Словарь с данными
+        :param key_fields: Поля ключа записи (например ["id"] или ["vacancy_id"])
+        :param skip_none: не затирать сохраненные значения пустыми (None) значениями
+        :return: словарь изменившихся полей (все поля для новой записи, пустой - если изменений нет)
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        data = self.load_area(file_path)
+        schema_validator(data[0])(data_dict)
+        for record in data[1:]:
+            if all(record[key] == data_dict[key] for key in key_fields):
+                changes = self.diff_record(record, data_dict, skip_none)
+                if changes:
+                    record.update(changes)
+                    self.dump_area(file_path, data)
+                return changes
+        data.append(data_dict)
+        self.dump_area(file_path, data)
+        return data_dict.copy()
 
+    @metrics.timed("db_operation_seconds", area_labels)
+    def upsert_many(self, area_name: str, records: list[dict], key_fields: list[str], skip_none: bool = False) -> list:
+        """
+        ru: Пакетный upsert: таблица читается и записывается один раз.
+        en: Bulk upsert: the table is read and written once.
+        :param area_name: Название таблицы
+        :param records: Список словарей с данными
+        :param key_fields: Поля ключа записи
+        :param skip_none: не затирать сохраненные значения пустыми (None) значениями
+        :return: список словарей изменившихся полей (в порядке records)
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        data = self.load_area(file_path)
+        stored = {tuple(record[key] for key in key_fields): record for record in data[1:]}
+        validate = schema_validator(data[0])
+        result = []
+        for data_dict in records:
+            validate(data_dict)
+            key = tuple(data_dict[key] for key in key_fields)
+            if key in stored:
+                changes = self.diff_record(stored[key], data_dict, skip_none)
+                stored[key].update(changes)
+            else:
+                changes = data_dict.copy()
+                stored[key] = data_dict.copy()
+                data.append(stored[key])
+            result.append(changes)
+        if any(result):
+            self.dump_area(file_path, data)
+        return result
+
+    @metrics.timed("db_operation_seconds", area_labels)
     def delete_value(self, area_name: str, key_name: str, value: any):
         """
         ru: Удалить данные из таблицы.
@@ -196,14 +370,33 @@ class JsonDB(BaseDB):
         file_path = self.check_area_name(area_name)
         if not file_path:
             raise FileNotFoundError("File not found")
-        with open(file_path, 'r') as file:
-            data = json.load(file)
+        data = self.load_area(file_path)
         for record in data:
             if record[key_name] == value:
                 data.remove(record)
-        with open(file_path, 'w') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        self.dump_area(file_path, data)
 
+    @metrics.timed("db_operation_seconds", area_labels)
+    def delete_many(self, area_name: str, key_name: str, values: list) -> int:
+        """
+        ru: Удалить записи с любым из значений ключа (таблица записывается один раз).
+        en: Delete records with any of the key values (the table is written once).
+        :param area_name: Название таблицы
+        :param key_name: Название ключа
+        :param values: Значения ключа
+        :return: количество удаленных записей
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        values = set(values)
+        data = self.load_area(file_path)
+        kept = data[:1] + [record for record in data[1:] if record[key_name] not in values]
+        if len(kept) < len(data):
+            self.dump_area(file_path, kept)
+        return len(data) - len(kept)
+
+    @metrics.timed("db_operation_seconds", area_labels)
     def select_value(self, area_name, key_value: dict = None) -> list[dict]:
         """
         ru: Выбрать данные из таблицы.
@@ -213,9 +406,498 @@ class JsonDB(BaseDB):
 
         """
         file_path = self.check_area_name(area_name)
-        with open(file_path, 'r') as file:
-            data = json.load(file)
+        data = self.load_area(file_path)
         if key_value:
             return [record for record in data[1:] if record[key_value["key"]] == key_value["value"]]
         else:
             return data[1:]
+
+
+class JsonLinesDB(JsonDB):
+    """
+    ru: Класс для работы с базой данных в формате JSON Lines.
+        Каждая таблица - файл <area>.jsonl (первая строка - описание полей, далее по записи в строке)
+        и индексный файл <area>.idx - отсортированный массив записей фиксированной длины
+        (хеш ключа, смещение, длина), который читается через mmap.
+        Поиск по индексируемому ключу - бинарный поиск по индексу и чтение одной строки из файла данных.
+        Записи индекса для добавленных строк дописываются в несортированный файл <area>.idx.delta,
+        который объединяется с индексом, когда в нем набирается index_delta_limit записей.
+        Отсутствующий или устаревший (файл данных изменен позже) индекс перестраивается при первом обращении.
+    en: Class for working with a database in JSON Lines format.
+        Each table is a <area>.jsonl file (the first line describes the fields, then one record per line)
+        and a <area>.idx index file - a sorted array of fixed-width entries
+        (key hash, offset, length) which is accessed through mmap.
+        Lookup by the indexed key is a binary search over the index and a read of a single line of the data file.
+        Index entries of appended lines go to the unsorted <area>.idx.delta file,
+        which is merged into the index once it holds index_delta_limit entries.
+        A missing or stale (the data file changed later) index is rebuilt on first use.
+    """
+    # формат записи индекса: хеш ключа, смещение, длина / index entry format: key hash, offset, length
+    index_entry = struct.Struct("<QQI")
+    # ключи для индексации в порядке приоритета / keys to index in order of priority
+    index_keys = ("id", "vacancy_id", "employer_id")
+    # количество записей в файле добавлений индекса до объединения / index delta entries before a merge
+    index_delta_limit = 1024
+
+    def check_area_name(self, area_name: str) -> bool | str:
+        """
+        ru: Проверка на наличие таблицы в базе данных (в данном случае наличие файла).
+        en: Check for the presence of a table in the database (in this case, the presence of a file).
+        :param area_name: Название таблицы
+        """
+        file_name = os.path.join(self.path, f"{area_name}.jsonl")
+        if not os.path.exists(file_name):
+            return False
+        return file_name
+
+    def index_path(self, area_name: str) -> str:
+        """
+        ru: Путь к индексному файлу таблицы.
+        en: Path to the index file of the table.
+        :param area_name: Название таблицы
+        """
+        return os.path.join(self.path, f"{area_name}.idx")
+
+    def delta_path(self, area_name: str) -> str:
+        """
+        ru: Путь к файлу добавлений индекса таблицы.
+        en: Path to the index delta file of the table.
+        :param area_name: Название таблицы
+        """
+        return os.path.join(self.path, f"{area_name}.idx.delta")
+
+    @staticmethod
+    def hash_key(value: any) -> int:
+        """
+        ru: Хеш значения ключа (64 бита).
+        en: Hash of the key value (64 bits).
+        :param value: значение ключа
+        """
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "little")
+
+    @staticmethod
+    def encode_record(record: dict) -> bytes:
+        """
+        ru: Кодирование записи в строку файла.
+        en: Encoding a record into a file line.
+        :param record: запись
+        """
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode()
+
+    def get_index_key(self, fields: dict) -> str | None:
+        """
+        ru: Получить индексируемый ключ таблицы.
+        en: Get the indexed key of the table.
+        :param fields: Описание полей таблицы
+        """
+        for key in self.index_keys:
+            if key in fields:
+                return key
+        return None
+
+    def read_fields(self, file_path: str) -> dict:
+        """
+        ru: Прочитать описание полей (первая строка файла).
+        en: Read the fields description (the first line of the file).
+        :param file_path: Путь к файлу таблицы
+        """
+        with open(file_path, 'rb') as file:
+            return json.loads(file.readline())
+
+    def iter_records(self, file_path: str):
+        """
+        ru: Генератор записей таблицы со смещением и длиной строки.
+        en: Generator of table records with line offset and length.
+        :param file_path: Путь к файлу таблицы
+        """
+        with open(file_path, 'rb') as file:
+            start = offset = len(file.readline())
+            for line in file:
+                yield offset, len(line), json.loads(line)
+                offset += len(line)
+        if metrics.enabled:
+            metrics.inc("db_bytes_read_total", offset - start, area=self.area_of(file_path))
+
+    def write_index(self, area_name: str, entries: list[tuple]):
+        """
+        ru: Записать отсортированный индекс таблицы.
+        en: Write the sorted table index.
+        :param area_name: Название таблицы
+        :param entries: список (хеш, смещение, длина)
+        """
+        entries.sort()
+        with open(self.index_path(area_name), 'wb') as file:
+            for entry in entries:
+                file.write(self.index_entry.pack(*entry))
+        if os.path.exists(self.delta_path(area_name)):
+            os.remove(self.delta_path(area_name))
+
+    def read_index(self, path: str) -> list[tuple]:
+        """
+        ru: Прочитать все записи индексного файла (пустой список - файла нет).
+        en: Read all entries of an index file (an empty list - the file does not exist).
+        :param path: Путь к индексному файлу
+        """
+        if not os.path.exists(path):
+            return []
+        with open(path, 'rb') as file:
+            return list(self.index_entry.iter_unpack(file.read()))
+
+    def ensure_index(self, area_name: str, file_path: str):
+        """
+        ru: Перестроить индекс, если его нет или файл данных изменен позже индекса.
+        en: Rebuild the index if it is missing or the data file changed after the index.
+        :param area_name: Название таблицы
+        :param file_path: Путь к файлу таблицы
+        """
+        index_path, delta_path = self.index_path(area_name), self.delta_path(area_name)
+        if not os.path.exists(index_path):
+            self.rebuild_index(area_name)
+            return
+        indexed = os.stat(index_path).st_mtime_ns
+        if os.path.exists(delta_path):
+            indexed = max(indexed, os.stat(delta_path).st_mtime_ns)
+        if os.stat(file_path).st_mtime_ns > indexed:
+            self.rebuild_index(area_name)
+
+    def append_index(self, area_name: str, entry: tuple):
+        """
+        ru: Добавить запись индекса в файл добавлений (с объединением при достижении index_delta_limit).
+        en: Add an index entry to the delta file (merged once index_delta_limit is reached).
+        :param area_name: Название таблицы
+        :param entry: (хеш, смещение, длина)
+        """
+        delta_path = self.delta_path(area_name)
+        with open(delta_path, 'ab') as file:
+            file.write(self.index_entry.pack(*entry))
+            count = file.tell() // self.index_entry.size
+        if count >= self.index_delta_limit:
+            self.write_index(area_name, self.read_index(self.index_path(area_name)) + self.read_index(delta_path))
+
+    def rebuild_index(self, area_name: str):
+        """
+        ru: Перестроить индекс таблицы по файлу данных.
+        en: Rebuild the table index from the data file.
+        :param area_name: Название таблицы
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        key = self.get_index_key(self.read_fields(file_path))
+        entries = []
+        if key:
+            entries = [
+                (self.hash_key(record[key]), offset, length)
+                for offset, length, record in self.iter_records(file_path)
+            ]
+        self.write_index(area_name, entries)
+
+    def find_offsets(self, area_name: str, value: any) -> list[tuple]:
+        """
+        ru: Бинарный поиск по индексу: список (смещение, длина) записей с указанным значением ключа.
+        en: Binary search over the index: list of (offset, length) of records with the given key value.
+        :param area_name: Название таблицы
+        :param value: Значение ключа
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            return []
+        self.ensure_index(area_name, file_path)
+        key_hash = self.hash_key(value)
+        result = [
+            (offset, length) for entry_hash, offset, length in self.read_index(self.delta_path(area_name))
+            if entry_hash == key_hash
+        ]
+        index_path = self.index_path(area_name)
+        if not os.path.getsize(index_path):
+            return result
+        size = self.index_entry.size
+        with open(index_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            low, high = 0, len(index) // size
+            while low < high:
+                middle = (low + high) // 2
+                if self.index_entry.unpack_from(index, middle * size)[0] < key_hash:
+                    low = middle + 1
+                else:
+                    high = middle
+            while low < len(index) // size:
+                entry_hash, offset, length = self.index_entry.unpack_from(index, low * size)
+                if entry_hash != key_hash:
+                    break
+                result.append((offset, length))
+                low += 1
+        return result
+
+    def select_by_index(self, area_name: str, file_path: str, key: str, value: any) -> list[dict]:
+        """
+        ru: Выбрать записи по индексируемому ключу.
+        en: Select records by the indexed key.
+        :param area_name: Название таблицы
+        :param file_path: Путь к файлу таблицы
+        :param key: Индексируемый ключ
+        :param value: Значение ключа
+        """
+        result = []
+        offsets = sorted(self.find_offsets(area_name, value))
+        with open(file_path, 'rb') as file:
+            for offset, length in offsets:
+                file.seek(offset)
+                record = json.loads(file.read(length))
+                # проверка на коллизию хешей / check for hash collision
+                if record[key] == value:
+                    result.append(record)
+        if metrics.enabled:
+            metrics.inc("db_bytes_read_total", sum(length for _, length in offsets), area=area_name)
+        return result
+
+    def create_area(self, area_name: str, fields: dict):
+        """
+        ru: Создать таблицу для данных и пустой индекс.
+        en: Create a table for data and an empty index.
+        :param area_name: Название таблицы
+        :param fields: Поля
+        """
+        file_path = os.path.join(self.path, f"{area_name}.jsonl")
+        if os.path.exists(file_path):
+            raise FileExistsError("File already exists")
+        with open(file_path, 'wb') as file:
+            file.write(self.encode_record(fields))
+        self.write_index(area_name, [])
+
+    def delete_area(self, area_name: str):
+        """
+        ru: Удалить таблицу и ее индекс.
+        en: Delete the table and its index.
+        :param area_name: Название таблицы
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        os.remove(file_path)
+        for path in (self.index_path(area_name), self.delta_path(area_name)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def add_value(self, area_name: str, data_dict: dict):
+        """
+        ru: Добавить данные в конец таблицы и в индекс.
+        en: Append data to the table and to the index.
+        :param area_name: Название таблицы
+        :param data_dict: Словарь с данными
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        fields = self.read_fields(file_path)
+        schema_validator(fields)(data_dict)
+        key = self.get_index_key(fields)
+        if key:
+            exists = data_dict in self.select_by_index(area_name, file_path, key, data_dict[key])
+        else:
+            exists = any(record == data_dict for _, _, record in self.iter_records(file_path))
+        if exists:
+            return
+        line = self.encode_record(data_dict)
+        with open(file_path, 'ab') as file:
+            offset = file.tell()
+            file.write(line)
+        metrics.inc("db_bytes_written_total", len(line), area=area_name)
+        if key:
+            self.append_index(area_name, (self.hash_key(data_dict[key]), offset, len(line)))
+
+    def rewrite_area(self, area_name: str, file_path: str, records: list[dict]):
+        """
+        ru: Перезаписать таблицу и перестроить индекс.
+        en: Rewrite the table and rebuild the index.
+        :param area_name: Название таблицы
+        :param file_path: Путь к файлу таблицы
+        :param records: Записи таблицы
+        """
+        fields = self.read_fields(file_path)
+        with open(file_path, 'wb') as file:
+            file.write(self.encode_record(fields))
+            for record in records:
+                file.write(self.encode_record(record))
+            written = file.tell()
+        metrics.inc("db_bytes_written_total", written, area=area_name)
+        self.rebuild_index(area_name)
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def update_value(self, area_name: str, key_name: str, value: any, where_key: str, where_value: any):
+        """
+        ru: Обновить данные в таблице.
+        en: Update data in the table.
+        :param area_name: Название таблицы
+        :param key_name: Название ключа
+        :param value: Значение
+        :param where_key: Где ключ
+        :param where_value: Где значение
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        self.check_update(self.read_fields(file_path), key_name, value)
+        records = [record for _, _, record in self.iter_records(file_path)]
+        for record in records:
+            if record[where_key] == where_value:
+                record[key_name] = value
+        self.rewrite_area(area_name, file_path, records)
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def upsert(self, area_name: str, data_dict: dict, key_fields: list[str], skip_none: bool = False) -> dict:
+        """
+        ru: Добавить запись или обновить изменившиеся поля записи с тем же ключом.
+            Поиск записи - через индекс, если первое поле ключа индексируется.
+            Новая запись дописывается в конец файла, таблица перезаписывается только при изменении записи.
+        en: Insert a record or update the changed fields of the record with the same key.
+            The record is looked up through the index if the first key field is indexed.
+            A new record is appended, the table is rewritten only when a record changes.
+        :param area_name: Название таблицы
+        :param data_dict: Словарь с данными
+        :param key_fields: Поля ключа записи (например ["id"] или ["vacancy_id"])
+        :param skip_none: не затирать сохраненные значения пустыми (None) значениями
+        :return: словарь изменившихся полей (все поля для новой записи, пустой - если изменений нет)
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        fields = self.read_fields(file_path)
+        schema_validator(fields)(data_dict)
+        if key_fields[0] == self.get_index_key(fields):
+            candidates = self.select_by_index(area_name, file_path, key_fields[0], data_dict[key_fields[0]])
+        else:
+            candidates = [record for _, _, record in self.iter_records(file_path)]
+        for record in candidates:
+            if all(record[key] == data_dict[key] for key in key_fields):
+                changes = self.diff_record(record, data_dict, skip_none)
+                if changes:
+                    records = [record for _, _, record in self.iter_records(file_path)]
+                    for stored in records:
+                        if all(stored[key] == data_dict[key] for key in key_fields):
+                            stored.update(changes)
+                    self.rewrite_area(area_name, file_path, records)
+                return changes
+        self.add_value(area_name, data_dict)
+        return data_dict.copy()
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def upsert_many(self, area_name: str, records: list[dict], key_fields: list[str], skip_none: bool = False) -> list:
+        """
+        ru: Пакетный upsert: новые записи дописываются одним блоком,
+            при изменении существующих таблица перезаписывается один раз.
+        en: Bulk upsert: new records are appended as one block,
+            if existing records change the table is rewritten once.
+        :param area_name: Название таблицы
+        :param records: Список словарей с данными
+        :param key_fields: Поля ключа записи
+        :param skip_none: не затирать сохраненные значения пустыми (None) значениями
+        :return: список словарей изменившихся полей (в порядке records)
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        fields = self.read_fields(file_path)
+        data = [record for _, _, record in self.iter_records(file_path)]
+        stored = {tuple(record[key] for key in key_fields): record for record in data}
+        new_records = []
+        updated = False
+        validate = schema_validator(fields)
+        result = []
+        for data_dict in records:
+            validate(data_dict)
+            key = tuple(data_dict[key] for key in key_fields)
+            if key in stored:
+                changes = self.diff_record(stored[key], data_dict, skip_none)
+                stored[key].update(changes)
+                updated = updated or bool(changes)
+            else:
+                changes = data_dict.copy()
+                stored[key] = data_dict.copy()
+                new_records.append(stored[key])
+            result.append(changes)
+        if updated:
+            self.rewrite_area(area_name, file_path, data + new_records)
+        elif new_records:
+            with open(file_path, 'ab') as file:
+                start = file.tell()
+                for record in new_records:
+                    file.write(self.encode_record(record))
+                written = file.tell() - start
+            metrics.inc("db_bytes_written_total", written, area=area_name)
+            self.rebuild_index(area_name)
+        return result
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def delete_value(self, area_name: str, key_name: str, value: any):
+        """
+        ru: Удалить данные из таблицы.
+        en: Delete data from the table.
+        :params: area_name: Название таблицы
+        :params: key_name: Название ключа
+        :params: value: Значение
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        records = [record for _, _, record in self.iter_records(file_path) if record[key_name] != value]
+        self.rewrite_area(area_name, file_path, records)
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def delete_many(self, area_name: str, key_name: str, values: list) -> int:
+        """
+        ru: Удалить записи с любым из значений ключа (таблица и индекс перезаписываются один раз).
+        en: Delete records with any of the key values (the table and the index are rewritten once).
+        :param area_name: Название таблицы
+        :param key_name: Название ключа
+        :param values: Значения ключа
+        :return: количество удаленных записей
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        values = set(values)
+        records = []
+        deleted = 0
+        for _, _, record in self.iter_records(file_path):
+            if record[key_name] in values:
+                deleted += 1
+            else:
+                records.append(record)
+        if deleted:
+            self.rewrite_area(area_name, file_path, records)
+        return deleted
+
+    @metrics.timed("db_operation_seconds", area_labels)
+    def select_value(self, area_name, key_value: dict = None) -> list[dict]:
+        """
+        ru: Выбрать данные из таблицы.
+            По индексируемому ключу - через индекс, по остальным ключам - полным проходом.
+        en: Select data from the table.
+            By the indexed key - through the index, by other keys - by a full scan.
+        :param area_name: Название таблицы
+        :param key_value: словарь с ключом и значением (необязательно) {"key": <key>, "value": <value>}
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        if not key_value:
+            return [record for _, _, record in self.iter_records(file_path)]
+        if key_value["key"] == self.get_index_key(self.read_fields(file_path)):
+            return self.select_by_index(area_name, file_path, key_value["key"], key_value["value"])
+        return [
+            record for _, _, record in self.iter_records(file_path)
+            if record[key_value["key"]] == key_value["value"]
+        ]
+
+    def iter_value(self, area_name: str):
+        """
+        ru: Генератор всех записей таблицы с чтением файла по строке (память не зависит от размера таблицы).
+        en: Generator of all table records reading the file line by line (memory does not depend on the table size).
+        :param area_name: Название таблицы
+        """
+        file_path = self.check_area_name(area_name)
+        if not file_path:
+            raise FileNotFoundError("File not found")
+        for _, _, record in self.iter_records(file_path):
+            yield record
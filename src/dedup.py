@@ -0,0 +1,273 @@
+"""
+ru: Модуль для поиска дублей вакансий между выгрузками.
+    Работодатели публикуют одну вакансию под разными id и в разных локациях. Вакансии объединяются в кластеры:
+        точный дубль - тот же работодатель, нормализованное название и зарплата (exact_key)
+        почти дубль - похожее описание (текст html2text): сигнатура MinHash по шинглам из слов
+            и LSH-корзины по полосам сигнатуры; кандидаты из общих корзин проверяются оценкой сходства Жаккара
+    Кластер вакансии хранится в таблице vacancy_cluster (id кластера - id первой вакансии кластера),
+    поэтому поиск работает инкрементально: новые вакансии сравниваются с уже сохраненными без пересчета.
+Классы:
+    VacancyDeduplicator: назначение кластеров вакансиям
+
+en: Module for finding duplicate vacancies across harvests.
+    Employers post the same vacancy under multiple ids and in different areas. Vacancies are grouped into clusters:
+        exact duplicate - the same employer, normalized name and salary (exact_key)
+        near duplicate - a similar description (html2text text): a MinHash signature over word shingles
+            and LSH buckets by signature bands; candidates from shared buckets are checked by the Jaccard estimate
+    The vacancy cluster is stored in the vacancy_cluster table (the cluster id is the id of its first vacancy),
+    so the search is incremental: new vacancies are compared with the saved ones without recomputation.
+Classes:
+    VacancyDeduplicator: cluster assignment for vacancies
+"""
+
+import random
+import re
+import zlib
+from itertools import islice
+
+from src.config import VACANCY_FIELDS, SALARY_FIELDS, VACANCY_CLUSTER_FIELDS
+from src.data_base import BaseDB
+from src.html_text import HtmlTextConverter
+from src.metrics import metrics
+
+# модуль хеш-функций MinHash (простое число Мерсенна) / MinHash hash functions modulus (Mersenne prime)
+PRIME = (1 << 61) - 1
+# разрядность значений сигнатуры / signature value width
+MASK = (1 << 32) - 1
+
+
+class VacancyDeduplicator:
+    """
+    ru: Класс назначения кластеров дублей вакансиям.
+        Порядок поиска кластера новой вакансии: точный ключ -> LSH-корзины описания -> новый кластер.
+        Существующие кластеры не объединяются, поэтому id кластера сохраненной вакансии не меняется.
+    en: Class of duplicate cluster assignment for vacancies.
+        Cluster lookup order for a new vacancy: exact key -> description LSH buckets -> a new cluster.
+        Existing clusters are not merged, so the cluster id of a saved vacancy never changes.
+    """
+    def __init__(
+            self,
+            db: BaseDB,
+            converter: HtmlTextConverter = None,
+            num_perm: int = 64,
+            bands: int = 16,
+            threshold: float = 0.8,
+            shingle_size: int = 3
+    ):
+        """
+        :param db: database object
+        :param converter: сервис преобразования HTML в текст (по умолчанию - с кэшем в той же базе)
+        :param num_perm: длина сигнатуры MinHash
+        :param bands: количество полос LSH (num_perm должно делиться на bands)
+        :param threshold: минимальная оценка сходства Жаккара для почти дубля
+        :param shingle_size: количество слов в шингле
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.db = db
+        self.converter = converter or HtmlTextConverter(db)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rnd = random.Random(num_perm)
+        self.permutations = [(rnd.randrange(1, PRIME), rnd.randrange(PRIME)) for _ in range(num_perm)]
+        self.records = None
+        self.exact = {}
+        self.signatures = {}
+        self.buckets = {}
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """
+        ru: Нормализованное название: нижний регистр, ё -> е, без знаков препинания и лишних пробелов.
+        en: Normalized name: lower case, ё -> е, without punctuation and extra spaces.
+        """
+        return " ".join(re.findall(r"\w+", name.lower().replace("ё", "е")))
+
+    def exact_key(self, vacancy: dict, salary: dict | None) -> str | None:
+        """
+        ru: Точный ключ вакансии (None - у вакансии нет работодателя).
+        en: Exact vacancy key (None - the vacancy has no employer).
+        :param vacancy: запись таблицы vacancy
+        :param salary: запись таблицы salary или None
+        """
+        if not vacancy["employer_id"]:
+            return None
+        salary = salary or {}
+        return "|".join([
+            vacancy["employer_id"],
+            self.normalize_name(vacancy["name"]),
+            str(salary.get("from") or ""),
+            str(salary.get("to") or ""),
+            salary.get("currency") or ""
+        ])
+
+    def signature(self, text: str) -> tuple[int, ...] | None:
+        """
+        ru: Сигнатура MinHash текста (None - в тексте нет слов).
+        en: MinHash signature of a text (None - the text has no words).
+        """
+        words = re.findall(r"\w+", text.lower().replace("ё", "е"))
+        if not words:
+            return None
+        size = min(self.shingle_size, len(words))
+        hashes = {
+            zlib.crc32(" ".join(words[i:i + size]).encode())
+            for i in range(len(words) - size + 1)
+        }
+        return tuple(min((a * h + b) % PRIME for h in hashes) & MASK for a, b in self.permutations)
+
+    @staticmethod
+    def similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+        """
+        ru: Оценка сходства Жаккара по сигнатурам (доля совпавших значений).
+        en: Jaccard similarity estimate by signatures (share of equal values).
+        """
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+    def band_keys(self, signature: tuple[int, ...]) -> list[tuple]:
+        """
+        ru: Ключи LSH-корзин сигнатуры (номер полосы и значения полосы).
+        en: LSH bucket keys of a signature (band number and band values).
+        """
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    @staticmethod
+    def encode(signature: tuple[int, ...] | None) -> str | None:
+        return "".join(f"{value:08x}" for value in signature) if signature else None
+
+    @staticmethod
+    def decode(signature: str | None) -> tuple[int, ...] | None:
+        return tuple(int(signature[i:i + 8], 16) for i in range(0, len(signature), 8)) if signature else None
+
+    def index(self, record: dict, signature: tuple[int, ...] | None):
+        """
+        ru: Добавить запись кластера в индексы в памяти.
+        en: Add a cluster record to the in-memory indexes.
+        """
+        self.records[record["vacancy_id"]] = record
+        if record["exact_key"]:
+            self.exact.setdefault(record["exact_key"], record["cluster_id"])
+        if signature and len(signature) == self.bands * self.rows:
+            self.signatures[record["vacancy_id"]] = signature
+            for key in self.band_keys(signature):
+                self.buckets.setdefault(key, []).append(record["vacancy_id"])
+
+    def load(self):
+        """
+        ru: Прочитать сохраненные кластеры и построить индексы (один раз).
+        en: Read the saved clusters and build the indexes (once).
+        """
+        if self.records is not None:
+            return
+        self.records = {}
+        for record in self.db.iter_value(VACANCY_CLUSTER_FIELDS["name"]):
+            self.index(record, self.decode(record["signature"]))
+
+    def near(self, signature: tuple[int, ...]) -> str | None:
+        """
+        ru: Кластер самой похожей сохраненной вакансии из общих LSH-корзин (None - похожих нет).
+        en: Cluster of the most similar saved vacancy from shared LSH buckets (None - no similar ones).
+        """
+        candidates = {id_ for key in self.band_keys(signature) for id_ in self.buckets.get(key, ())}
+        best, best_similarity = None, self.threshold
+        for id_ in candidates:
+            similarity = self.similarity(signature, self.signatures[id_])
+            if similarity >= best_similarity:
+                best, best_similarity = id_, similarity
+        return self.records[best]["cluster_id"] if best else None
+
+    def assign(self, vacancy: dict, salary: dict | None, signature: tuple[int, ...] | None) -> dict:
+        """
+        ru: Назначить кластер вакансии и добавить ее в индексы.
+            Для сохраненной вакансии кластер не меняется, добавляется только сигнатура появившегося описания.
+        en: Assign a cluster to a vacancy and add it to the indexes.
+            For a saved vacancy the cluster does not change, only the signature of a new description is added.
+        :return: запись таблицы vacancy_cluster
+        """
+        stored = self.records.get(vacancy["id"])
+        key = self.exact_key(vacancy, salary)
+        if stored:
+            cluster_id, match = stored["cluster_id"], "update"
+        elif key and key in self.exact:
+            cluster_id, match = self.exact[key], "exact"
+        elif signature and (cluster_id := self.near(signature)):
+            match = "near"
+        else:
+            cluster_id, match = vacancy["id"], "new"
+        metrics.inc("dedup_total", match=match)
+        record = {
+            "vacancy_id": vacancy["id"],
+            "cluster_id": cluster_id,
+            "exact_key": key,
+            "signature": self.encode(signature)
+        }
+        self.index(record, signature)
+        return record
+
+    def pending(self, vacancy: dict) -> bool:
+        """
+        ru: Вакансии нужен кластер: она новая или у нее появилось описание.
+        en: The vacancy needs a cluster: it is new or its description has appeared.
+        """
+        stored = self.records.get(vacancy["id"])
+        return stored is None or (stored["signature"] is None and bool(vacancy["description"]))
+
+    def add(self, vacancies: list[dict], salaries: dict[str, dict] = None) -> dict[str, str]:
+        """
+        ru: Назначить кластеры пачке вакансий (записи таблицы vacancy) и записать их одним upsert_many.
+            Описания пачки преобразуются в текст одним вызовом сервиса html_text.
+        en: Assign clusters to a batch of vacancies (vacancy table records) and write them with one upsert_many.
+            Batch descriptions are converted to text with one call of the html_text service.
+        :param vacancies: записи таблицы vacancy
+        :param salaries: {id вакансии: запись таблицы salary}
+        :return: {id вакансии: id кластера}
+        """
+        self.load()
+        salaries = salaries or {}
+        pending = [vacancy for vacancy in dict((v["id"], v) for v in vacancies).values() if self.pending(vacancy)]
+        texts = self.converter.texts([vacancy["description"] or None for vacancy in pending])
+        records = [
+            self.assign(vacancy, salaries.get(vacancy["id"]), self.signature(text) if text else None)
+            for vacancy, text in zip(pending, texts)
+        ]
+        if records:
+            self.db.upsert_many(VACANCY_CLUSTER_FIELDS["name"], records, VACANCY_CLUSTER_FIELDS["key"])
+        return {vacancy["id"]: self.records[vacancy["id"]]["cluster_id"] for vacancy in vacancies}
+
+    def populate(self, batch_size: int = 1000) -> int:
+        """
+        ru: Назначить кластеры сохраненным вакансиям без кластера (например, после импорта без поиска дублей).
+        en: Assign clusters to saved vacancies without a cluster (e.g. after an import without deduplication).
+        :param batch_size: количество вакансий в пачке
+        :return: количество обработанных вакансий
+        """
+        self.load()
+        salaries = {record["vacancy_id"]: record for record in self.db.iter_value(SALARY_FIELDS["name"])}
+        vacancies = (vacancy for vacancy in self.db.iter_value(VACANCY_FIELDS["name"]) if self.pending(vacancy))
+        count = 0
+        while batch := list(islice(vacancies, batch_size)):
+            self.add(batch, salaries)
+            count += len(batch)
+        return count
+
+    def cluster_of(self, vacancy_id: str) -> str | None:
+        """
+        ru: Id кластера вакансии (None - кластер еще не назначен).
+        en: Cluster id of a vacancy (None - the cluster is not assigned yet).
+        """
+        self.load()
+        record = self.records.get(vacancy_id)
+        return record["cluster_id"] if record else None
+
+    def clusters(self) -> dict[str, list[str]]:
+        """
+        ru: Кластеры: {id кластера: id вакансий кластера}.
+        en: Clusters: {cluster id: cluster vacancy ids}.
+        """
+        self.load()
+        result = {}
+        for vacancy_id, record in self.records.items():
+            result.setdefault(record["cluster_id"], []).append(vacancy_id)
+        return result
@@ -0,0 +1,258 @@
+"""
+ru: Модуль для выгрузки локальной базы вакансий в NDJSON, CSV, Parquet и Arrow.
+    Вакансии выгружаются плоскими строками (вакансия + зарплата, локация, опыт, занятость, график, работодатель)
+    пачками по chunk_size строк, поэтому память не зависит от количества вакансий.
+    Для JsonLinesDB зарплата и работодатель ищутся через индекс таблицы, для JsonDB - через словарь по ключу.
+    Parquet и Arrow требуют необязательную зависимость pyarrow.
+Классы:
+    VacancyRows: генератор плоских строк вакансий
+    NdjsonWriter, CsvWriter, ParquetWriter, ArrowWriter: потоковая запись пачек строк
+Функции:
+    export_vacancies: выгрузка вакансий в файл
+
+en: Module for exporting the local vacancy database to NDJSON, CSV, Parquet and Arrow.
+    Vacancies are exported as flat rows (vacancy + salary, area, experience, employment, schedule, employer)
+    in chunks of chunk_size rows, so memory does not depend on the number of vacancies.
+    For JsonLinesDB the salary and employer are looked up through the table index, for JsonDB through a dict by key.
+    Parquet and Arrow require the optional pyarrow dependency.
+Classes:
+    VacancyRows: generator of flat vacancy rows
+    NdjsonWriter, CsvWriter, ParquetWriter, ArrowWriter: streaming writing of row chunks
+Functions:
+    export_vacancies: export of vacancies to a file
+"""
+
+import csv
+import functools
+import json
+import sys
+from itertools import islice
+
+from src.config import (
+    VACANCY_FIELDS,
+    EMPLOYER_FIELDS,
+    SALARY_FIELDS,
+    AREA_FIELDS,
+    EXPERIENCE_FIELDS,
+    EMPLOYMENT_FIELDS,
+    SCHEDULE_FIELDS
+)
+from src.data_base import BaseDB, JsonLinesDB
+
+# колонки выгрузки и их типы (для Parquet/Arrow) / export columns and their types (for Parquet/Arrow)
+COLUMNS = {
+    "id": "string",
+    "name": "string",
+    "created_at": "string",
+    "published_at": "string",
+    "alternate_url": "string",
+    "area_id": "string",
+    "area_name": "string",
+    "experience_id": "string",
+    "experience_name": "string",
+    "employment_id": "string",
+    "employment_name": "string",
+    "schedule_id": "string",
+    "schedule_name": "string",
+    "salary_from": "int64",
+    "salary_to": "int64",
+    "salary_currency": "string",
+    "salary_gross": "bool_",
+    "employer_id": "string",
+    "employer_name": "string",
+    "employer_alternate_url": "string",
+    "employer_accredited_it_employer": "bool_",
+    "description": "string"
+}
+
+
+class VacancyRows:
+    """
+    ru: Класс генератора плоских строк вакансий.
+        Справочные таблицы (локации, опыт, занятость, график) небольшие и читаются один раз целиком.
+    en: Class of the flat vacancy rows generator.
+        Reference tables (areas, experience, employment, schedule) are small and are read once in full.
+    """
+    def __init__(
+            self,
+            db: BaseDB,
+            description: bool = False,
+            employer_cache_size: int = 10000,
+            areas: list[str] = None
+    ):
+        """
+        :param db: database object
+        :param description: выгружать HTML-описание вакансии
+        :param employer_cache_size: размер кэша работодателей при поиске через индекс
+        :param areas: id локаций выгружаемых вакансий (например, AreaTree.descendants региона; None - все вакансии)
+        """
+        self.db = db
+        self.description = description
+        self.areas = set(areas) if areas is not None else None
+        self.references = {
+            prefix: {record["id"]: record["name"] for record in db.iter_value(fields["name"])}
+            for prefix, fields in (
+                ("area", AREA_FIELDS),
+                ("experience", EXPERIENCE_FIELDS),
+                ("employment", EMPLOYMENT_FIELDS),
+                ("schedule", SCHEDULE_FIELDS)
+            )
+        }
+        self.salary = self.lookup(SALARY_FIELDS["name"], "vacancy_id")
+        self.employer = self.lookup(EMPLOYER_FIELDS["name"], "id")
+        if isinstance(db, JsonLinesDB):
+            self.employer = functools.lru_cache(maxsize=employer_cache_size)(self.employer)
+
+    def lookup(self, area_name: str, key: str) -> callable:
+        """
+        ru: Функция поиска записи таблицы по ключу: через индекс JsonLinesDB или через словарь.
+        en: Lookup function of a table record by key: through the JsonLinesDB index or through a dict.
+        """
+        if isinstance(self.db, JsonLinesDB):
+            def find(value: str) -> dict | None:
+                records = self.db.select_value(area_name, {"key": key, "value": value})
+                return records[0] if records else None
+            return find
+        return {record[key]: record for record in self.db.iter_value(area_name)}.get
+
+    def row(self, vacancy: dict) -> dict:
+        """
+        ru: Плоская строка вакансии.
+        en: Flat vacancy row.
+        """
+        salary = self.salary(vacancy["id"]) or {}
+        employer = self.employer(vacancy["employer_id"]) or {}
+        row = {
+            "id": vacancy["id"],
+            "name": vacancy["name"],
+            "created_at": vacancy["created_at"],
+            "published_at": vacancy["published_at"],
+            "alternate_url": vacancy["alternate_url"]
+        }
+        for prefix, names in self.references.items():
+            id_ = vacancy[f"{prefix}_id"]
+            row[f"{prefix}_id"] = id_
+            row[f"{prefix}_name"] = names.get(id_)
+        row |= {
+            "salary_from": salary.get("from"),
+            "salary_to": salary.get("to"),
+            "salary_currency": salary.get("currency"),
+            "salary_gross": salary.get("gross"),
+            "employer_id": vacancy["employer_id"],
+            "employer_name": employer.get("name"),
+            "employer_alternate_url": employer.get("alternate_url"),
+            "employer_accredited_it_employer": employer.get("accredited_it_employer")
+        }
+        if self.description:
+            row["description"] = vacancy["description"]
+        return row
+
+    def columns(self) -> list[str]:
+        return [column for column in COLUMNS if self.description or column != "description"]
+
+    def __iter__(self):
+        for vacancy in self.db.iter_value(VACANCY_FIELDS["name"]):
+            if self.areas is None or vacancy["area_id"] in self.areas:
+                yield self.row(vacancy)
+
+
+class NdjsonWriter:
+    """
+    ru: Запись строк в NDJSON (path="-" - в stdout).
+    en: Writing rows to NDJSON (path="-" - to stdout).
+    """
+    def __init__(self, path: str, columns: list[str]):
+        self.file = sys.stdout if path == "-" else open(path, 'w', newline="")
+
+    def write(self, rows: list[dict]):
+        self.file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+
+    def close(self):
+        if self.file is sys.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+
+class CsvWriter(NdjsonWriter):
+    """
+    ru: Запись строк в CSV с заголовком (path="-" - в stdout).
+    en: Writing rows to CSV with a header (path="-" - to stdout).
+    """
+    def __init__(self, path: str, columns: list[str]):
+        super().__init__(path, columns)
+        self.writer = csv.DictWriter(self.file, columns)
+        self.writer.writeheader()
+
+    def write(self, rows: list[dict]):
+        self.writer.writerows(rows)
+
+
+class ParquetWriter:
+    """
+    ru: Запись строк в Parquet: каждая пачка - отдельная группа строк (нужен pyarrow).
+    en: Writing rows to Parquet: every chunk is a separate row group (requires pyarrow).
+    """
+    def __init__(self, path: str, columns: list[str]):
+        if path == "-":
+            raise ValueError(f"{type(self).__name__} needs a file path")
+        import pyarrow
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(column, getattr(pyarrow, COLUMNS[column])()) for column in columns])
+        self.writer = self.open(path)
+
+    def open(self, path: str):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, rows: list[dict]):
+        self.writer.write_table(self.pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class ArrowWriter(ParquetWriter):
+    """
+    ru: Запись строк в файл Arrow IPC: каждая пачка - отдельный блок записей (нужен pyarrow).
+    en: Writing rows to an Arrow IPC file: every chunk is a separate record batch (requires pyarrow).
+    """
+    def open(self, path: str):
+        import pyarrow.ipc
+        return pyarrow.ipc.new_file(path, self.schema)
+
+
+# классы записи по формату / writer classes by format
+WRITERS = {"ndjson": NdjsonWriter, "csv": CsvWriter, "parquet": ParquetWriter, "arrow": ArrowWriter}
+
+
+def export_vacancies(
+        db: BaseDB,
+        path: str,
+        format_: str = "ndjson",
+        chunk_size: int = 10000,
+        description: bool = False,
+        areas: list[str] = None
+) -> int:
+    """
+    ru: Выгрузить вакансии базы плоскими строками пачками по chunk_size.
+    en: Export database vacancies as flat rows in chunks of chunk_size.
+    :param db: database object
+    :param path: путь к файлу ("-" - stdout для ndjson и csv)
+    :param format_: ndjson, csv, parquet или arrow
+    :param chunk_size: количество строк в пачке
+    :param description: выгружать HTML-описание вакансии
+    :param areas: id локаций выгружаемых вакансий (None - все вакансии)
+    :return: количество выгруженных вакансий
+    """
+    rows = VacancyRows(db, description, areas=areas)
+    writer = WRITERS[format_](path, rows.columns())
+    count = 0
+    try:
+        iterator = iter(rows)
+        while chunk := list(islice(iterator, chunk_size)):
+            writer.write(chunk)
+            count += len(chunk)
+    finally:
+        writer.close()
+    return count
@@ -0,0 +1,215 @@
+"""
+ru: Модуль для локального поиска сохраненных вакансий по координатам.
+Классы:
+    GridIndex: пространственный индекс-сетка (ячейки фиксированного размера в градусах)
+        с выборкой по прямоугольнику (bounding box) и поиском N ближайших вакансий
+
+en: Module for local search of saved vacancies by coordinates.
+Classes:
+    GridIndex: grid spatial index (fixed size cells in degrees)
+        with bounding box queries and nearest-N search
+"""
+
+import heapq
+import math
+
+from src.data_base import BaseDB
+from src.utils import ReadData
+
+# радиус Земли в км / Earth radius in km
+EARTH_RADIUS_KM = 6371.0088
+# длина одного градуса широты в км / length of one degree of latitude in km
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    ru: Расстояние между двумя точками по поверхности Земли в км.
+    en: Distance between two points on the Earth surface in km.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def wrap_lng(lng: float) -> float:
+    """
+    ru: Долгота, приведенная к диапазону [-180, 180).
+    en: Longitude normalized to the range [-180, 180).
+    """
+    return (lng + 180) % 360 - 180
+
+
+class GridIndex:
+    """
+    ru: Класс пространственного индекса-сетки.
+        Точка попадает в ячейку (floor(lat / cell_size), floor((lng + 180) / cell_size)),
+        поэтому выборка по прямоугольнику просматривает только пересекающиеся с ним ячейки,
+        а поиск ближайших - кольца ячеек вокруг точки, пока следующее кольцо не может дать более близкую точку.
+        Долгота замыкается на ±180: прямоугольник через антимеридиан (left_lng > right_lng) делится на два,
+        а столбцы колец берутся по модулю числа столбцов.
+    en: Class of the grid spatial index.
+        A point falls into the cell (floor(lat / cell_size), floor((lng + 180) / cell_size)),
+        so a bounding box query scans only the cells intersecting it,
+        and nearest search scans rings of cells around the point until the next ring cannot give a closer point.
+        Longitude wraps at ±180: a bounding box across the antimeridian (left_lng > right_lng) is split in two,
+        and ring columns are taken modulo the number of columns.
+    """
+    def __init__(self, cell_size: float = 0.1):
+        """
+        :param cell_size: размер ячейки в градусах
+        """
+        self.cell_size = cell_size
+        self.columns = math.ceil(360 / cell_size)
+        self.cells = {}
+        self.points = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def cell(self, lat: float, lng: float) -> tuple[int, int]:
+        """
+        ru: Ячейка сетки для координат.
+        en: Grid cell for coordinates.
+        """
+        return math.floor(lat / self.cell_size), math.floor((wrap_lng(lng) + 180) / self.cell_size)
+
+    def insert(self, id_: str, lat: float, lng: float):
+        """
+        ru: Добавить (или переместить) точку.
+        en: Add (or move) a point.
+        """
+        if id_ in self.points:
+            self.remove(id_)
+        lng = wrap_lng(lng)
+        self.points[id_] = (lat, lng)
+        self.cells.setdefault(self.cell(lat, lng), set()).add(id_)
+
+    def remove(self, id_: str):
+        """
+        ru: Удалить точку.
+        en: Remove a point.
+        """
+        lat, lng = self.points.pop(id_)
+        cell = self.cell(lat, lng)
+        self.cells[cell].discard(id_)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    @classmethod
+    def from_records(cls, records: list[dict], cell_size: float = 0.1) -> "GridIndex":
+        """
+        ru: Построить индекс по записям таблицы адресов.
+        en: Build the index from address table records.
+        """
+        index = cls(cell_size)
+        for record in records:
+            if record.get("lat") is not None and record.get("lng") is not None:
+                index.insert(record["vacancy_id"], float(record["lat"]), float(record["lng"]))
+        return index
+
+    @classmethod
+    def from_db(cls, db: BaseDB, cell_size: float = 0.1) -> "GridIndex":
+        """
+        ru: Построить индекс по сохраненным адресам вакансий.
+        en: Build the index from saved vacancy addresses.
+        """
+        return cls.from_records(ReadData(db).get_address(), cell_size)
+
+    def bbox(self, top_lat: float, bottom_lat: float, left_lng: float, right_lng: float) -> list[str]:
+        """
+        ru: id вакансий внутри прямоугольника (параметры как у HHFindVacancy.find).
+            Если left_lng > right_lng (после приведения к [-180, 180)), прямоугольник пересекает антимеридиан.
+        en: Ids of vacancies inside the bounding box (parameters as in HHFindVacancy.find).
+            If left_lng > right_lng (after normalization to [-180, 180)), the box crosses the antimeridian.
+        """
+        if right_lng - left_lng >= 360:
+            return self.bbox_range(top_lat, bottom_lat, -180, 180)
+        left_lng, right_lng = wrap_lng(left_lng), wrap_lng(right_lng)
+        if left_lng <= right_lng:
+            return self.bbox_range(top_lat, bottom_lat, left_lng, right_lng)
+        return (
+            self.bbox_range(top_lat, bottom_lat, left_lng, 180)
+            + self.bbox_range(top_lat, bottom_lat, -180, right_lng)
+        )
+
+    def bbox_range(self, top_lat: float, bottom_lat: float, left_lng: float, right_lng: float) -> list[str]:
+        """
+        ru: id вакансий внутри прямоугольника, не пересекающего антимеридиан (-180 <= left_lng <= right_lng <= 180).
+        en: Ids of vacancies inside a bounding box that does not cross the antimeridian
+            (-180 <= left_lng <= right_lng <= 180).
+        """
+        bottom = math.floor(bottom_lat / self.cell_size)
+        top = math.floor(top_lat / self.cell_size)
+        left = math.floor((left_lng + 180) / self.cell_size)
+        right = min(math.floor((right_lng + 180) / self.cell_size), self.columns - 1)
+        result = []
+        if (top - bottom + 1) * (right - left + 1) > len(self.cells):
+            cells = [cell for cell in self.cells if bottom <= cell[0] <= top and left <= cell[1] <= right]
+        else:
+            cells = [(i, j) for i in range(bottom, top + 1) for j in range(left, right + 1) if (i, j) in self.cells]
+        for cell in cells:
+            for id_ in self.cells[cell]:
+                lat, lng = self.points[id_]
+                if bottom_lat <= lat <= top_lat and left_lng <= lng <= right_lng:
+                    result.append(id_)
+        return result
+
+    def ring(self, center: tuple[int, int], radius: int) -> list[tuple[int, int]]:
+        """
+        ru: Занятые ячейки на границе квадрата радиуса radius вокруг ячейки center (столбцы - по модулю columns).
+        en: Occupied cells on the border of a square of radius radius around the center cell
+            (columns are taken modulo columns).
+        """
+        i0, j0 = center
+        if radius == 0:
+            return [center] if center in self.cells else []
+        cells = []
+        for j in range(j0 - radius, j0 + radius + 1):
+            j %= self.columns
+            cells.extend(cell for cell in ((i0 - radius, j), (i0 + radius, j)) if cell in self.cells)
+        for i in range(i0 - radius + 1, i0 + radius):
+            cells.extend(
+                cell for cell in ((i, (j0 - radius) % self.columns), (i, (j0 + radius) % self.columns))
+                if cell in self.cells
+            )
+        return cells
+
+    def nearest(self, lat: float, lng: float, n: int = 10) -> list[tuple[str, float]]:
+        """
+        ru: N ближайших вакансий к точке (параметры как sort_point_lat/sort_point_lng у HHFindVacancy.find).
+        en: N nearest vacancies to the point (parameters as sort_point_lat/sort_point_lng in HHFindVacancy.find).
+        :return: список (id вакансии, расстояние в км) по возрастанию расстояния
+        """
+        n = min(n, len(self.points))
+        if n <= 0:
+            return []
+        center = self.cell(lat, lng)
+        heap = []
+        seen = 0
+        radius = 0
+        while True:
+            if (2 * radius + 1) ** 2 > len(self.cells) or 2 * radius + 1 > self.columns:
+                # кольца стали больше числа занятых ячеек или замкнулись по долготе - дешевле просмотреть все точки
+                # rings outgrew the occupied cells or wrapped around in longitude - scanning all points is cheaper
+                distances = ((id_, haversine(lat, lng, *point)) for id_, point in self.points.items())
+                return heapq.nsmallest(n, distances, key=lambda item: item[1])
+            for cell in self.ring(center, radius):
+                for id_ in self.cells[cell]:
+                    seen += 1
+                    distance = haversine(lat, lng, *self.points[id_])
+                    if len(heap) < n:
+                        heapq.heappush(heap, (-distance, id_))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, id_))
+            if seen == len(self.points):
+                break
+            # непросмотренные точки дальше radius ячеек по широте или долготе
+            # unseen points are farther than radius cells by latitude or longitude
+            degrees = radius * self.cell_size
+            max_lat = min(89.999, abs(lat) + degrees)
+            bound = degrees * KM_PER_DEGREE * math.cos(math.radians(max_lat))
+            if len(heap) == n and bound >= -heap[0][0]:
+                break
+            radius += 1
+        return sorted(((id_, -distance) for distance, id_ in heap), key=lambda item: item[1])
@@ -0,0 +1,365 @@
+"""
+ru: Модуль для инкрементальной выгрузки вакансий с hh.ru.
+Классы:
+    HHQuerySplitter: разбиение запроса на части (опыт работы, локация, окна дат), в каждой из которых
+        результатов не больше лимита hh.ru (2000), с параллельной выгрузкой частей и удалением дублей
+    CheckpointStore: хранилище контрольных точек (последняя дата публикации) для сохраненных запросов
+    HHHarvester: выгрузка только новых вакансий с момента последней контрольной точки.
+        Окно дат разбивается на подокна, в каждом из которых результатов не больше лимита hh.ru (2000).
+
+en: Module for incremental harvesting of vacancies from hh.ru.
+Classes:
+    HHQuerySplitter: splitting a query into partitions (experience, area, date windows), each with
+        no more results than the hh.ru limit (2000), with parallel fetching of partitions and deduplication
+    CheckpointStore: storage of checkpoints (last publication date) for saved queries
+    HHHarvester: fetches only new vacancies since the last checkpoint.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from src.api_errors import ApiBaseError
+from src.config import CHECKPOINTS_PATH
+from src.data_base import BaseDB
+from src.dedup import VacancyDeduplicator
+from src.hh_parser import HHFindVacancy, HHGenerateVacanciesList
+from src.metrics import metrics
+from src.reference import ReferenceCache
+from src.utils import WriteData
+
+# лимит выдачи hh.ru: per_page * page <= 2000 / hh.ru results limit: per_page * page <= 2000
+MAX_RESULTS = 2000
+# параметры запроса, которые задает сам harvester / request parameters set by the harvester itself
+RESERVED_PARAMETERS = ("page", "per_page", "date_from", "date_to", "period")
+# id опыта работы (https://api.hh.ru/dictionaries) / experience ids (https://api.hh.ru/dictionaries)
+EXPERIENCE_IDS = ["noExperience", "between1And3", "between3And6", "moreThan6"]
+
+
+def parse_date(date: str) -> datetime.datetime:
+    """
+    ru: Разбор даты hh.ru (дата без часового пояса считается UTC).
+    en: Parsing an hh.ru date (a date without a timezone is treated as UTC).
+    """
+    parsed = datetime.datetime.fromisoformat(date)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def format_date(date: datetime.datetime) -> str:
+    """
+    ru: Дата в формате ISO 8601 для параметров date_from/date_to.
+    en: Date in ISO 8601 format for the date_from/date_to parameters.
+    """
+    return date.isoformat(timespec="seconds")
+
+
+class HHQuerySplitter:
+    """
+    ru: Класс для разбиения запроса вакансий на части, доступные целиком через постраничную выдачу.
+        Часть, в которой найдено больше MAX_RESULTS вакансий, рекурсивно делится:
+        по опыту работы, затем по дочерним локациям (если задана функция area_children), затем пополам по датам.
+        Разбиение используется, только если его части покрывают всю выдачу: например, вакансии, привязанные
+        к самой родительской локации, не попадают в дочерние, поэтому такая локация делится по датам.
+        Часть, которую нельзя разделить до лимита (окно дат min_window), выгружается не полностью
+        и сохраняется в self.truncated.
+        Зарплата не используется: параметр salary в hh.ru - не диапазон, а вхождение значения в вилку,
+        поэтому он не разбивает выдачу на непересекающиеся части.
+    en: Class for splitting a vacancy query into partitions that are fully reachable through paging.
+        A partition with more than MAX_RESULTS found vacancies is split recursively:
+        by experience, then by child areas (if area_children is given), then in half by dates.
+        A split is used only if its parts cover all results: e.g. vacancies attached to the parent area itself
+        are not found in the child areas, so such an area is split by dates.
+        A partition that cannot be split below the limit (the min_window date window) is fetched incompletely
+        and is saved to self.truncated.
+        Salary is not used: the hh.ru salary parameter is not a range but a value within the salary fork,
+        so it does not split the results into disjoint partitions.
+    """
+    def __init__(
+            self,
+            finder_factory: callable = HHFindVacancy,
+            per_page: int = 100,
+            area_children: callable = None,
+            default_days: int = 30,
+            min_window: datetime.timedelta = datetime.timedelta(minutes=1),
+            max_workers: int = 4
+    ):
+        """
+        :param finder_factory: фабрика объектов поиска (на каждый запрос - свой объект, т.к. он хранит параметры)
+        :param per_page: количество вакансий на странице (<= 100)
+        :param area_children: функция, возвращающая id дочерних локаций по id локации
+            (например, AreaTree.children из src.reference)
+        :param default_days: глубина окна дат, если date_from не задан
+        :param min_window: минимальная длина окна дат
+        :param max_workers: количество потоков для выгрузки страниц
+        """
+        self.finder_factory = finder_factory
+        self.per_page = per_page
+        self.area_children = area_children
+        self.default_days = default_days
+        self.min_window = min_window
+        self.max_workers = max_workers
+        # части, выгруженные не полностью: (параметры, найдено) / partitions fetched incompletely: (parameters, found)
+        self.truncated = []
+
+    def find_page(self, parameters: dict, page: int) -> dict:
+        """
+        ru: Запрос одной страницы вакансий.
+        en: Request one page of vacancies.
+        """
+        return self.finder_factory().find(per_page=self.per_page, page=page, **parameters)
+
+    def split_experience(self, parameters: dict) -> list[dict]:
+        """
+        ru: Разбиение по опыту работы.
+        en: Splitting by experience.
+        """
+        if parameters.get("experience"):
+            return []
+        return [parameters | {"experience": experience} for experience in EXPERIENCE_IDS]
+
+    def split_area(self, parameters: dict) -> list[dict]:
+        """
+        ru: Разбиение по дочерним локациям.
+        en: Splitting by child areas.
+        """
+        if not self.area_children:
+            return []
+        return [parameters | {"area": area} for area in self.area_children(parameters.get("area"))]
+
+    def split_dates(self, parameters: dict) -> list[dict]:
+        """
+        ru: Разбиение окна дат пополам.
+        en: Splitting the date window in half.
+        """
+        if parameters.get("date_to"):
+            date_to = parse_date(parameters["date_to"])
+        else:
+            date_to = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        if parameters.get("date_from"):
+            date_from = parse_date(parameters["date_from"])
+        else:
+            date_from = date_to - datetime.timedelta(days=self.default_days)
+        if date_to - date_from <= self.min_window:
+            return []
+        middle = date_from + (date_to - date_from) / 2
+        return [
+            parameters | {"date_from": format_date(date_from), "date_to": format_date(middle)},
+            parameters | {"date_from": format_date(middle), "date_to": format_date(date_to)}
+        ]
+
+    def partition(self, parameters: dict, first_page: dict = None) -> list[tuple[dict, dict]]:
+        """
+        ru: Рекурсивно разбить запрос, пока в каждой части не больше MAX_RESULTS вакансий.
+        en: Recursively split the query until each partition has no more than MAX_RESULTS vacancies.
+        :param parameters: параметры запроса HHFindVacancy.find (кроме page и per_page)
+        :param first_page: первая страница ответа (если уже получена)
+        :return: список (параметры части, первая страница ответа)
+        """
+        first_page = first_page or self.find_page(parameters, 0)
+        if first_page["found"] <= MAX_RESULTS:
+            return [(parameters, first_page)]
+        for split in (self.split_experience, self.split_area, self.split_dates):
+            parts = split(parameters)
+            if not parts:
+                continue
+            pages = [self.find_page(part, 0) for part in parts]
+            if split != self.split_dates and sum(page["found"] for page in pages) < first_page["found"]:
+                # части не покрывают выдачу / the parts do not cover the results
+                continue
+            result = []
+            for part, page in zip(parts, pages):
+                result.extend(self.partition(part, page))
+            return result
+        self.truncated.append((parameters, first_page["found"]))
+        metrics.inc("harvest_truncated_total")
+        return [(parameters, first_page)]
+
+    def fetch(self, parameters: dict, progress: callable = None) -> list[dict]:
+        """
+        ru: Получить все вакансии запроса: разбиение на части и параллельная выгрузка страниц.
+            Вакансии, попавшие в несколько частей (например, на границе окон дат), удаляются по id.
+        en: Get all vacancies of the query: partitioning and parallel fetching of pages.
+            Vacancies found in several partitions (e.g. on a date window boundary) are deduplicated by id.
+        :param parameters: параметры запроса HHFindVacancy.find (кроме page и per_page)
+        :param progress: функция прогресса progress(stage, done, total), stage = "pages"
+        :return: список словарей вакансий
+        """
+        self.truncated = []
+        partitions = self.partition(parameters)
+        tasks = []
+        for part, first_page in partitions:
+            pages = min(first_page["pages"], MAX_RESULTS // self.per_page)
+            tasks.extend((part, page) for page in range(1, pages))
+        total = len(partitions) + len(tasks)
+        responses = []
+        if progress:
+            progress("pages", len(partitions), total)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for response in executor.map(lambda task: self.find_page(*task), tasks):
+                responses.append(response)
+                if progress:
+                    progress("pages", len(partitions) + len(responses), total)
+        unique = {}
+        for response in [first_page for _, first_page in partitions] + responses:
+            for item in response["items"]:
+                unique.setdefault(item["id"], item)
+        return list(unique.values())
+
+
+class CheckpointStore:
+    """
+    ru: Хранилище контрольных точек в JSON-файле.
+        Ключ - хеш параметров сохраненного запроса, значение - последняя дата публикации (watermark).
+    en: Checkpoint storage in a JSON file.
+        The key is a hash of the saved query parameters, the value is the last publication date (watermark).
+    """
+    def __init__(self, path: str = CHECKPOINTS_PATH):
+        """
+        :param path: путь к файлу контрольных точек
+        """
+        self.path = path
+
+    @staticmethod
+    def query_key(parameters: dict) -> str:
+        """
+        ru: Ключ сохраненного запроса (не зависит от порядка и пустых параметров).
+        en: Key of the saved query (independent of order and empty parameters).
+        :param parameters: параметры запроса
+        """
+        clean = {key: value for key, value in parameters.items() if value is not None}
+        return hashlib.sha1(json.dumps(clean, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+    def load(self) -> dict:
+        """
+        ru: Прочитать все контрольные точки.
+        en: Read all checkpoints.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as file:
+            return json.load(file)
+
+    def get(self, parameters: dict) -> str | None:
+        """
+        ru: Получить watermark сохраненного запроса.
+        en: Get the watermark of the saved query.
+        :param parameters: параметры запроса
+        """
+        checkpoint = self.load().get(self.query_key(parameters))
+        return checkpoint["watermark"] if checkpoint else None
+
+    def set(self, parameters: dict, watermark: str):
+        """
+        ru: Сохранить watermark запроса.
+        en: Save the query watermark.
+        :param parameters: параметры запроса
+        :param watermark: последняя дата публикации
+        """
+        data = self.load()
+        data[self.query_key(parameters)] = {"parameters": parameters, "watermark": watermark}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, 'w') as file:
+            json.dump(data, file, ensure_ascii=False, indent=4)
+
+
+class HHHarvester:
+    """
+    ru: Класс для инкрементальной выгрузки вакансий в базу данных.
+        Окно дат от контрольной точки до текущего момента выгружается через HHQuerySplitter.
+    en: Class for incremental harvesting of vacancies into the database.
+        The date window from the checkpoint to the current moment is fetched through HHQuerySplitter.
+    """
+    def __init__(
+            self,
+            db: BaseDB,
+            checkpoints: CheckpointStore = None,
+            splitter: HHQuerySplitter = None,
+            initial_days: int = 30,
+            dedup: VacancyDeduplicator = None,
+            references: ReferenceCache = None,
+            batch_size: int = 1000
+    ):
+        """
+        :param db: database object
+        :param checkpoints: хранилище контрольных точек
+        :param splitter: объект разбиения запроса
+        :param initial_days: глубина первой выгрузки в днях (если контрольной точки еще нет)
+        :param dedup: объект поиска дублей (None - без поиска дублей)
+        :param references: кэш справочников: таблицы справочников заполняются один раз перед выгрузкой,
+            и вакансии записываются без справочников (None - справочники записываются с каждой вакансией)
+        :param batch_size: количество вакансий в пачке записи (каждая таблица записывается один раз на пачку)
+        """
+        self.write_data = WriteData(db, dedup=dedup)
+        self.references = references
+        self.checkpoints = checkpoints or CheckpointStore()
+        self.splitter = splitter or HHQuerySplitter()
+        self.initial_days = initial_days
+        self.batch_size = batch_size
+
+    def populate_references(self):
+        """
+        ru: Заполнить таблицы справочников из кэша справочников (один раз).
+            Если у объекта разбиения не задана функция area_children, запросы делятся по дереву локаций кэша.
+            Если справочники недоступны, вакансии записываются вместе со справочниками.
+        en: Populate reference tables from the reference cache (once).
+            If the splitter has no area_children function, queries are split by the cache area tree.
+            If reference data is unavailable, vacancies are written together with their references.
+        """
+        if self.references is None or not self.write_data.write_references:
+            return
+        try:
+            self.references.populate(self.write_data.db)
+            if self.splitter.area_children is None:
+                self.splitter.area_children = self.references.area_tree().children
+        except ApiBaseError:
+            self.references = None
+            return
+        self.write_data.write_references = False
+
+    def harvest(self, date_to: datetime.datetime = None, progress: callable = None, **parameters) -> int:
+        """
+        ru: Выгрузить новые вакансии сохраненного запроса и сдвинуть его контрольную точку.
+            Контрольная точка сохраняется только после успешной записи всех вакансий
+            и не сдвигается дальше начала самого раннего окна, которое не удалось уложить в MAX_RESULTS:
+            недополученные вакансии этого окна выгрузит следующий запуск.
+        en: Harvest new vacancies of the saved query and move its checkpoint.
+            The checkpoint is saved only after all vacancies have been written successfully
+            and does not move past the start of the earliest window that could not fit into MAX_RESULTS:
+            the missed vacancies of that window are fetched by the next run.
+        :param date_to: верхняя граница окна (по умолчанию - текущее время; дата без часового пояса считается UTC)
+        :param progress: функция прогресса progress(stage, done, total), stage - "pages" или "write"
+        :param parameters: параметры запроса HHFindVacancy.find (кроме page, per_page, date_from, date_to, period)
+        :return: количество записанных вакансий
+        """
+        self.populate_references()
+        parameters = {key: value for key, value in parameters.items() if key not in RESERVED_PARAMETERS}
+        date_to = date_to or datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        if date_to.tzinfo is None:
+            date_to = date_to.replace(tzinfo=datetime.timezone.utc)
+        watermark = self.checkpoints.get(parameters)
+        if watermark:
+            date_from = parse_date(watermark)
+        else:
+            date_from = date_to - datetime.timedelta(days=self.initial_days)
+        items = self.splitter.fetch(
+            parameters | {"date_from": format_date(date_from), "date_to": format_date(date_to)},
+            progress
+        )
+        latest = date_from
+        vacancies = HHGenerateVacanciesList(items).iter_generate()
+        written = 0
+        while batch := list(islice(vacancies, self.batch_size)):
+            self.write_data.add_vacancies(batch)
+            latest = max([latest] + [parse_date(vacancy.published_at) for vacancy in batch])
+            written += len(batch)
+            if progress:
+                progress("write", written, len(items))
+        if self.splitter.truncated:
+            latest = min([latest] + [parse_date(part["date_from"]) for part, _ in self.splitter.truncated])
+        self.checkpoints.set(parameters, format_date(latest))
+        return len(items)
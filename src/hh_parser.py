@@ -21,18 +21,23 @@ en: Module for working with the hh.ru API.
 """
 
 import datetime
+import os
 
 from src.api_errors import AttrValueRestrictionError
-from src.api_parser import ApiFindBase, ApiInfoBase
+from src.api_parser import ApiBase, ApiFindBase, ApiInfoBase
 from src.api_parser import JobObject
 from src.api_parser import GenerateObjectsList
 
-# API URL
+# API URL (HH_API_URL - например, адрес локального mock-сервера / e.g. the local mock server address)
+API_URL = os.environ.get("HH_API_URL", "https://api.hh.ru").rstrip("/")
 SCOPES = {
-    "find_vacancies": "https://api.hh.ru/vacancies",
-    "find_employers": "https://api.hh.ru/employers",
-    "info_vacancy": "https://api.hh.ru/vacancies",
-    "info_employer": "https://api.hh.ru/employers"
+    "find_vacancies": f"{API_URL}/vacancies",
+    "find_employers": f"{API_URL}/employers",
+    "info_vacancy": f"{API_URL}/vacancies",
+    "info_employer": f"{API_URL}/employers",
+    "dictionaries": f"{API_URL}/dictionaries",
+    "areas": f"{API_URL}/areas",
+    "industries": f"{API_URL}/industries"
 }
 
 # API HEADERS
@@ -47,7 +52,7 @@ class HHFindVacancy(ApiFindBase):
     def __init__(self):
         self.scope = SCOPES["find_vacancies"]
         self.headers = HEADERS
-        super().__init__(self.scope, self.headers)
+        super().__init__(self.scope, self.headers, "find_vacancies")
 
     def find(
             self,
@@ -83,7 +88,9 @@ class HHFindVacancy(ApiFindBase):
             part_time: str = None,
             accept_temporary: bool = False,
             locale: str = "RU",
-            host: str = "hh.ru"
+            host: str = "hh.ru",
+            stream: bool = False,
+            meta: dict = None
     ):
         """
         ru: Метод поиска с параметрами запроса
@@ -122,10 +129,14 @@ class HHFindVacancy(ApiFindBase):
         :param accept_temporary: boolean, Принимаются временные вакансии
         :param locale: string, Локализация
         :param host: string, Хост
+        :param stream: boolean, Вернуть генератор вакансий с потоковым разбором ответа
+        :param meta: dict, Словарь для остальных полей ответа (found, pages) при stream=True
         """
         if not 1 <= per_page <= 100:
             raise AttrValueRestrictionError()
         return super().find(
+            stream=stream,
+            meta=meta,
             per_page=per_page,
             page=page,
             text=text,
@@ -170,7 +181,7 @@ class HHFindEmployer(ApiFindBase):
     def __init__(self):
         self.scope = SCOPES["find_employers"]
         self.headers = HEADERS
-        super().__init__(self.scope)
+        super().__init__(self.scope, breaker_scope="find_employers")
 
     def find(
             self,
@@ -223,7 +234,7 @@ class HHInfoVacancy(ApiInfoBase):
         self.id_ = id_
         self.scope = SCOPES["info_vacancy"]
         self.headers = HEADERS
-        super().__init__(self.scope, id_, self.headers)
+        super().__init__(self.scope, id_, self.headers, "info_vacancy")
 
     def info(
             self,
@@ -249,7 +260,7 @@ class HHInfoEmployer(ApiInfoBase):
         self.id_ = id_
         self.scope = SCOPES["info_employer"]
         self.headers = HEADERS
-        super().__init__(self.scope, id_, self.headers)
+        super().__init__(self.scope, id_, self.headers, "info_employer")
 
     def info(
             self,
@@ -266,6 +277,58 @@ class HHInfoEmployer(ApiInfoBase):
         return super().info(self.id_, locale=locale, host=host)
 
 
+class HHReference(ApiBase):
+    """
+    ru: Базовый класс для запроса справочников hh.ru.
+    en: Base class for requesting hh.ru reference data.
+    """
+    scope_name = None
+
+    def __init__(self):
+        self.scope = SCOPES[self.scope_name]
+        self.headers = HEADERS
+        super().__init__(self.scope, self.headers, self.scope_name)
+
+    def info(
+            self,
+            locale: str = "RU",
+            host: str = "hh.ru"
+    ) -> dict | list:
+        """
+        ru: Метод для возврата справочника.
+        en: Method for returning the reference data.
+
+        :param locale: string, Locale
+        :param host: string, Host
+        """
+        self.parameters = {"locale": locale, "host": host}
+        return self._query()
+
+
+class HHDictionaries(HHReference):
+    """
+    ru: Класс для запроса справочников (опыт работы, тип занятости, график работы, валюты и др.).
+    en: Class for requesting dictionaries (experience, employment, schedule, currency, etc.).
+    """
+    scope_name = "dictionaries"
+
+
+class HHAreas(HHReference):
+    """
+    ru: Класс для запроса дерева локаций.
+    en: Class for requesting the area tree.
+    """
+    scope_name = "areas"
+
+
+class HHIndustries(HHReference):
+    """
+    ru: Класс для запроса дерева отраслей.
+    en: Class for requesting the industry tree.
+    """
+    scope_name = "industries"
+
+
 class HHSchedule(JobObject):
     """
     ru: Класс для создания объекта графика работы.
@@ -359,8 +422,19 @@ class HHArea(JobObject):
 class HHSalary(JobObject):
     """
     ru: Класс для создания объекта зарплаты.
+        Ключ сравнения (середина вилки или одна из границ) считается один раз при создании;
+        если задана таблица курсов (HHSalary.rates, см. CurrencyRates.install), ключ приводится к базовой валюте.
+        Зарплата в валюте, которой нет в таблице курсов, не сравнивается с пересчитанными по сумме:
+        она больше любой пересчитанной (при сортировке по возрастанию - в конце), а между собой - по сумме.
     en: Class for creating a salary object.
+        The comparison key (middle of the fork or one of the bounds) is computed once on creation;
+        if a rate table is set (HHSalary.rates, see CurrencyRates.install), the key is converted to the base currency.
+        A salary in a currency missing from the rate table is not compared with converted ones by the amount:
+        it is greater than any converted one (last in an ascending sort), and such salaries compare by the amount.
     """
+    # таблица курсов валют (CurrencyRates) / currency rate table (CurrencyRates)
+    rates = None
+
     def __init__(
             self,
             from_: int | None,
@@ -379,32 +453,48 @@ class HHSalary(JobObject):
         self.currency = currency
         self.gross = gross
         super().__init__(from_=from_, to=to, currency=currency, gross=gross)
+        if self.rates:
+            self.set_key(self.rates.to_base_currency([self.value], [currency])[0])
+        else:
+            self.set_key(None, converted=False)
+
+    @property
+    def value(self) -> float | None:
+        """
+        ru: Середина вилки или одна из указанных границ в валюте зарплаты.
+        en: Middle of the fork or one of the given bounds in the salary currency.
+        """
+        if self.from_ and self.to:
+            return (self.from_ + self.to) / 2
+        return self.from_ or self.to
+
+    def set_key(self, key: float | None, converted: bool = True):
+        """
+        ru: Установить ключ сравнения.
+        en: Set the comparison key.
+        :param key: сумма в базовой валюте (None - валюта неизвестна таблице курсов)
+        :param converted: ключ получен пересчетом (False - сравнение по сумме без пересчета валюты)
+        """
+        self._known = key is not None or not converted
+        self._key = (0, key) if key is not None else (0 if self._known else 1, self.value)
+
+    @property
+    def known(self) -> bool:
+        """
+        ru: Ключ сравнения в базовой валюте или без пересчета (False - валюта неизвестна таблице курсов).
+        en: The comparison key is in the base currency or unconverted (False - the currency is unknown to the rate table).
+        """
+        return self._known
 
     def __lt__(self, other):
         if not other:
             return False
-        self_list = [self.from_, self.to]
-        other_list = [other.from_, other.to]
-        if all(self_list) and all(other_list):
-            return sum(self_list) / 2 < sum(other_list) / 2
-        elif all(self_list) and any(other_list):
-            return sum(self_list) / 2 < (other.from_ or other.to)
-        elif any(self_list) and all(other_list):
-            return (self.from_ or self.to) < sum(other_list) / 2
-        return (self.from_ or self.to) < (other.from_ or other.to)
+        return self._key < other._key
 
     def __gt__(self, other):
         if not other:
             return True
-        self_list = [self.from_, self.to]
-        other_list = [other.from_, other.to]
-        if all(self_list) and all(other_list):
-            return sum(self_list) / 2 > sum(other_list) / 2
-        elif all(self_list) and any(other_list):
-            return sum(self_list) / 2 > (other.from_ or other.to)
-        elif any(self_list) and all(other_list):
-            return (self.from_ or self.to) > sum(other_list) / 2
-        return (self.from_ or self.to) > (other.from_ or other.to)
+        return self._key > other._key
 
     def __str__(self):
         if self.from_ and self.to:
@@ -577,31 +667,38 @@ class HHVacancy(JobObject):
 class HHGenerateVacanciesList(GenerateObjectsList):
     """
     ru: Класс для генерации списка объектов вакансий.
+        Словари валидируются по одному при генерации, поэтому items может быть потоковым генератором
+        (например, HHFindVacancy().find(stream=True)).
     en: Class for generating a list of vacancy objects.
+        Dictionaries are validated one by one during generation, so items can be a streaming generator
+        (e.g. HHFindVacancy().find(stream=True)).
     """
-    def __init__(self, items: list[dict]):
+    def __init__(self, items):
         """
-        :param items: list, Список словарей с параметрами вакансий
+        :param items: list, Список (или итератор) словарей с параметрами вакансий
         """
-        # валидация словарей / validation of dictionaries
-        valid_items = []
-        for item in items:
-            new_dict = {
-                "id_": item["id"],
-                "name": item["name"],
-                "created_at": item["created_at"],
-                "published_at": item["published_at"],
-                "alternate_url": item["alternate_url"],
-                "employer": item["employer"],
-                "salary": item["salary"],
-                "area": item["area"],
-                "experience": item["experience"],
-                "employment": item["employment"],
-                "schedule": item["schedule"],
-                "description": item.get("description")
-            }
-            valid_items.append(new_dict)
-        super().__init__(valid_items)
+        super().__init__(items)
+
+    def prepare(self, item: dict) -> dict:
+        """
+        ru: Валидация словаря вакансии.
+        en: Validation of a vacancy dictionary.
+        """
+        return {
+            "id_": item["id"],
+            "name": item["name"],
+            "created_at": item["created_at"],
+            "published_at": item["published_at"],
+            "alternate_url": item["alternate_url"],
+            "employer": item["employer"],
+            "salary": item["salary"],
+            "area": item["area"],
+            "experience": item["experience"],
+            "employment": item["employment"],
+            "schedule": item["schedule"],
+            "description": item.get("description"),
+            "address": item.get("address")
+        }
 
     def get_object(self):
         """
@@ -0,0 +1,234 @@
+"""
+ru: Модуль для преобразования HTML-описаний вакансий и работодателей в текст (html2text) с кэшированием.
+    Текст хранится в таблице description_text по хешу HTML: одинаковые описания преобразуются один раз,
+    а списки и поиск читают готовый текст без повторного разбора HTML.
+Функции:
+    description_hash: ключ описания (sha1 от HTML)
+    html_to_text: преобразование одного описания (выполняется и в дочерних процессах)
+Классы:
+    HtmlTextConverter: LRU-кэш в памяти, кэш в базе данных и пакетное преобразование в пуле процессов
+
+en: Module for converting HTML descriptions of vacancies and employers to text (html2text) with caching.
+    The text is stored in the description_text table by the HTML hash: equal descriptions are converted once,
+    and lists and search read the ready text without parsing HTML again.
+Functions:
+    description_hash: description key (sha1 of the HTML)
+    html_to_text: conversion of one description (also runs in child processes)
+Classes:
+    HtmlTextConverter: in-memory LRU cache, database cache and batch conversion in a process pool
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from src.config import DESCRIPTION_TEXT_FIELDS, VACANCY_FIELDS, EMPLOYER_FIELDS
+from src.data_base import BaseDB, JsonLinesDB
+from src.metrics import metrics
+
+
+def description_hash(html: str) -> str:
+    """
+    ru: Ключ описания в кэше.
+    en: Description key in the cache.
+    """
+    return hashlib.sha1(html.encode()).hexdigest()
+
+
+def html_to_text(html: str) -> str:
+    """
+    ru: Преобразовать HTML в текст.
+        Объект HTML2Text создается на каждый вызов: он хранит состояние разбора, а его создание почти бесплатно.
+    en: Convert HTML to text.
+        An HTML2Text object is created per call: it keeps parsing state, and creating it is almost free.
+    """
+    import html2text
+    return html2text.HTML2Text().handle(html)
+
+
+class HtmlTextConverter:
+    """
+    ru: Класс сервиса преобразования HTML в текст.
+        Порядок поиска текста: LRU-кэш в памяти -> таблица description_text -> html2text.
+        Пакет из bulk_threshold и более новых описаний преобразуется в пуле процессов.
+        Новые тексты записываются в таблицу, когда их накопилось flush_size (или при вызове flush).
+    en: HTML to text conversion service class.
+        Text lookup order: in-memory LRU cache -> description_text table -> html2text.
+        A batch of bulk_threshold or more new descriptions is converted in a process pool.
+        New texts are written to the table once flush_size of them have accumulated (or on flush).
+    """
+    def __init__(
+            self,
+            db: BaseDB = None,
+            cache_size: int = 4096,
+            processes: int = None,
+            bulk_threshold: int = 64,
+            flush_size: int = 1
+    ):
+        """
+        :param db: database object (None - только кэш в памяти)
+        :param cache_size: размер LRU-кэша в памяти (количество описаний)
+        :param processes: количество процессов для пакетного режима (None - по числу ядер)
+        :param bulk_threshold: минимальный размер пакета для пула процессов
+        :param flush_size: количество новых текстов, после которого они записываются в таблицу
+            (1 - сразу; больше - для одиночных преобразований, например в интерфейсе, чтобы не перезаписывать
+            таблицу JsonDB на каждое описание)
+        """
+        self.db = db
+        self.cache_size = cache_size
+        self.processes = processes
+        self.bulk_threshold = bulk_threshold
+        self.flush_size = flush_size
+        self.cache = OrderedDict()
+        self.unsaved = {}
+        self.lock = threading.Lock()
+
+    def cache_get(self, key: str) -> str | None:
+        with self.lock:
+            text = self.cache.get(key)
+            if text is not None:
+                self.cache.move_to_end(key)
+            return text
+
+    def cache_put(self, key: str, text: str):
+        with self.lock:
+            self.cache[key] = text
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def stored(self, keys: list[str] = None) -> dict[str, str]:
+        """
+        ru: Тексты из таблицы description_text (все или по списку ключей).
+            Ключи ищутся через индекс JsonLinesDB; для JsonDB таблица читается один раз,
+            и в результат попадают только запрошенные ключи.
+        en: Texts from the description_text table (all or by a list of keys).
+            Keys are looked up through the JsonLinesDB index; for JsonDB the table is read once,
+            and only the requested keys get into the result.
+        """
+        if self.db is None:
+            return {}
+        area_name = DESCRIPTION_TEXT_FIELDS["name"]
+        if keys is None:
+            records = self.db.iter_value(area_name)
+        elif isinstance(self.db, JsonLinesDB) or len(keys) == 1:
+            records = (
+                record for key in keys for record in self.db.select_value(area_name, {"key": "id", "value": key})
+            )
+        else:
+            wanted = set(keys)
+            records = (record for record in self.db.iter_value(area_name) if record["id"] in wanted)
+        return {record["id"]: record["text"] for record in records}
+
+    def flush(self) -> int:
+        """
+        ru: Записать накопленные новые тексты в таблицу description_text одной пакетной операцией.
+        en: Write the accumulated new texts to the description_text table in one batch operation.
+        :return: количество записанных текстов
+        """
+        with self.lock:
+            unsaved, self.unsaved = self.unsaved, {}
+        if self.db is not None and unsaved:
+            self.db.upsert_many(
+                DESCRIPTION_TEXT_FIELDS["name"],
+                [{"id": key, "text": text} for key, text in unsaved.items()],
+                DESCRIPTION_TEXT_FIELDS["key"]
+            )
+        return len(unsaved)
+
+    def convert(self, htmls: list[str]) -> list[str]:
+        """
+        ru: Преобразовать описания без кэша: большой пакет - в пуле процессов, малый - в текущем процессе.
+        en: Convert descriptions bypassing the cache: a large batch in a process pool, a small one in-process.
+        """
+        if len(htmls) < self.bulk_threshold:
+            return [html_to_text(html) for html in htmls]
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            return list(executor.map(html_to_text, htmls, chunksize=max(1, len(htmls) // 64)))
+
+    def texts(self, htmls: list[str]) -> list[str]:
+        """
+        ru: Тексты пакета описаний.
+            Новые тексты записываются в таблицу description_text одной пакетной операцией
+            (если вместе с ранее накопленными их не меньше flush_size).
+            Пустое описание (None) возвращается без изменений.
+        en: Texts of a batch of descriptions.
+            New texts are written to the description_text table in one batch operation
+            (if together with the previously accumulated ones there are at least flush_size of them).
+            An empty description (None) is returned unchanged.
+        :param htmls: HTML-описания
+        """
+        keys = [description_hash(html) if isinstance(html, str) else None for html in htmls]
+        found = {}
+        missing = []
+        for key in dict.fromkeys(key for key in keys if key):
+            text = self.cache_get(key)
+            if text is None:
+                missing.append(key)
+            else:
+                found[key] = text
+        if missing:
+            with self.lock:
+                unsaved = {key: self.unsaved[key] for key in missing if key in self.unsaved}
+            stored = unsaved | self.stored([key for key in missing if key not in unsaved])
+            html_by_key = dict(zip(keys, htmls))
+            new = {}
+            for key in missing:
+                if key in stored:
+                    found[key] = stored[key]
+                    self.cache_put(key, stored[key])
+                else:
+                    new[key] = html_by_key[key]
+            if new:
+                converted = dict(zip(new, self.convert(list(new.values()))))
+                for key, text in converted.items():
+                    found[key] = text
+                    self.cache_put(key, text)
+                with self.lock:
+                    self.unsaved.update(converted)
+                    full = len(self.unsaved) >= self.flush_size
+                if full:
+                    self.flush()
+            metrics.inc("html_text_total", len(missing) - len(new), source="db")
+            metrics.inc("html_text_total", len(new), source="html2text")
+        metrics.inc("html_text_total", len(found) - len(missing), source="memory")
+        return [found[key] if key else html for key, html in zip(keys, htmls)]
+
+    def text(self, html: str) -> str:
+        """
+        ru: Текст одного описания.
+        en: Text of one description.
+        """
+        return self.texts([html])[0]
+
+    def populate(self, prune: bool = True) -> int:
+        """
+        ru: Преобразовать все описания вакансий и работодателей в базе (пакетный режим).
+            Тексты описаний, которых больше нет в базе (вакансия удалена или описание изменилось),
+            удаляются из таблицы description_text.
+        en: Convert all vacancy and employer descriptions in the database (batch mode).
+            Texts of descriptions that are no longer in the database (a deleted vacancy or a changed description)
+            are deleted from the description_text table.
+        :param prune: удалить тексты отсутствующих описаний
+        :return: количество описаний в базе
+        """
+        htmls = [
+            record["description"]
+            for area_name in (VACANCY_FIELDS["name"], EMPLOYER_FIELDS["name"])
+            for record in self.db.iter_value(area_name)
+            if record["description"]
+        ]
+        self.texts(htmls)
+        self.flush()
+        if prune:
+            live = {description_hash(html) for html in htmls}
+            area_name = DESCRIPTION_TEXT_FIELDS["name"]
+            stale = [record["id"] for record in self.db.iter_value(area_name) if record["id"] not in live]
+            if stale:
+                self.db.delete_many(area_name, "id", stale)
+                with self.lock:
+                    for key in stale:
+                        self.cache.pop(key, None)
+            metrics.inc("html_text_pruned_total", len(stale))
+        return len(htmls)
@@ -0,0 +1,199 @@
+"""
+ru: Модуль для пакетного импорта (восстановления) базы из выгрузок вакансий hh.ru.
+    Поддерживаются файлы:
+        NDJSON - по вакансии (элементу items) или по странице ответа {"items": [...]} в строке
+        JSON - массив вакансий или страница ответа API {"items": [...]} (файл разбирается потоково)
+    Вакансии проверяются пачками скомпилированными схемами таблиц из config, записи всех таблиц
+    накапливаются в памяти с объединением по ключу, и каждая таблица (с индексом JsonLinesDB)
+    записывается один раз, а не по upsert на каждую вакансию.
+Классы:
+    HHImporter: импорт файлов выгрузок в базу данных
+
+en: Module for bulk import (restore) of the database from hh.ru vacancy dumps.
+    Supported files:
+        NDJSON - one vacancy (items element) or one response page {"items": [...]} per line
+        JSON - an array of vacancies or an API response page {"items": [...]} (the file is parsed in a streaming way)
+    Vacancies are validated in batches with the compiled config table schemas, records of all tables
+    are accumulated in memory merged by key, and each table (with the JsonLinesDB index)
+    is written once instead of an upsert per vacancy.
+Classes:
+    HHImporter: import of dump files into the database
+"""
+
+import json
+from itertools import chain, islice
+
+from src.api_errors import ApiBaseError
+from src.api_parser import iter_json_items
+from src.data_base import BaseDB, schema_validator
+from src.dedup import VacancyDeduplicator
+from src.hh_parser import HHGenerateVacanciesList
+from src.utils import WriteData, WRITE_ORDER, SKIP_NONE_AREAS
+
+# размер читаемого фрагмента файла JSON / JSON file read chunk size
+CHUNK_SIZE = 1 << 20
+
+
+def iter_items(path: str):
+    """
+    ru: Генератор словарей вакансий из файла выгрузки (формат определяется по содержимому).
+    en: Generator of vacancy dictionaries from a dump file (the format is detected by the content).
+    :param path: путь к файлу NDJSON или JSON
+    :raises OSError: файл недоступен
+    :raises ValueError: файл не является выгрузкой (неверный JSON, нет массива items)
+    """
+    with open(path, 'rb') as file:
+        first_line = file.readline()
+        if first_line.lstrip().startswith(b"["):
+            # массив верхнего уровня разбирается как страница {"items": [...]}
+            # a top-level array is parsed as an {"items": [...]} page
+            file.seek(0)
+            chunks = chain([b'{"items":'], iter(lambda: file.read(CHUNK_SIZE), b""), [b"}"])
+            yield from iter_json_items(chunks, "items")
+            return
+        try:
+            first = json.loads(first_line) if first_line.strip() else None
+        except json.JSONDecodeError:
+            # многострочный JSON-объект страницы ответа / multi-line JSON object of a response page
+            file.seek(0)
+            yield from iter_json_items(iter(lambda: file.read(CHUNK_SIZE), b""), "items")
+            return
+        lines = (json.loads(line) for line in file if line.strip())
+        for value in chain([first] if first is not None else [], lines):
+            if isinstance(value, dict) and isinstance(value.get("items"), list):
+                yield from value["items"]
+            else:
+                yield value
+
+
+class HHImporter:
+    """
+    ru: Класс импорта выгрузок вакансий.
+        Вакансии с ошибками (нет обязательного поля, неверный тип значения) пропускаются
+        и собираются в self.errors; остальные вакансии импортируются.
+    en: Vacancy dump import class.
+        Vacancies with errors (a missing required field, a wrong value type) are skipped
+        and collected in self.errors; the other vacancies are imported.
+    """
+    def __init__(
+            self,
+            db: BaseDB,
+            batch_size: int = 10000,
+            write_references: bool = True,
+            dedup: VacancyDeduplicator = None
+    ):
+        """
+        :param db: database object
+        :param batch_size: количество вакансий в пачке проверки
+        :param write_references: записывать справочники (локация, опыт, занятость, график)
+        :param dedup: объект поиска дублей (None - без поиска дублей)
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.write_data = WriteData(db, write_references, dedup)
+        self.fields = {fields["name"]: fields for fields in WRITE_ORDER}
+        self.generator = HHGenerateVacanciesList([])
+        self.records = {}
+        self.errors = {}
+        self.count = 0
+
+    def validate(self, area_name: str, records: list[dict]) -> set[int]:
+        """
+        ru: Проверка пачки записей таблицы скомпилированной схемой: состав полей и типы значений.
+        en: Validation of a batch of table records with the compiled schema: field names and value types.
+        :param area_name: название таблицы
+        :param records: записи
+        :return: номера неверных записей
+        """
+        validate = schema_validator(self.fields[area_name]["fields"])
+        invalid = set()
+        for i, record in enumerate(records):
+            try:
+                validate(record)
+            except TypeError:
+                invalid.add(i)
+        return invalid
+
+    def merge(self, area_name: str, record: dict):
+        """
+        ru: Добавить запись в накопленные записи таблицы (объединение по ключу, как при upsert).
+        en: Add a record to the accumulated table records (merge by key, as in upsert).
+        """
+        key = tuple(record[field] for field in self.fields[area_name]["key"])
+        stored = self.records.setdefault(area_name, {})
+        if key not in stored:
+            stored[key] = record
+        elif area_name in SKIP_NONE_AREAS:
+            stored[key].update({field: value for field, value in record.items() if value is not None})
+        else:
+            stored[key].update(record)
+
+    def add_batch(self, items: list[dict]) -> int:
+        """
+        ru: Проверить пачку вакансий и добавить их записи в накопленные.
+        en: Validate a batch of vacancies and add their records to the accumulated ones.
+        :return: количество принятых вакансий
+        """
+        object_class = self.generator.get_object()
+        columns = {}
+        invalid = set()
+        for i, item in enumerate(items):
+            try:
+                vacancy = object_class.create(**self.generator.prepare(item))
+                records = self.write_data.vacancy_records(vacancy)
+            except (KeyError, TypeError, AttributeError, ValueError, ApiBaseError) as e:
+                id_ = item.get("id") if isinstance(item, dict) else None
+                self.errors[id_ or f"#{self.count + i}"] = f"{type(e).__name__}: {e}"
+                invalid.add(i)
+                continue
+            for area_name, area_records in records.items():
+                indexes, column = columns.setdefault(area_name, ([], []))
+                indexes.extend([i] * len(area_records))
+                column.extend(area_records)
+        for area_name, (indexes, records) in columns.items():
+            for position in self.validate(area_name, records):
+                if indexes[position] not in invalid:
+                    invalid.add(indexes[position])
+                    self.errors[items[indexes[position]]["id"]] = f"TypeError: invalid {area_name} record"
+        for area_name, (indexes, records) in columns.items():
+            for index, record in zip(indexes, records):
+                if index not in invalid:
+                    self.merge(area_name, record)
+        self.count += len(items)
+        return len(items) - len(invalid)
+
+    def import_items(self, items) -> int:
+        """
+        ru: Проверить и накопить вакансии из итератора пачками по batch_size.
+        en: Validate and accumulate vacancies from an iterator in batches of batch_size.
+        :return: количество принятых вакансий
+        """
+        accepted = 0
+        items = iter(items)
+        while batch := list(islice(items, self.batch_size)):
+            accepted += self.add_batch(batch)
+        return accepted
+
+    def write(self) -> dict[str, int]:
+        """
+        ru: Записать накопленные записи: каждая таблица записывается одним upsert_many.
+        en: Write the accumulated records: each table is written with one upsert_many.
+        :return: {название таблицы: количество записей}
+        """
+        written = self.write_data.write_records(
+            {area_name: list(records.values()) for area_name, records in self.records.items()}
+        )
+        self.records = {}
+        return written
+
+    def import_files(self, paths: list[str]) -> dict:
+        """
+        ru: Импортировать файлы выгрузок.
+        en: Import dump files.
+        :param paths: пути к файлам NDJSON или JSON
+        :return: отчет {"items", "imported", "invalid", "tables"}
+        """
+        self.errors = {}
+        self.count = 0
+        imported = sum(self.import_items(iter_items(path)) for path in paths)
+        return {"items": self.count, "imported": imported, "invalid": len(self.errors), "tables": self.write()}
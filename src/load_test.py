@@ -0,0 +1,163 @@
+"""
+ru: Нагрузочный тест клиента API hh.ru на локальном mock-сервере.
+    Выполняет запросы сценария с разным уровнем параллельности и выводит запросы в секунду,
+    задержки p50/p95/p99 и количество ошибок по типам.
+    Запуск: python -m src.load_test --scenario find_vacancies --requests 500 --concurrency 1,4,16 --latency 0.02
+Функции:
+    run_load: выполнить сценарий и вернуть отчет
+    mock_scopes: направить классы hh_parser на адрес mock-сервера
+
+en: Load test of the hh.ru API client against the local mock server.
+    Runs scenario requests at different concurrency levels and reports requests per second,
+    p50/p95/p99 latency and error counts by type.
+    Run: python -m src.load_test --scenario find_vacancies --requests 500 --concurrency 1,4,16 --latency 0.02
+Functions:
+    run_load: run a scenario and return a report
+    mock_scopes: point hh_parser classes at the mock server address
+"""
+
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from src.api_parser import ApiBase, TokenBucket
+from src.hh_parser import API_URL, SCOPES, HHFindVacancy, HHFindEmployer, HHInfoVacancy, HHInfoEmployer
+from src.mock_server import MockHHServer
+
+# сценарии нагрузки: функция запроса по номеру запроса / load scenarios: request function by request number
+SCENARIOS = {
+    "find_vacancies": lambda i: HHFindVacancy().find(page=i % 20, per_page=100),
+    "find_employers": lambda i: HHFindEmployer().find(page=i % 20, per_page=100),
+    "info_vacancy": lambda i: HHInfoVacancy(i % 10000).info(),
+    "info_employer": lambda i: HHInfoEmployer(i % 1000).info()
+}
+
+
+@contextmanager
+def mock_scopes(url: str):
+    """
+    ru: Временно заменить базовый адрес API в SCOPES (для клиентов, созданных внутри блока).
+    en: Temporarily replace the API base address in SCOPES (for clients created inside the block).
+    """
+    saved = dict(SCOPES)
+    SCOPES.update({name: scope.replace(API_URL, url.rstrip("/"), 1) for name, scope in saved.items()})
+    try:
+        yield
+    finally:
+        SCOPES.update(saved)
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    ru: Перцентиль отсортированной выборки (ближайший ранг).
+    en: Percentile of a sorted sample (nearest rank).
+    """
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def run_load(scenario, requests: int, concurrency: int, rate: float = None, coalesce: bool = False) -> dict:
+    """
+    ru: Выполнить requests запросов сценария в concurrency потоков.
+        Счетчики ApiBase и предохранители сбрасываются перед запуском.
+        Объединение одинаковых одновременных запросов по умолчанию выключено: иначе часть запросов
+        не доходит до сервера, и rps завышен (количество объединенных запросов - в client["coalesced"]).
+    en: Run requests scenario requests in concurrency threads.
+        ApiBase counters and circuit breakers are reset before the run.
+        Coalescing of identical concurrent requests is off by default: otherwise some requests
+        never reach the server and rps is inflated (the number of coalesced requests is in client["coalesced"]).
+    :param scenario: функция запроса по номеру запроса (или название из SCENARIOS)
+    :param requests: количество запросов
+    :param concurrency: количество потоков
+    :param rate: ограничение частоты клиента (запросов в секунду); None - без ограничения
+    :param coalesce: объединять одинаковые одновременные запросы (ApiBase.coalesce)
+    :return: отчет {"requests", "concurrency", "elapsed", "rps", "p50", "p95", "p99", "errors", "client"}
+    """
+    scenario = SCENARIOS[scenario] if isinstance(scenario, str) else scenario
+    rate_limiter, saved_coalesce = ApiBase.rate_limiter, ApiBase.coalesce
+    ApiBase.rate_limiter = TokenBucket(rate, max(1, int(rate))) if rate else TokenBucket(10 ** 9, 10 ** 9)
+    ApiBase.coalesce = coalesce
+    ApiBase.reset_stats()
+    ApiBase.reset_breakers()
+
+    def call(i: int) -> tuple[float, str | None]:
+        start = time.perf_counter()
+        try:
+            scenario(i)
+            error = None
+        except Exception as e:
+            error = type(e).__name__
+        return time.perf_counter() - start, error
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(call, range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        ApiBase.rate_limiter, ApiBase.coalesce = rate_limiter, saved_coalesce
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "rps": requests / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "errors": dict(Counter(error for _, error in results if error)),
+        "client": dict(ApiBase.stats)
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    ru: Строка отчета для вывода в консоль.
+    en: Report line for console output.
+    """
+    errors = ", ".join(f"{name}: {count}" for name, count in report["errors"].items()) or "-"
+    return (
+        f"concurrency={report['concurrency']:<4} rps={report['rps']:8.1f} "
+        f"p50={report['p50'] * 1000:7.1f}ms p95={report['p95'] * 1000:7.1f}ms p99={report['p99'] * 1000:7.1f}ms "
+        f"retries={report['client'].get('retries', 0)} coalesced={report['client'].get('coalesced', 0)} "
+        f"errors={errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the hh.ru API client against the local mock server")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="find_vacancies")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", default="1,4,16", help="comma separated thread counts")
+    parser.add_argument("--rate", type=float, default=None, help="client rate limit, requests per second")
+    parser.add_argument("--url", default=None, help="external server address instead of the embedded mock server")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--coalesce", action="store_true", help="coalesce identical concurrent requests")
+    args = parser.parse_args()
+    server = None
+    if not args.url:
+        server = MockHHServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate
+        ).start()
+    url = args.url or server.url
+    print(f"scenario={args.scenario} requests={args.requests} server={url}")
+    try:
+        with mock_scopes(url):
+            for concurrency in (int(value) for value in args.concurrency.split(",")):
+                print(format_report(run_load(args.scenario, args.requests, concurrency, args.rate, args.coalesce)))
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+ru: Модуль метрик: счетчики и гистограммы (таймеры) по операциям и таблицам/областям API
+    с выгрузкой в текстовом формате Prometheus или в JSON.
+    По умолчанию выключены (включение - metrics.enable() или переменная окружения HH_METRICS=1);
+    в выключенном состоянии инструментированный вызов стоит одной проверки флага.
+Классы:
+    Metrics: реестр метрик
+Объекты:
+    metrics: общий реестр метрик приложения
+
+en: Metrics module: counters and histograms (timers) per operation and table/API scope
+    exported in the Prometheus text format or as JSON.
+    Disabled by default (enable with metrics.enable() or the HH_METRICS=1 environment variable);
+    when disabled an instrumented call costs a single flag check.
+Classes:
+    Metrics: metrics registry
+Objects:
+    metrics: shared application metrics registry
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# границы корзин гистограмм в секундах / histogram bucket bounds in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# префикс имен метрик / metric names prefix
+PREFIX = "hh_"
+
+
+class Metrics:
+    """
+    ru: Класс реестра метрик.
+        Метрика определяется именем и набором меток (например, {"area": "vacancy", "operation": "select_value"}).
+    en: Metrics registry class.
+        A metric is identified by a name and a set of labels (e.g. {"area": "vacancy", "operation": "select_value"}).
+    """
+    def __init__(self, enabled: bool = False, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        :param enabled: включить сбор метрик
+        :param buckets: границы корзин гистограмм
+        """
+        self.enabled = enabled
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """
+        ru: Сбросить все метрики.
+        en: Reset all metrics.
+        """
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    @staticmethod
+    def key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """
+        ru: Увеличить счетчик.
+        en: Increment a counter.
+        """
+        if not self.enabled:
+            return
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        ru: Добавить значение в гистограмму.
+        en: Add a value to a histogram.
+        """
+        if not self.enabled:
+            return
+        key = self.key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+                    break
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        ru: Контекстный менеджер: время выполнения блока в гистограмму name.
+        en: Context manager: block execution time into the name histogram.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, labels: callable = None):
+        """
+        ru: Декоратор: время выполнения функции в гистограмму name с меткой operation (имя функции).
+        en: Decorator: function execution time into the name histogram with the operation label (function name).
+        :param name: имя гистограммы
+        :param labels: функция от аргументов вызова, возвращающая дополнительные метки
+        """
+        def decorator(func):
+            operation = func.__name__.strip("_")
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                extra = labels(*args, **kwargs) if labels else {}
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, operation=operation, **extra)
+            return wrapper
+        return decorator
+
+    def to_json(self) -> dict:
+        """
+        ru: Метрики в виде словаря (для json.dump).
+        en: Metrics as a dictionary (for json.dump).
+        """
+        with self.lock:
+            counters = [
+                {"name": PREFIX + name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {
+                    "name": PREFIX + name,
+                    "labels": dict(labels),
+                    "count": histogram["count"],
+                    "sum": histogram["sum"],
+                    "mean": histogram["sum"] / histogram["count"] if histogram["count"] else 0.0,
+                    "buckets": dict(zip(map(str, self.buckets), histogram["buckets"]))
+                }
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    @staticmethod
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def format_labels(labels: tuple | list, extra: tuple = ()) -> str:
+        labels = list(labels) + list(extra)
+        if not labels:
+            return ""
+        escaped = (f'{label}="{Metrics.escape(value)}"' for label, value in labels)
+        return "{" + ",".join(escaped) + "}"
+
+    def to_prometheus(self) -> str:
+        """
+        ru: Метрики в текстовом формате Prometheus.
+        en: Metrics in the Prometheus text format.
+        """
+        lines = []
+        typed = set()
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {PREFIX}{name} counter")
+                    typed.add(name)
+                lines.append(f"{PREFIX}{name}{self.format_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {PREFIX}{name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram["buckets"]):
+                    cumulative += count
+                    lines.append(f"{PREFIX}{name}_bucket{self.format_labels(labels, (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{PREFIX}{name}_bucket{self.format_labels(labels, (('le', '+Inf'),))} {histogram['count']}")
+                lines.append(f"{PREFIX}{name}_sum{self.format_labels(labels)} {histogram['sum']}")
+                lines.append(f"{PREFIX}{name}_count{self.format_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str = "-", format_: str = "prometheus") -> str:
+        """
+        ru: Выгрузить метрики в файл (path="-" - только вернуть строку).
+        en: Dump metrics to a file (path="-" - only return the string).
+        :param format_: prometheus или json
+        """
+        text = json.dumps(self.to_json(), ensure_ascii=False, indent=4) if format_ == "json" else self.to_prometheus()
+        if path != "-":
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+
+metrics = Metrics(enabled=os.environ.get("HH_METRICS") == "1")
@@ -0,0 +1,354 @@
+"""
+ru: Локальный mock-сервер API hh.ru для тестов производительности клиента без доступа к сети.
+    Отдает синтетические вакансии и работодателей в формате hh.ru (/vacancies, /vacancies/<id>,
+    /employers, /employers/<id>) и справочники (/dictionaries, /areas, /industries)
+    с постраничной выдачей, настраиваемой задержкой, долей ошибок 5xx и ответов 429.
+    Запуск: python -m src.mock_server --port 8080 --latency 0.05 --error-rate 0.01 --throttle-rate 0.05
+    Клиент направляется на сервер переменной окружения HH_API_URL=http://127.0.0.1:8080
+Классы:
+    MockHHServer: сервер (ThreadingHTTPServer в фоновом потоке), контекстный менеджер
+
+en: Local mock hh.ru API server for offline client throughput testing.
+    Serves synthetic hh.ru-shaped vacancies and employers (/vacancies, /vacancies/<id>,
+    /employers, /employers/<id>) and reference data (/dictionaries, /areas, /industries)
+    with paging, configurable latency, 5xx error rate and 429 rate.
+    Run: python -m src.mock_server --port 8080 --latency 0.05 --error-rate 0.01 --throttle-rate 0.05
+    The client is pointed at the server with the HH_API_URL=http://127.0.0.1:8080 environment variable
+Classes:
+    MockHHServer: the server (ThreadingHTTPServer in a background thread), context manager
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# лимит глубины выдачи hh.ru / hh.ru results depth limit
+MAX_RESULTS = 2000
+AREAS = [("1", "Москва"), ("2", "Санкт-Петербург"), ("4", "Новосибирск"), ("88", "Казань"), ("160", "Алматы")]
+CURRENCIES = ["RUR", "RUR", "RUR", "USD", "KZT"]
+EXPERIENCE = [("noExperience", "Нет опыта"), ("between1And3", "От 1 года до 3 лет"), ("between3And6", "От 3 до 6 лет")]
+SCHEDULE = [("fullDay", "Полный день"), ("remote", "Удаленная работа"), ("flexible", "Гибкий график")]
+# справочники (/dictionaries, /areas, /industries) / reference data (/dictionaries, /areas, /industries)
+REFERENCES = {
+    "dictionaries": {
+        "experience": [{"id": id_, "name": name} for id_, name in EXPERIENCE],
+        "employment": [{"id": "full", "name": "Полная занятость"}],
+        "schedule": [{"id": id_, "name": name} for id_, name in SCHEDULE],
+        "currency": [
+            {"code": "RUR", "abbr": "₽", "name": "Рубли", "rate": 1.0},
+            {"code": "USD", "abbr": "$", "name": "Доллары", "rate": 0.011},
+            {"code": "KZT", "abbr": "₸", "name": "Тенге", "rate": 5.2}
+        ]
+    },
+    "areas": [
+        {"id": "113", "parent_id": None, "name": "Россия", "areas": [
+            {"id": id_, "parent_id": "113", "name": name, "areas": []} for id_, name in AREAS if id_ != "160"
+        ]},
+        {"id": "40", "parent_id": None, "name": "Казахстан", "areas": [
+            {"id": "160", "parent_id": "40", "name": "Алматы", "areas": []}
+        ]}
+    ],
+    "industries": [{"id": "7", "name": "Информационные технологии", "industries": [
+        {"id": "7.540", "name": "Разработка программного обеспечения"}
+    ]}]
+}
+
+
+def make_employer(i: int, full: bool = False) -> dict:
+    """
+    ru: Синтетический работодатель в формате hh.ru.
+    en: Synthetic hh.ru-shaped employer.
+    :param full: полная информация (ответ /employers/<id>)
+    """
+    employer = {
+        "id": str(i),
+        "name": f"Компания {i}",
+        "url": f"https://api.hh.ru/employers/{i}",
+        "alternate_url": f"https://hh.ru/employer/{i}",
+        "logo_urls": {
+            "90": f"https://img.hhcdn.ru/employer-logo/{i}_90.png",
+            "240": f"https://img.hhcdn.ru/employer-logo/{i}_240.png",
+            "original": f"https://img.hhcdn.ru/employer-logo-original/{i}.png"
+        } if i % 3 else None,
+        "vacancies_url": f"https://api.hh.ru/vacancies?employer_id={i}",
+        "accredited_it_employer": i % 4 == 0,
+        "trusted": True,
+        "open_vacancies": i % 50
+    }
+    if full:
+        employer |= {
+            "type": "company",
+            "description": f"<p>Компания <strong>{i}</strong> занимается разработкой программного обеспечения.</p>" * 3,
+            "site_url": f"https://company{i}.example.com",
+            "area": {"id": "1", "name": "Москва", "url": "https://api.hh.ru/areas/1"},
+            "industries": [{"id": "7.540", "name": "Разработка программного обеспечения"}]
+        }
+    return employer
+
+
+def make_vacancy(i: int, employers: int, full: bool = False, **fields) -> dict:
+    """
+    ru: Синтетическая вакансия в формате hh.ru.
+    en: Synthetic hh.ru-shaped vacancy.
+    :param employers: количество работодателей
+    :param full: полная информация (ответ /vacancies/<id>)
+    :param fields: поля, которые заменяют сгенерированные (например, salary=None)
+    """
+    rnd = random.Random(i)
+    area_id, area_name = AREAS[i % len(AREAS)]
+    experience_id, experience_name = EXPERIENCE[i % len(EXPERIENCE)]
+    schedule_id, schedule_name = SCHEDULE[i % len(SCHEDULE)]
+    salary_from = rnd.choice([None, rnd.randrange(50000, 300000, 5000)])
+    salary_to = rnd.choice([None, (salary_from or 50000) + rnd.randrange(10000, 100000, 5000)])
+    vacancy = {
+        "id": str(i),
+        "premium": False,
+        "name": f"Python-разработчик {i}",
+        "department": None,
+        "has_test": False,
+        "response_letter_required": False,
+        "area": {"id": area_id, "name": area_name, "url": f"https://api.hh.ru/areas/{area_id}"},
+        "salary": {"from": salary_from, "to": salary_to, "currency": CURRENCIES[i % len(CURRENCIES)], "gross": False}
+        if salary_from or salary_to else None,
+        "type": {"id": "open", "name": "Открытая"},
+        "address": {
+            "city": area_name,
+            "street": "улица Льва Толстого",
+            "building": str(i % 100),
+            "lat": round(55.5 + rnd.random(), 6),
+            "lng": round(37.3 + rnd.random(), 6),
+            "raw": f"{area_name}, улица Льва Толстого, {i % 100}"
+        } if i % 2 else None,
+        "published_at": f"2024-06-{i % 28 + 1:02d}T10:{i % 60:02d}:00+0300",
+        "created_at": f"2024-06-{i % 28 + 1:02d}T10:{i % 60:02d}:00+0300",
+        "archived": False,
+        "url": f"https://api.hh.ru/vacancies/{i}",
+        "alternate_url": f"https://hh.ru/vacancy/{i}",
+        "employer": make_employer(i % employers),
+        "snippet": {
+            "requirement": "Опыт коммерческой разработки на <highlighttext>Python</highlighttext>.",
+            "responsibility": "Разработка и поддержка сервисов."
+        },
+        "schedule": {"id": schedule_id, "name": schedule_name},
+        "experience": {"id": experience_id, "name": experience_name},
+        "employment": {"id": "full", "name": "Полная занятость"},
+        "professional_roles": [{"id": "96", "name": "Программист, разработчик"}]
+    }
+    if full:
+        vacancy |= {
+            "description": "<p>Мы ищем <strong>Python-разработчика</strong>.</p><ul>"
+                           + "<li>Python, Django, PostgreSQL, Docker</li>" * 5 + "</ul>",
+            "key_skills": [{"name": "Python"}, {"name": "Django"}, {"name": "PostgreSQL"}]
+        }
+    return vacancy | fields
+
+
+class MockHHHandler(BaseHTTPRequestHandler):
+    """
+    ru: Обработчик запросов mock-сервера.
+    en: Mock server request handler.
+    """
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        parameters = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        status, body, headers = mock.handle(parts, parameters)
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockHHServer:
+    """
+    ru: Класс локального mock-сервера hh.ru.
+        Задержка ответа - latency плюс случайная добавка до jitter секунд;
+        с вероятностью throttle_rate отдается 429 с заголовком Retry-After, с вероятностью error_rate - 503.
+    en: Class of the local mock hh.ru server.
+        Response latency is latency plus a random addition of up to jitter seconds;
+        with probability throttle_rate 429 with a Retry-After header is returned, with probability error_rate - 503.
+    """
+    def __init__(
+            self,
+            vacancies: int = 10000,
+            employers: int = 1000,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            throttle_rate: float = 0.0,
+            retry_after: int = 0,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            seed: int = None
+    ):
+        """
+        :param vacancies: количество вакансий
+        :param employers: количество работодателей
+        :param latency: базовая задержка ответа в секундах
+        :param jitter: максимальная случайная добавка к задержке в секундах
+        :param error_rate: доля ответов 503
+        :param throttle_rate: доля ответов 429
+        :param retry_after: значение заголовка Retry-After для ответов 429
+        :param host: адрес сервера
+        :param port: порт сервера (0 - любой свободный)
+        :param seed: зерно генератора случайных чисел
+        """
+        self.vacancies = vacancies
+        self.employers = employers
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.hits = Counter()
+        self.server = ThreadingHTTPServer((host, port), MockHHHandler)
+        self.server.daemon_threads = True
+        self.server.mock = self
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        ru: Базовый адрес сервера (значение для HH_API_URL).
+        en: Server base address (value for HH_API_URL).
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockHHServer":
+        """
+        ru: Запустить сервер в фоновом потоке.
+        en: Start the server in a background thread.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        ru: Остановить сервер.
+        en: Stop the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockHHServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def handle(self, parts: list[str], parameters: dict) -> tuple[int, dict, dict]:
+        """
+        ru: Обработать запрос.
+        en: Handle a request.
+        :param parts: части пути запроса
+        :param parameters: параметры запроса
+        :return: (код ответа, тело ответа, заголовки)
+        """
+        with self.random_lock:
+            delay = self.latency + self.random.random() * self.jitter
+            roll = self.random.random()
+        if delay:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            return self.hit(429, {"errors": [{"type": "too_many_requests"}]}, {"Retry-After": str(self.retry_after)})
+        if roll < self.throttle_rate + self.error_rate:
+            return self.hit(503, {"errors": [{"type": "service_unavailable"}]})
+        if len(parts) == 1 and parts[0] in REFERENCES:
+            return self.hit(200, REFERENCES[parts[0]])
+        if len(parts) == 1 and parts[0] in ("vacancies", "employers"):
+            total = self.vacancies if parts[0] == "vacancies" else self.employers
+            return self.page(parts[0], total, parameters)
+        if len(parts) == 2 and parts[0] in ("vacancies", "employers") and parts[1].isdigit():
+            i = int(parts[1])
+            if parts[0] == "vacancies" and i < self.vacancies:
+                return self.hit(200, make_vacancy(i, self.employers, full=True))
+            if parts[0] == "employers" and i < self.employers:
+                return self.hit(200, make_employer(i, full=True))
+        return self.hit(404, {"errors": [{"type": "not_found"}]})
+
+    def page(self, name: str, total: int, parameters: dict) -> tuple[int, dict, dict]:
+        """
+        ru: Страница выдачи поиска (глубина выдачи ограничена MAX_RESULTS, как в hh.ru).
+        en: A search results page (results depth is limited by MAX_RESULTS, as in hh.ru).
+        """
+        try:
+            page = int(parameters.get("page", 0))
+            per_page = int(parameters.get("per_page", 20))
+        except ValueError:
+            return self.hit(400, {"errors": [{"type": "bad_argument"}]})
+        if per_page > 100 or (page + 1) * per_page > MAX_RESULTS:
+            return self.hit(400, {"errors": [{"type": "bad_argument", "value": "page"}]})
+        start = page * per_page
+        ids = range(start, min(start + per_page, total))
+        if name == "vacancies":
+            items = [make_vacancy(i, self.employers) for i in ids]
+        else:
+            items = [make_employer(i) for i in ids]
+        reachable = min(total, MAX_RESULTS)
+        return self.hit(200, {
+            "items": items,
+            "found": total,
+            "pages": (reachable + per_page - 1) // per_page,
+            "per_page": per_page,
+            "page": page
+        })
+
+    def hit(self, status: int, body: dict, headers: dict = None) -> tuple[int, dict, dict]:
+        """
+        ru: Учесть ответ в счетчике hits.
+        en: Count the response in the hits counter.
+        """
+        with self.random_lock:
+            self.hits[status] += 1
+        return status, body, headers or {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock hh.ru API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--vacancies", type=int, default=10000)
+    parser.add_argument("--employers", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=0)
+    args = parser.parse_args()
+    server = MockHHServer(
+        vacancies=args.vacancies,
+        employers=args.employers,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        host=args.host,
+        port=args.port
+    )
+    print(f"Mock hh.ru API: {server.url} (HH_API_URL={server.url})")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+ru: Модуль профилирования сессии пользовательского интерфейса (режим main.py --profile).
+    Время ожидания ввода пользователя исключается: профилируется только работа программы.
+Классы:
+    ScriptedInput: воспроизведение ввода пользователя из файла (сценарий действий в меню)
+    SamplingProfiler: профилировщик по выборкам стека с выводом в формате folded stacks
+        (совместим с flamegraph.pl, speedscope, inferno)
+    ProfileSession: сессия профилирования: cProfile или SamplingProfiler, снимки tracemalloc
+        и время отрисовки каждого экрана
+
+en: Module for profiling a user interface session (main.py --profile mode).
+    Time spent waiting for user input is excluded: only the program work is profiled.
+Classes:
+    ScriptedInput: replay of user input from a file (a script of menu actions)
+    SamplingProfiler: stack sampling profiler with output in the folded stacks format
+        (compatible with flamegraph.pl, speedscope, inferno)
+    ProfileSession: profiling session: cProfile or SamplingProfiler, tracemalloc snapshots
+        and render time of every screen
+"""
+
+import builtins
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from src.metrics import metrics
+
+# методы UserInterface, которые не являются экранами / UserInterface methods that are not screens
+NOT_SCREENS = {"html2txt"}
+
+
+class ScriptedInput:
+    """
+    ru: Класс воспроизведения ввода пользователя.
+        Файл сценария - по одному вводу в строке (пустые строки и строки с # пропускаются);
+        после окончания сценария возвращается "exit", что завершает программу.
+    en: Class for replaying user input.
+        The script file has one input per line (empty lines and lines starting with # are skipped);
+        after the script ends "exit" is returned, which terminates the program.
+    """
+    def __init__(self, lines: list[str]):
+        """
+        :param lines: вводы пользователя по порядку
+        """
+        self.lines = list(lines)
+        self.position = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScriptedInput":
+        with open(path, 'r') as file:
+            lines = [line.rstrip("\n") for line in file]
+        return cls([line for line in lines if line.strip() and not line.startswith("#")])
+
+    def __call__(self, prompt: str = "") -> str:
+        if self.position >= len(self.lines):
+            return "exit"
+        line = self.lines[self.position]
+        self.position += 1
+        return line
+
+
+class SamplingProfiler:
+    """
+    ru: Профилировщик по выборкам стека потока.
+        Фоновый поток через interval секунд снимает стек профилируемого потока;
+        одинаковые стеки суммируются в формате folded stacks ("кадр;кадр;кадр количество").
+    en: Thread stack sampling profiler.
+        A background thread takes a stack of the profiled thread every interval seconds;
+        equal stacks are summed in the folded stacks format ("frame;frame;frame count").
+    """
+    def __init__(self, interval: float = 0.005, paused: callable = None):
+        """
+        :param interval: интервал выборки в секундах
+        :param paused: функция, возвращающая True, когда выборки нужно пропускать (ожидание ввода)
+        """
+        self.interval = interval
+        self.paused = paused or (lambda: False)
+        self.stacks = Counter()
+        self.thread_id = None
+        self.running = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self.frame_name(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def run(self):
+        while self.running.is_set():
+            if not self.paused():
+                self.sample()
+            time.sleep(self.interval)
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self.running.set()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+        if self.thread:
+            self.thread.join()
+
+    def folded(self) -> str:
+        """
+        ru: Стеки в формате folded stacks.
+        en: Stacks in the folded stacks format.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileSession:
+    """
+    ru: Класс сессии профилирования.
+        Время отрисовки экрана - от входа в метод экрана UserInterface до запроса ввода пользователя.
+        Результаты в output_dir:
+            stacks.folded - стеки для flamegraph (профилировщик sampling)
+            session.prof, profile.txt - данные cProfile и топ функций по суммарному времени (профилировщик cprofile)
+            screens.json - время отрисовки экранов (количество, сумма, среднее, максимум)
+            memory.txt - пиковое потребление памяти и топ мест выделения памяти (tracemalloc)
+    en: Profiling session class.
+        Screen render time is measured from entering a UserInterface screen method to the user input request.
+        Results in output_dir:
+            stacks.folded - stacks for flamegraph (sampling profiler)
+            session.prof, profile.txt - cProfile data and top functions by cumulative time (cprofile profiler)
+            screens.json - screen render time (count, total, mean, max)
+            memory.txt - peak memory usage and top allocation sites (tracemalloc)
+    """
+    def __init__(
+            self,
+            output_dir: str,
+            profiler: str = "sampling",
+            interval: float = 0.005,
+            memory: bool = True,
+            input_func: callable = None
+    ):
+        """
+        :param output_dir: директория для результатов
+        :param profiler: sampling или cprofile
+        :param interval: интервал выборки профилировщика sampling в секундах
+        :param memory: снимать снимки памяти tracemalloc
+        :param input_func: функция ввода (например, ScriptedInput); по умолчанию - input
+        """
+        self.output_dir = output_dir
+        self.profiler = profiler
+        self.interval = interval
+        self.memory = memory
+        self.input_func = input_func
+        self.waiting = False
+        self.screen = None
+        self.screen_start = None
+        self.screens = {}
+        self.sampler = None
+        self.cprofile = None
+        self.saved_input = None
+
+    def input(self, prompt: str = "") -> str:
+        """
+        ru: Замена input: фиксирует время отрисовки текущего экрана и приостанавливает профилирование на время ввода.
+        en: input replacement: records the current screen render time and pauses profiling while waiting for input.
+        """
+        if self.screen_start is not None:
+            self.record_screen(self.screen, time.perf_counter() - self.screen_start)
+            self.screen_start = None
+        self.waiting = True
+        if self.cprofile:
+            self.cprofile.disable()
+        try:
+            return (self.input_func or self.saved_input)(prompt)
+        finally:
+            if self.cprofile:
+                self.cprofile.enable()
+            self.waiting = False
+
+    def record_screen(self, screen: str, seconds: float):
+        stats = self.screens.setdefault(screen, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        metrics.observe("ui_render_seconds", seconds, screen=screen)
+
+    def screen_method(self, name: str, method: callable) -> callable:
+        """
+        ru: Обертка метода экрана: запоминает экран и время входа, если другой экран еще не отрисовывается.
+        en: Screen method wrapper: remembers the screen and the entry time if no other screen is being rendered.
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if self.screen_start is None:
+                self.screen = name
+                self.screen_start = time.perf_counter()
+            return method(*args, **kwargs)
+        return wrapper
+
+    def instrument(self, ui) -> object:
+        """
+        ru: Обернуть методы экранов объекта UserInterface для замера времени отрисовки.
+        en: Wrap screen methods of a UserInterface object to measure render time.
+        """
+        for name in dir(type(ui)):
+            if name.startswith("_") or name in NOT_SCREENS:
+                continue
+            # ленивые атрибуты (cached_property) не вычисляются / lazy attributes (cached_property) are not evaluated
+            if callable(getattr(type(ui), name)):
+                setattr(ui, name, self.screen_method(name, getattr(ui, name)))
+        return ui
+
+    def __enter__(self) -> "ProfileSession":
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.saved_input = builtins.input
+        builtins.input = self.input
+        if self.memory:
+            tracemalloc.start()
+        if self.profiler == "cprofile":
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        else:
+            self.sampler = SamplingProfiler(self.interval, paused=lambda: self.waiting)
+            self.sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.cprofile:
+            self.cprofile.disable()
+        if self.sampler:
+            self.sampler.stop()
+        builtins.input = self.saved_input
+        self.write_results()
+        return False
+
+    def write_results(self):
+        """
+        ru: Записать результаты профилирования в output_dir.
+        en: Write profiling results to output_dir.
+        """
+        if self.sampler:
+            with open(os.path.join(self.output_dir, "stacks.folded"), 'w') as file:
+                file.write(self.sampler.folded())
+        if self.cprofile:
+            self.cprofile.dump_stats(os.path.join(self.output_dir, "session.prof"))
+            text = io.StringIO()
+            pstats.Stats(self.cprofile, stream=text).sort_stats("cumulative").print_stats(40)
+            with open(os.path.join(self.output_dir, "profile.txt"), 'w') as file:
+                file.write(text.getvalue())
+        screens = {
+            screen: stats | {"mean": stats["total"] / stats["count"]}
+            for screen, stats in sorted(self.screens.items(), key=lambda item: -item[1]["total"])
+        }
+        with open(os.path.join(self.output_dir, "screens.json"), 'w') as file:
+            json.dump(screens, file, ensure_ascii=False, indent=4)
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            lines = [f"current: {current / 1024:.1f} KiB", f"peak: {peak / 1024:.1f} KiB", ""]
+            lines.extend(str(stat) for stat in snapshot.statistics("lineno")[:30])
+            with open(os.path.join(self.output_dir, "memory.txt"), 'w') as file:
+                file.write("\n".join(lines) + "\n")
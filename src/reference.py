@@ -0,0 +1,337 @@
+"""
+ru: Модуль для работы со справочниками hh.ru (/dictionaries, /areas, /industries).
+Классы:
+    ReferenceCache: однократная загрузка справочников и кэш на диске с версией и сроком жизни (TTL),
+        поиск названия по id и id по названию за O(1), пакетное заполнение таблиц справочников в базе данных
+    AreaTree: индекс дерева локаций (ссылки на родителя и интервалы обхода Эйлера tin/tout)
+        для проверки вложенности локаций за O(1)
+
+en: Module for working with hh.ru reference data (/dictionaries, /areas, /industries).
+Classes:
+    ReferenceCache: one-time loading of reference data and a disk cache with a version and time to live (TTL),
+        O(1) name-by-id and id-by-name lookups, bulk population of reference tables in the database
+    AreaTree: area tree index (parent pointers and Euler tour tin/tout intervals)
+        for O(1) area containment checks
+"""
+
+import datetime
+import json
+import os
+
+from src.config import (
+    REFERENCE_CACHE_PATH,
+    AREA_FIELDS,
+    EXPERIENCE_FIELDS,
+    EMPLOYMENT_FIELDS,
+    SCHEDULE_FIELDS
+)
+from src.data_base import BaseDB
+from src.hh_parser import SCOPES, HHDictionaries, HHAreas, HHIndustries
+
+# версия формата кэша / cache format version
+CACHE_VERSION = 1
+# разделы кэша (запрос /dictionaries, /areas, /industries) / cache sections (/dictionaries, /areas, /industries request)
+SECTIONS = ("dictionaries", "areas", "industries")
+# раздел кэша плоских справочников из дерева / cache section of flat dictionaries built from a tree
+TREE_SECTIONS = {"area": "areas", "industry": "industries"}
+# справочники, которые записываются в таблицы базы / dictionaries written to database tables
+REFERENCE_TABLES = {
+    "experience": EXPERIENCE_FIELDS,
+    "employment": EMPLOYMENT_FIELDS,
+    "schedule": SCHEDULE_FIELDS
+}
+
+
+class AreaTree:
+    """
+    ru: Класс индекса дерева локаций.
+        При обходе дерева в глубину каждой локации назначается интервал [tin, tout):
+        tin - позиция локации в порядке обхода, tout - позиция после последней вложенной локации.
+        Локация A вложена в B, если tin(B) <= tin(A) < tout(B), а все вложенные локации B -
+        непрерывный срез порядка обхода, поэтому рекурсивный обход для сводок по региону не нужен.
+    en: Class of the area tree index.
+        During a depth-first traversal every area gets an interval [tin, tout):
+        tin is the position of the area in the traversal order, tout is the position after its last nested area.
+        Area A is nested in B if tin(B) <= tin(A) < tout(B), and all areas nested in B are
+        a contiguous slice of the traversal order, so region rollups need no recursive walk.
+    """
+    def __init__(self, areas: list[dict]):
+        """
+        :param areas: дерево локаций в формате ответа /areas
+        """
+        self.parents = {}
+        self.children_ids = {None: []}
+        self.tin = {}
+        self.tout = {}
+        self.order = []
+        stack = [(area, None, False) for area in reversed(areas)]
+        while stack:
+            area, parent_id, exit_ = stack.pop()
+            id_ = area["id"]
+            if exit_:
+                self.tout[id_] = len(self.order)
+                continue
+            self.parents[id_] = parent_id
+            self.children_ids[parent_id].append(id_)
+            self.children_ids[id_] = []
+            self.tin[id_] = len(self.order)
+            self.order.append(id_)
+            stack.append((area, parent_id, True))
+            stack.extend((child, id_, False) for child in reversed(area.get("areas") or []))
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.tin
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def parent(self, id_: str) -> str | None:
+        """
+        ru: id родительской локации.
+        en: Parent area id.
+        """
+        return self.parents.get(id_)
+
+    def children(self, id_: str = None) -> list[str]:
+        """
+        ru: id дочерних локаций (для id_=None - корневые локации).
+            Подходит как параметр area_children для HHQuerySplitter.
+        en: Child area ids (for id_=None - root areas).
+            Suitable as the area_children parameter of HHQuerySplitter.
+        """
+        return self.children_ids.get(id_, [])
+
+    def ancestors(self, id_: str) -> list[str]:
+        """
+        ru: id всех родительских локаций от ближайшей до корневой.
+        en: Ids of all parent areas from the nearest to the root.
+        """
+        result = []
+        id_ = self.parents.get(id_)
+        while id_ is not None:
+            result.append(id_)
+            id_ = self.parents.get(id_)
+        return result
+
+    def is_descendant(self, id_: str, ancestor_id: str) -> bool:
+        """
+        ru: Проверка, что локация id_ совпадает с ancestor_id или вложена в нее (O(1)).
+        en: Check that area id_ equals ancestor_id or is nested in it (O(1)).
+        """
+        if id_ not in self.tin or ancestor_id not in self.tin:
+            return False
+        return self.tin[ancestor_id] <= self.tin[id_] < self.tout[ancestor_id]
+
+    def descendants(self, id_: str) -> list[str]:
+        """
+        ru: id локации и всех вложенных в нее локаций.
+        en: Ids of the area and all areas nested in it.
+        """
+        if id_ not in self.tin:
+            return []
+        return self.order[self.tin[id_]:self.tout[id_]]
+
+    @staticmethod
+    def area_id(item) -> str | None:
+        """
+        ru: id локации вакансии: объекта HHVacancy, словаря вакансии из ReadData или строки таблицы vacancy.
+        en: Vacancy area id: of an HHVacancy object, a vacancy dictionary from ReadData or a vacancy table row.
+        """
+        if isinstance(item, dict):
+            area = item.get("area")
+            return area.get("id") if isinstance(area, dict) else item.get("area_id")
+        area = getattr(item, "area", None)
+        return getattr(area, "id_", None)
+
+    def filter(self, items: list, ancestor_id: str, key: callable = None) -> list:
+        """
+        ru: Отфильтровать вакансии, локация которых вложена в ancestor_id.
+        en: Filter vacancies whose area is nested in ancestor_id.
+        :param items: вакансии (объекты или словари)
+        :param ancestor_id: id региона
+        :param key: функция, возвращающая id локации элемента (по умолчанию - area_id)
+        """
+        if ancestor_id not in self.tin:
+            return []
+        key = key or self.area_id
+        tin = self.tin
+        start, end = tin[ancestor_id], self.tout[ancestor_id]
+        return [item for item in items if start <= tin.get(key(item), -1) < end]
+
+
+class ReferenceCache:
+    """
+    ru: Класс для кэширования справочников hh.ru.
+        Справочник - словарь {id: название}; для валют id - код валюты (code),
+        локации и отрасли разворачиваются из дерева в плоский справочник.
+    en: Class for caching hh.ru reference data.
+        A dictionary is a mapping {id: name}; for currencies the id is the currency code,
+        areas and industries are flattened from a tree into a flat dictionary.
+
+    ru: Разделы кэша (dictionaries, areas, industries) загружаются по отдельности при первом обращении к ним:
+        например, для курсов валют не загружаются дерево локаций и отрасли.
+    en: Cache sections (dictionaries, areas, industries) are loaded separately on first access:
+        e.g. the area tree and industries are not loaded for currency rates.
+    """
+    def __init__(
+            self,
+            path: str = REFERENCE_CACHE_PATH,
+            ttl: datetime.timedelta = datetime.timedelta(days=1),
+            clients: dict = None
+    ):
+        """
+        :param path: путь к файлу кэша
+        :param ttl: срок жизни кэша
+        :param clients: классы запроса справочников {"dictionaries": ..., "areas": ..., "industries": ...}
+        """
+        self.path = path
+        self.ttl = ttl
+        self.clients = clients or {"dictionaries": HHDictionaries, "areas": HHAreas, "industries": HHIndustries}
+        self.data = None
+        self.names = {}
+        self.ids = {}
+
+    def is_fresh(self, data: dict) -> bool:
+        """
+        ru: Проверка версии и срока жизни кэша.
+        en: Check the cache version and time to live.
+        """
+        if data.get("version") != CACHE_VERSION:
+            return False
+        loaded_at = datetime.datetime.fromisoformat(data["loaded_at"])
+        return datetime.datetime.now(datetime.timezone.utc) - loaded_at < self.ttl
+
+    def download(self, sections: tuple[str, ...] = SECTIONS) -> dict:
+        """
+        ru: Загрузить разделы справочников с hh.ru.
+        en: Download reference data sections from hh.ru.
+        :param sections: разделы (dictionaries, areas, industries)
+        """
+        return {section: self.clients[section]().info() for section in sections}
+
+    def load(self, force: bool = False, sections: tuple[str, ...] = SECTIONS) -> dict:
+        """
+        ru: Загрузить разделы справочников из кэша или с hh.ru.
+            С hh.ru загружаются только разделы, которых нет в кэше (весь кэш - если он устарел или force=True).
+        en: Load reference data sections from the cache or from hh.ru.
+            Only sections missing from the cache are downloaded (the whole cache - if it is stale or force=True).
+        :param force: загрузить с hh.ru в любом случае
+        :param sections: нужные разделы (dictionaries, areas, industries)
+        """
+        data = None
+        if not force and os.path.exists(self.path):
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+            if not self.is_fresh(data):
+                data = None
+        if data is None:
+            data = {"version": CACHE_VERSION, "loaded_at": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+        missing = tuple(section for section in sections if section not in data)
+        if missing:
+            data |= self.download(missing)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'w') as file:
+                json.dump(data, file, ensure_ascii=False)
+        self.data = data
+        self.build_lookups()
+        return data
+
+    @staticmethod
+    def flatten(tree: list[dict], children_key: str) -> list[dict]:
+        """
+        ru: Развернуть дерево справочника в плоский список.
+        en: Flatten a reference tree into a flat list.
+        """
+        result = []
+        stack = list(reversed(tree))
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(reversed(node.get(children_key) or []))
+        return result
+
+    def build_lookups(self):
+        """
+        ru: Построить словари поиска id -> название и название -> id.
+        en: Build lookup dictionaries id -> name and name -> id.
+        """
+        self.names = {}
+        for name, items in self.data.get("dictionaries", {}).items():
+            if isinstance(items, list) and items and isinstance(items[0], dict):
+                id_key = "id" if "id" in items[0] else "code"
+                if id_key in items[0] and "name" in items[0]:
+                    self.names[name] = {item[id_key]: item["name"] for item in items}
+        for name, section in TREE_SECTIONS.items():
+            if section in self.data:
+                self.names[name] = {item["id"]: item["name"] for item in self.flatten(self.data[section], section)}
+        self.ids = {
+            name: {item_name: id_ for id_, item_name in items.items()} for name, items in self.names.items()
+        }
+
+    def ensure_loaded(self, *sections: str):
+        """
+        ru: Загрузить разделы справочников при первом обращении.
+        en: Load reference data sections on first access.
+        :param sections: нужные разделы (по умолчанию - все)
+        """
+        sections = sections or SECTIONS
+        if self.data is None or any(section not in self.data for section in sections):
+            self.load(sections=sections)
+
+    def name(self, dictionary: str, id_: str) -> str | None:
+        """
+        ru: Название по id.
+        en: Name by id.
+        :param dictionary: название справочника (experience, employment, schedule, currency, area, industry, ...)
+        :param id_: id элемента
+        """
+        self.ensure_loaded(TREE_SECTIONS.get(dictionary, "dictionaries"))
+        return self.names.get(dictionary, {}).get(id_)
+
+    def id_(self, dictionary: str, name: str) -> str | None:
+        """
+        ru: id по названию.
+        en: Id by name.
+        :param dictionary: название справочника
+        :param name: название элемента
+        """
+        self.ensure_loaded(TREE_SECTIONS.get(dictionary, "dictionaries"))
+        return self.ids.get(dictionary, {}).get(name)
+
+    def area_tree(self) -> AreaTree:
+        """
+        ru: Индекс дерева локаций.
+        en: Area tree index.
+        """
+        self.ensure_loaded("areas")
+        return AreaTree(self.data["areas"])
+
+    def items(self, dictionary: str) -> list[dict]:
+        """
+        ru: Элементы справочника в исходном виде.
+        en: Dictionary items in the original form.
+        """
+        self.ensure_loaded("dictionaries")
+        return self.data["dictionaries"].get(dictionary, [])
+
+    def populate(self, db: BaseDB) -> dict[str, int]:
+        """
+        ru: Пакетно заполнить таблицы справочников (локации, опыт, занятость, график) в базе данных.
+            После этого вакансии можно записывать через WriteData(db, write_references=False).
+        en: Bulk populate reference tables (area, experience, employment, schedule) in the database.
+            After that vacancies can be written through WriteData(db, write_references=False).
+        :return: {таблица: количество записей}
+        """
+        self.ensure_loaded("dictionaries", "areas")
+        result = {}
+        for name, fields in REFERENCE_TABLES.items():
+            records = [{"id": id_, "name": item_name} for id_, item_name in self.names.get(name, {}).items()]
+            db.upsert_many(fields["name"], records, fields["key"])
+            result[fields["name"]] = len(records)
+        areas = [
+            {"id": id_, "name": area_name, "url": f"{SCOPES['areas']}/{id_}"}
+            for id_, area_name in self.names["area"].items()
+        ]
+        db.upsert_many(AREA_FIELDS["name"], areas, AREA_FIELDS["key"])
+        result[AREA_FIELDS["name"]] = len(areas)
+        return result
@@ -12,12 +12,13 @@ Classes:
     UserInterface: the main class for organizing the logic of interacting with the user
 """
 
+import atexit
 import os
 import sys
 
-import html2text
-
 from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import TYPE_CHECKING
 from src.config import DB_DIR
 from src.hh_parser import (
     HHFindVacancy,
@@ -34,6 +35,12 @@ from src.utils import CreateDB, WriteData, ReadData
 from src.api_errors import ApiQueryError
 from requests.exceptions import ConnectionError
 
+if TYPE_CHECKING:
+    # модули импортируются в свойствах при первом обращении / the modules are imported in properties on first access
+    from src.currency import CurrencyRates
+    from src.dedup import VacancyDeduplicator
+    from src.html_text import HtmlTextConverter
+
 
 class WidgetCLIBase(ABC):
     """
@@ -227,19 +234,118 @@ class WidgetCLIField(WidgetCLI):
 class UserInterface:
     """
     ru: Класс для работы с пользовательским интерфейсом программы
+        Объекты для работы с API, базой данных и html2text создаются при первом обращении,
+        поэтому главное меню отображается без импорта html2text и без проверки файлов базы данных.
     en: Class for working with the user interface of the program
+        API, database and html2text objects are created on first access,
+        so the main menu is shown without importing html2text and without checking database files.
     """
-    def __init__(self):
-        # объекты для работы с API hh.ru
-        self.find_vacancy = HHFindVacancy()
-        self.find_employer = HHFindEmployer()
-        # обработка html в текст
-        self.convert_html = html2text.HTML2Text()
-        # объекты для работы с базой данных
-        self.db = JsonDB(DB_DIR)
-        CreateDB(self.db)
-        self.write_data = WriteData(self.db)
-        self.read_data = ReadData(self.db)
+    # объекты для работы с API hh.ru
+    @cached_property
+    def find_vacancy(self) -> HHFindVacancy:
+        return HHFindVacancy()
+
+    @cached_property
+    def find_employer(self) -> HHFindEmployer:
+        return HHFindEmployer()
+
+    # объекты для работы с базой данных
+    @cached_property
+    def db(self) -> JsonDB:
+        db = JsonDB(DB_DIR)
+        CreateDB(db)
+        return db
+
+    @cached_property
+    def write_data(self) -> WriteData:
+        return WriteData(self.db)
+
+    @cached_property
+    def read_data(self) -> ReadData:
+        return ReadData(self.db)
+
+    # обработка html в текст (с кэшем в памяти и в базе данных);
+    # новые тексты записываются пачками и при завершении программы
+    @cached_property
+    def text_converter(self) -> "HtmlTextConverter":
+        from src.html_text import HtmlTextConverter
+        converter = HtmlTextConverter(self.db, flush_size=32)
+        atexit.register(converter.flush)
+        return converter
+
+    # поиск дублей вакансий (кластеры в базе данных); включается в локальном меню
+    group_duplicates = False
+
+    @cached_property
+    def dedup(self) -> "VacancyDeduplicator":
+        from src.dedup import VacancyDeduplicator
+        return VacancyDeduplicator(self.db, self.text_converter)
+
+    @cached_property
+    def vacancy_clusters(self) -> dict[str, str]:
+        """
+        ru: Id кластера по id вакансии. Кластеры назначаются один раз и заново - только после сохранения вакансий.
+        en: Cluster id by vacancy id. Clusters are assigned once and again only after vacancies are saved.
+        """
+        self.dedup.populate()
+        return {id_: cluster_id for cluster_id, ids in self.dedup.clusters().items() for id_ in ids}
+
+    # сортировка списка вакансий по зарплате в базовой валюте; включается в локальном меню
+    sort_by_salary = False
+
+    @cached_property
+    def currency_rates(self) -> "CurrencyRates | None":
+        """
+        ru: Таблица курсов валют для сравнения зарплат (None - нет ни сети, ни локального файла курсов).
+        en: Currency rate table for salary comparison (None - neither the network nor a local rates file).
+        """
+        from src.currency import CurrencyRates
+        try:
+            return CurrencyRates.load()
+        except (OSError, ValueError):
+            return None
+
+    def install_currency_rates(self):
+        """
+        ru: Установить таблицу курсов (если она есть) для всех новых объектов зарплаты.
+        en: Install the rate table (if any) for all new salary objects.
+        """
+        if self.currency_rates:
+            self.currency_rates.install()
+
+    def local_vacancies(self) -> list[tuple[HHVacancy, int]]:
+        """
+        ru: Вакансии локальной базы для списка: (вакансия, количество скрытых дублей).
+            При сортировке по зарплате сначала идут пересчитанные в базовую валюту зарплаты по убыванию,
+            затем зарплаты в неизвестной валюте, затем вакансии без зарплаты.
+        en: Local database vacancies for the list: (vacancy, number of hidden duplicates).
+            When sorting by salary, salaries converted to the base currency come first in descending order,
+            then salaries in an unknown currency, then vacancies without a salary.
+        """
+        vacancy_clusters = self.vacancy_clusters if self.group_duplicates else {}
+        clusters = {}
+        for vacancy in self.read_data.get_vacancy():
+            clusters.setdefault(vacancy_clusters.get(vacancy["id"], vacancy["id"]), []).append(vacancy)
+        if self.sort_by_salary:
+            # таблица курсов устанавливается до создания объектов зарплаты
+            # the rate table is installed before salary objects are created
+            self.install_currency_rates()
+        vacancies = [(HHVacancy.create(**cluster[0]), len(cluster) - 1) for cluster in clusters.values()]
+        if not self.sort_by_salary:
+            return vacancies
+        known = [item for item in vacancies if item[0].salary and item[0].salary.known]
+        return (
+            sorted(known, key=lambda item: item[0].salary, reverse=True)
+            + [item for item in vacancies if item[0].salary and not item[0].salary.known]
+            + [item for item in vacancies if not item[0].salary]
+        )
+
+    def vacancies_saved(self):
+        """
+        ru: Сбросить кластеры после записи вакансий.
+        en: Reset clusters after vacancies are written.
+        """
+        self.__dict__.pop("vacancy_clusters", None)
 
     def start(self):
         """
@@ -294,6 +400,16 @@ Hint:
         items = [
             {"text": "Список вакансий", "action": self.find_vacancy_local, "args": {}},
             {"text": "Список работодателей", "action": self.find_employer_local, "args": {}},
+            {
+                "text": "Показывать дубли вакансий" if self.group_duplicates else "Скрывать дубли вакансий",
+                "action": self.toggle_duplicates,
+                "args": {}
+            },
+            {
+                "text": "Не сортировать по зарплате" if self.sort_by_salary else "Сортировать по зарплате",
+                "action": self.toggle_salary_sort,
+                "args": {}
+            },
         ]
         footer = [
             {"key": "<", "text": "назад", "action": self.start, "args": {}}
@@ -301,6 +417,22 @@ Hint:
         widget = WidgetCLI(header, description, items, footer)
         widget.show()
 
+    def toggle_duplicates(self):
+        """
+        ru: Включить или выключить объединение дублей в списке вакансий.
+        en: Turn grouping of duplicates in the vacancy list on or off.
+        """
+        self.group_duplicates = not self.group_duplicates
+        self.menu_local()
+
+    def toggle_salary_sort(self):
+        """
+        ru: Включить или выключить сортировку списка вакансий по зарплате.
+        en: Turn sorting of the vacancy list by salary on or off.
+        """
+        self.sort_by_salary = not self.sort_by_salary
+        self.menu_local()
+
     def find_vacancy_online(self):
         """
         ru: Поиск вакансий онлайн.
@@ -433,6 +565,7 @@ Hint:
         page = kwargs.get("page", '')
         for vacancy in vacancies:
             self.write_data.add_vacancy(vacancy)
+        self.vacancies_saved()
         header = "Сохранение данных"
         description = f"Страница [{page + 1}] сохранена в базу данных."
         footer = [
@@ -625,21 +758,24 @@ Hint:
     def find_vacancy_local(self, page: int = 0):
         """
         ru: Вывод вакансий из локальной базы данных.
-            Разбивка по 10 вакансий на страницу.
+            Разбивка по 10 вакансий на страницу; если включено объединение дублей,
+            из каждого кластера дублей выводится первая вакансия.
         en: Output of vacancies from a local database.
-            Breakdown by 10 vacancies per page.
+            Breakdown by 10 vacancies per page; with grouping of duplicates on,
+            the first vacancy of each duplicate cluster is shown.
         """
-        vacancies = self.read_data.get_vacancy()
+        vacancies = self.local_vacancies()
         pages = len(vacancies) // 10
-        obj_list = [HHVacancy.create(**vacancy) for vacancy in vacancies[page * 10:page * 10 + 10]]
+        obj_list = vacancies[page * 10:page * 10 + 10]
         header = "Список вакансий:"
         description = f"Страница {page + 1} из {pages + 1}."
         items = [
             {
-                "text": f"{str(obj)}\n{str(obj.salary)}\n{str(obj.employer)}",
+                "text": f"{str(obj)}\n{str(obj.salary)}\n{str(obj.employer)}"
+                        + (f"\nПохожих вакансий: {duplicates}" if duplicates else ""),
                 "action": self.show_info_vacancy_local,
                 "args": {"vacancy": obj, "page": page}
-            } for obj in obj_list
+            } for obj, duplicates in obj_list
         ]
         next_page = {
             "key": ">>",
@@ -762,44 +898,17 @@ Hint:
         ru: Сохранение информации о вакансии в локальную базу данных.
         en: Saving information about a vacancy to a local database.
         """
-        vacancy_id = vacancy.id_
-        check_vacancy = self.read_data.get_vacancy({"key": "id", "value": vacancy_id})
-        if check_vacancy:
-            if not check_vacancy[0]["description"]:
-                self.db.update_value(
-                    "vacancy",
-                    "description",
-                    description,
-                    "id",
-                    vacancy_id
-                )
-        else:
-            vacancy.description = description
-            self.write_data.add_vacancy(vacancy)
+        vacancy.description = description
+        self.write_data.add_vacancy(vacancy)
+        self.vacancies_saved()
 
     def save_employer_info(self, employer: HHEmployer, description: str):
         """
         ru: Сохранение информации о работодателе в локальную базу данных.
         en: Saving information about an employer to a local database.
         """
-        employer_id = employer.id_
-        check_employer = self.read_data.get_employer({"key": "id", "value": employer_id})
-        if check_employer:
-            if not check_employer[0]["description"]:
-                self.db.update_value(
-                    "employer",
-                    "description",
-                    description,
-                    "id",
-                    employer_id
-                )
-        else:
-            employer.description = description
-            self.write_data.add_employer(employer)
+        employer.description = description
+        self.write_data.add_employer(employer)
 
     def html2txt(self, html: str):
-        try:
-            text = self.convert_html.handle(html)
-        except AttributeError as e:
-            text = html
-        return text
+        return self.text_converter.text(html)
@@ -4,15 +4,28 @@
 
 CreateDB: класс для создания областей в базе данных:
     : проверить наличие базы данных и областей в ней
-    : создать базу данных с необходимыми полями: vacancy, employer, salary, area, experience, employment, schedule
+    : создать базу данных с необходимыми полями: vacancy, employer, salary, area, experience, employment, schedule,
+      address
 
-WriteData: класс на запись в базу данных c методами добавления разных объектов в базу данных
+WriteData: класс на запись в базу данных c методами добавления (upsert по ключу) разных объектов в базу данных
+    (с необязательным назначением кластеров дублей вакансий)
+
+SyncData: класс для синхронизации сохраненных вакансий с API с записью только изменившихся полей
+
+EmployerEnricher: класс для дозагрузки полной информации о работодателях пачки вакансий
+    (один запрос на уникального работодателя, пакетная запись)
 
 ReadData: класс на чтение из базы данных и методы вывода данных из базы данных в списки словарей:
 
 FilterDataDB: класс для фильтрации вакансий из базы данных
 """
 
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import requests
+
 from src.config import (
     VACANCY_FIELDS,
     EMPLOYER_FIELDS,
@@ -21,10 +34,21 @@ from src.config import (
     EXPERIENCE_FIELDS,
     EMPLOYMENT_FIELDS,
     SCHEDULE_FIELDS,
-    EMPLOYER_URL_LOGO_FIELDS
+    EMPLOYER_URL_LOGO_FIELDS,
+    EMPLOYER_SYNC_FIELDS,
+    ADDRESS_FIELDS,
+    DESCRIPTION_TEXT_FIELDS,
+    VACANCY_CLUSTER_FIELDS
 )
 from src.data_base import BaseDB
+from src.metrics import metrics
 from src.api_parser import JobObject
+from src.api_errors import ApiBaseError
+from src.hh_parser import HHInfoVacancy, HHInfoEmployer, HHGenerateVacanciesList, HHGenerateEmployersList
+
+if TYPE_CHECKING:
+    # поиск дублей импортирует html2text / deduplication imports html2text
+    from src.dedup import VacancyDeduplicator
 
 
 class CreateDB:
@@ -49,7 +73,11 @@ class CreateDB:
             EXPERIENCE_FIELDS,
             EMPLOYMENT_FIELDS,
             SCHEDULE_FIELDS,
-            EMPLOYER_URL_LOGO_FIELDS
+            EMPLOYER_URL_LOGO_FIELDS,
+            EMPLOYER_SYNC_FIELDS,
+            ADDRESS_FIELDS,
+            DESCRIPTION_TEXT_FIELDS,
+            VACANCY_CLUSTER_FIELDS
         ]
         for field in self.fields:
             check = self.db.check_area_name(field["name"])
@@ -57,50 +85,91 @@ class CreateDB:
                 self.db.create_area(field["name"], field["fields"])
 
 
+# порядок пакетной записи таблиц (справочники раньше вакансий) / bulk write order of tables (references before vacancies)
+WRITE_ORDER = [
+    AREA_FIELDS,
+    EXPERIENCE_FIELDS,
+    EMPLOYMENT_FIELDS,
+    SCHEDULE_FIELDS,
+    EMPLOYER_URL_LOGO_FIELDS,
+    EMPLOYER_FIELDS,
+    SALARY_FIELDS,
+    ADDRESS_FIELDS,
+    VACANCY_FIELDS
+]
+# таблицы, в которых пустые значения не затирают сохраненные / tables where empty values do not overwrite saved ones
+SKIP_NONE_AREAS = {VACANCY_FIELDS["name"], EMPLOYER_FIELDS["name"]}
+
+
 class WriteData:
     """
     ru: Класс для записи данных в базу данных.
+        Записи добавляются по ключу таблицы (upsert): повторно полученные объекты
+        обновляют изменившиеся поля, а не дублируются.
     en: Class for writing data to the database.
+        Records are written by the table key (upsert): re-fetched objects
+        update the changed fields instead of being duplicated.
     """
-    def __init__(self, db: BaseDB):
+    def __init__(self, db: BaseDB, write_references: bool = True, dedup: "VacancyDeduplicator" = None):
         """
         :param db: database object
+        :param write_references: записывать справочники (локация, опыт, занятость, график) вместе с вакансией;
+            False - если справочники уже заполнены через ReferenceCache.populate
+        :param dedup: объект поиска дублей: записанным вакансиям назначаются кластеры (None - без поиска дублей)
         """
         self.db = db
+        self.write_references = write_references
+        self.dedup = dedup
+
+    def upsert(self, fields: dict, to_add: dict, skip_none: bool = False) -> dict:
+        """
+        ru: Добавить или обновить запись по ключу таблицы.
+        en: Insert or update a record by the table key.
+        :param fields: описание таблицы из config
+        :param to_add: словарь с данными
+        :param skip_none: не затирать сохраненные значения пустыми значениями
+        :return: словарь изменившихся полей
+        """
+        return self.db.upsert(fields["name"], to_add, fields["key"], skip_none)
 
-    def add_area(self, area: JobObject):
+    @metrics.timed("write_data_seconds")
+    def add_area(self, area: JobObject) -> dict:
         """
         ru: Добавить локацию в базу данных.
         en: Add location to the database.
         :param area: объект локации
         """
-        self.db.add_value(AREA_FIELDS["name"], area.get_dict())
+        return self.upsert(AREA_FIELDS, area.get_dict())
 
-    def add_experience(self, experience: JobObject):
+    @metrics.timed("write_data_seconds")
+    def add_experience(self, experience: JobObject) -> dict:
         """
         ru: Добавить опыт работы в базу данных.
         en: Add experience to the database.
         :param experience: объект опыта работы
         """
-        self.db.add_value(EXPERIENCE_FIELDS["name"], experience.get_dict())
+        return self.upsert(EXPERIENCE_FIELDS, experience.get_dict())
 
-    def add_employment(self, employment: JobObject):
+    @metrics.timed("write_data_seconds")
+    def add_employment(self, employment: JobObject) -> dict:
         """
         ru: Добавить тип занятости в базу данных.
         en: Add employment type to the database.
         :param employment: объект типа занятости
         """
-        self.db.add_value(EMPLOYMENT_FIELDS["name"], employment.get_dict())
+        return self.upsert(EMPLOYMENT_FIELDS, employment.get_dict())
 
-    def add_schedule(self, schedule: JobObject):
+    @metrics.timed("write_data_seconds")
+    def add_schedule(self, schedule: JobObject) -> dict:
         """
         ru: Добавить график работы в базу данных.
         en: Add work schedule to the database.
         :param schedule: объект графика работы
         """
-        self.db.add_value(SCHEDULE_FIELDS["name"], schedule.get_dict())
+        return self.upsert(SCHEDULE_FIELDS, schedule.get_dict())
 
-    def add_salary(self, salary: JobObject, vacancy_id: int):
+    @metrics.timed("write_data_seconds")
+    def add_salary(self, salary: JobObject, vacancy_id: int) -> dict:
         """
         ru: Добавить зарплату в базу данных.
         en: Add salary to the database.
@@ -108,9 +177,27 @@ class WriteData:
         """
         to_add = salary.get_dict()
         to_add["vacancy_id"] = vacancy_id
-        self.db.add_value(SALARY_FIELDS["name"], to_add)
+        return self.upsert(SALARY_FIELDS, to_add)
+
+    @metrics.timed("write_data_seconds")
+    def add_address(self, address: dict, vacancy_id: str) -> dict:
+        """
+        ru: Добавить адрес (координаты) вакансии в базу данных.
+        en: Add vacancy address (coordinates) to the database.
+        :param address: словарь адреса из ответа API
+        :param vacancy_id: id вакансии
+        """
+        to_add = {
+            "vacancy_id": vacancy_id,
+            "lat": address.get("lat"),
+            "lng": address.get("lng"),
+            "city": address.get("city"),
+            "raw": address.get("raw")
+        }
+        return self.upsert(ADDRESS_FIELDS, to_add)
 
-    def add_employer_url_logo(self, employer_url_logo: JobObject, employer_id: int):
+    @metrics.timed("write_data_seconds")
+    def add_employer_url_logo(self, employer_url_logo: JobObject, employer_id: int) -> dict:
         """
         ru: Добавить логотип работодателя в базу данных.
         en: Add employer logo to the database.
@@ -118,16 +205,31 @@ class WriteData:
         """
         to_add = employer_url_logo.get_dict()
         to_add["employer_id"] = employer_id
-        self.db.add_value(EMPLOYER_URL_LOGO_FIELDS["name"], to_add)
+        return self.upsert(EMPLOYER_URL_LOGO_FIELDS, to_add)
 
-    def add_employer(self, employer: JobObject):
+    @metrics.timed("write_data_seconds")
+    def add_employer(self, employer: JobObject) -> dict:
         """
         ru: Добавить работодателя в базу данных.
+            Пустое описание (краткая карточка работодателя из вакансии) не затирает сохраненное.
         en: Add employer to the database.
+            An empty description (short employer card from a vacancy) does not overwrite the saved one.
+        :param employer: объект работодателя
+        """
+        record, logo = self.employer_record(employer)
+        if logo:
+            self.upsert(EMPLOYER_URL_LOGO_FIELDS, logo)
+        return self.upsert(EMPLOYER_FIELDS, record, skip_none=True)
+
+    @staticmethod
+    def employer_record(employer: JobObject) -> tuple[dict, dict | None]:
+        """
+        ru: Запись таблицы работодателей и запись логотипа (если он есть).
+        en: Employer table record and logo record (if any).
         :param employer: объект работодателя
         """
         get_dict = employer.get_dict()
-        to_add = {
+        record = {
             "id": get_dict["id"],
             "name": get_dict["name"],
             "alternate_url": get_dict["alternate_url"],
@@ -135,49 +237,313 @@ class WriteData:
             "description": get_dict["description"],
             "site_url": get_dict["site_url"]
         }
-        logo_urls = get_dict.get("logo_urls")
-        if logo_urls:
-            self.add_employer_url_logo(logo_urls, to_add["id"])
-        self.db.add_value(EMPLOYER_FIELDS["name"], to_add)
-
-    def add_vacancy(self, vacancy: JobObject):
+        logo = None
+        if get_dict.get("logo_urls"):
+            logo = get_dict["logo_urls"].get_dict() | {"employer_id": get_dict["id"]}
+        return record, logo
+
+    @metrics.timed("write_data_seconds")
+    def add_employers(self, employers: list[JobObject]) -> list[dict]:
+        """
+        ru: Пакетно добавить работодателей (каждая таблица записывается один раз).
+        en: Add employers in bulk (each table is written once).
+        :param employers: список объектов работодателей
+        :return: список словарей изменившихся полей работодателей
+        """
+        records = []
+        logos = []
+        for employer in employers:
+            record, logo = self.employer_record(employer)
+            records.append(record)
+            if logo:
+                logos.append(logo)
+        if logos:
+            self.db.upsert_many(EMPLOYER_URL_LOGO_FIELDS["name"], logos, EMPLOYER_URL_LOGO_FIELDS["key"])
+        return self.db.upsert_many(EMPLOYER_FIELDS["name"], records, EMPLOYER_FIELDS["key"], skip_none=True)
+
+    @metrics.timed("write_data_seconds")
+    def add_vacancy(self, vacancy: JobObject) -> dict:
         """
         ru: Добавить вакансию в базу данных.
+            Пустое описание (вакансия из результатов поиска) не затирает сохраненное.
         en: Add vacancy to the database.
+            An empty description (vacancy from search results) does not overwrite the saved one.
         :param vacancy: объект вакансии
+        :return: словарь изменившихся полей вакансии (зарплаты и адреса по ключам "salary" и "address")
+        """
+        records = self.vacancy_records(vacancy)
+        changes = {}
+        for fields in WRITE_ORDER:
+            for record in records.get(fields["name"], []):
+                record_changes = self.upsert(fields, record, skip_none=fields["name"] in SKIP_NONE_AREAS)
+                if fields is VACANCY_FIELDS:
+                    changes.update(record_changes)
+                elif fields in (SALARY_FIELDS, ADDRESS_FIELDS) and record_changes:
+                    changes[fields["name"]] = record_changes
+        self.assign_clusters(records)
+        return changes
+
+    def vacancy_records(self, vacancy: JobObject) -> dict[str, list[dict]]:
+        """
+        ru: Записи всех таблиц для одной вакансии (без записи в базу);
+            их записывают add_vacancy и add_vacancies.
+        en: Records of all tables for one vacancy (without writing to the database);
+            add_vacancy and add_vacancies write them.
+        :param vacancy: объект вакансии
+        :return: {название таблицы: список записей}
         """
         get_dict = vacancy.get_dict()
-        employer = get_dict["employer"]
-        area = get_dict["area"]
-        experience = get_dict["experience"]
-        employment = get_dict["employment"]
-        schedule = get_dict["schedule"]
-        salary = get_dict["salary"]
-        to_add = {
-            "id": get_dict["id"],
-            "name": get_dict["name"],
-            "alternate_url": get_dict["alternate_url"],
-            "published_at": get_dict["published_at"],
-            "created_at": get_dict["created_at"],
-            "employer_id": employer.id_,
-            "area_id": area.id_,
-            "experience_id": experience.id_,
-            "employment_id": employment.id_,
-            "schedule_id": schedule.id_,
-            "description": get_dict["description"]
+        employer, logo = self.employer_record(get_dict["employer"])
+        records = {
+            VACANCY_FIELDS["name"]: [{
+                "id": get_dict["id"],
+                "name": get_dict["name"],
+                "alternate_url": get_dict["alternate_url"],
+                "published_at": get_dict["published_at"],
+                "created_at": get_dict["created_at"],
+                "employer_id": get_dict["employer"].id_,
+                "area_id": get_dict["area"].id_,
+                "experience_id": get_dict["experience"].id_,
+                "employment_id": get_dict["employment"].id_,
+                "schedule_id": get_dict["schedule"].id_,
+                "description": get_dict["description"]
+            }],
+            EMPLOYER_FIELDS["name"]: [employer]
         }
-        if salary:
-            self.add_salary(salary, to_add["id"])
-        if area:
-            self.add_area(area)
-        if experience:
-            self.add_experience(experience)
-        if employment:
-            self.add_employment(employment)
-        if schedule:
-            self.add_schedule(schedule)
-        self.add_employer(employer)
-        self.db.add_value(VACANCY_FIELDS["name"], to_add)
+        if logo:
+            records[EMPLOYER_URL_LOGO_FIELDS["name"]] = [logo]
+        if get_dict["salary"]:
+            records[SALARY_FIELDS["name"]] = [get_dict["salary"].get_dict() | {"vacancy_id": get_dict["id"]}]
+        if self.write_references:
+            for fields, reference in (
+                    (AREA_FIELDS, get_dict["area"]),
+                    (EXPERIENCE_FIELDS, get_dict["experience"]),
+                    (EMPLOYMENT_FIELDS, get_dict["employment"]),
+                    (SCHEDULE_FIELDS, get_dict["schedule"])
+            ):
+                if reference:
+                    records[fields["name"]] = [reference.get_dict()]
+        address = get_dict["additional"].get("address")
+        if address and address.get("lat") is not None and address.get("lng") is not None:
+            records[ADDRESS_FIELDS["name"]] = [{
+                "vacancy_id": get_dict["id"],
+                "lat": address.get("lat"),
+                "lng": address.get("lng"),
+                "city": address.get("city"),
+                "raw": address.get("raw")
+            }]
+        return records
+
+    @metrics.timed("write_data_seconds")
+    def write_records(self, records: dict[str, list[dict]]) -> dict[str, int]:
+        """
+        ru: Записать пакеты записей по таблицам: каждая таблица записывается одним upsert_many.
+            Пустые значения вакансий и работодателей не затирают сохраненные (как в add_vacancy).
+        en: Write batches of records by tables: each table is written with one upsert_many.
+            Empty vacancy and employer values do not overwrite the saved ones (as in add_vacancy).
+        :param records: {название таблицы: список записей}
+        :return: {название таблицы: количество записей}
+        """
+        result = {}
+        for fields in WRITE_ORDER:
+            area_records = records.get(fields["name"])
+            if area_records:
+                skip_none = fields["name"] in SKIP_NONE_AREAS
+                self.db.upsert_many(fields["name"], area_records, fields["key"], skip_none)
+                result[fields["name"]] = len(area_records)
+        self.assign_clusters(records)
+        return result
+
+    def assign_clusters(self, records: dict[str, list[dict]]):
+        """
+        ru: Назначить кластеры дублей записанным вакансиям (если задан объект поиска дублей).
+        en: Assign duplicate clusters to the written vacancies (if a deduplication object is set).
+        :param records: {название таблицы: список записей}
+        """
+        if self.dedup and records.get(VACANCY_FIELDS["name"]):
+            salaries = {record["vacancy_id"]: record for record in records.get(SALARY_FIELDS["name"], [])}
+            self.dedup.add(records[VACANCY_FIELDS["name"]], salaries)
+
+    @metrics.timed("write_data_seconds")
+    def add_vacancies(self, vacancies: list[JobObject]) -> dict[str, int]:
+        """
+        ru: Пакетно добавить вакансии (каждая таблица записывается один раз).
+        en: Add vacancies in bulk (each table is written once).
+        :param vacancies: список объектов вакансий
+        :return: {название таблицы: количество записей}
+        """
+        records = {}
+        for vacancy in vacancies:
+            for area_name, area_records in self.vacancy_records(vacancy).items():
+                records.setdefault(area_name, []).extend(area_records)
+        return self.write_records(records)
+
+
+class SyncData:
+    """
+    ru: Класс для синхронизации сохраненных вакансий с API.
+        Повторно запрашивает вакансии по id, сравнивает с локальными данными
+        и записывает только изменившиеся поля.
+    en: Class for synchronizing saved vacancies with the API.
+        Re-queries vacancies by id, diffs them against the local data
+        and writes only the changed fields.
+    """
+    def __init__(self, db: BaseDB, info_class: type = HHInfoVacancy):
+        """
+        :param db: database object
+        :param info_class: класс запроса информации о вакансии
+        """
+        self.db = db
+        self.info_class = info_class
+        self.write_data = WriteData(db)
+        self.errors = {}
+
+    def saved_ids(self) -> list[str]:
+        """
+        ru: Получить id сохраненных вакансий.
+        en: Get ids of saved vacancies.
+        """
+        return [vacancy["id"] for vacancy in self.db.select_value(VACANCY_FIELDS["name"])]
+
+    def sync_vacancy(self, vacancy_id: str) -> dict:
+        """
+        ru: Синхронизировать одну вакансию.
+        en: Synchronize one vacancy.
+        :param vacancy_id: id вакансии
+        :return: словарь изменившихся полей
+        """
+        info = self.info_class(vacancy_id).info()
+        vacancy = HHGenerateVacanciesList([info]).generate()[0]
+        return self.write_data.add_vacancy(vacancy)
+
+    def sync_vacancies(self, ids: list[str] = None) -> dict[str, dict]:
+        """
+        ru: Синхронизировать сохраненные вакансии.
+            Ошибки запросов (например, вакансия в архиве) собираются в self.errors.
+        en: Synchronize saved vacancies.
+            Request errors (e.g. an archived vacancy) are collected in self.errors.
+        :param ids: id вакансий (по умолчанию - все сохраненные)
+        :return: {id вакансии: словарь изменившихся полей} только для изменившихся вакансий
+        """
+        result = {}
+        self.errors = {}
+        for vacancy_id in ids or self.saved_ids():
+            try:
+                changes = self.sync_vacancy(vacancy_id)
+            except ApiBaseError as e:
+                self.errors[vacancy_id] = str(e)
+                continue
+            if changes:
+                result[vacancy_id] = changes
+        return result
+
+
+class EmployerEnricher:
+    """
+    ru: Класс для дозагрузки полной информации о работодателях пачки вакансий.
+        В вакансии есть только краткая карточка работодателя (без описания), поэтому
+        для каждого уникального работодателя, которого нет в базе или данные которого устарели,
+        выполняется один запрос HHInfoEmployer (параллельно), а результат записывается одним пакетом.
+    en: Class for loading full information about employers of a batch of vacancies.
+        A vacancy contains only a short employer card (without a description), so
+        one HHInfoEmployer request is made (concurrently) for each unique employer that is not in the database
+        or whose data is stale, and the result is written in one batch.
+    """
+    def __init__(
+            self,
+            db: BaseDB,
+            info_class: type = HHInfoEmployer,
+            max_age: datetime.timedelta = datetime.timedelta(days=7),
+            max_workers: int = 8
+    ):
+        """
+        :param db: database object
+        :param info_class: класс запроса информации о работодателе
+        :param max_age: срок, после которого данные работодателя считаются устаревшими
+        :param max_workers: количество потоков для запросов
+        """
+        self.db = db
+        self.info_class = info_class
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self.write_data = WriteData(db)
+        self.errors = {}
+
+    @staticmethod
+    def collect_ids(vacancies: list[JobObject]) -> list[str]:
+        """
+        ru: Уникальные id работодателей пачки вакансий (в порядке появления).
+        en: Unique employer ids of a batch of vacancies (in order of appearance).
+        """
+        return list(dict.fromkeys(vacancy.employer.id_ for vacancy in vacancies if vacancy.employer.id_))
+
+    def pending_ids(self, ids: list[str], now: datetime.datetime) -> list[str]:
+        """
+        ru: id работодателей, которые еще не дозагружались или данные которых устарели.
+            Решение принимается только по таблице employer_sync: работодатель с пустым описанием
+            не запрашивается повторно до истечения срока max_age.
+        en: Ids of employers that have not been loaded yet or whose data is stale.
+            The decision is made by the employer_sync table alone: an employer with an empty description
+            is not requested again until max_age expires.
+        """
+        synced = {
+            record["employer_id"]: datetime.datetime.fromisoformat(record["synced_at"])
+            for record in self.db.select_value(EMPLOYER_SYNC_FIELDS["name"])
+        }
+        return [
+            id_ for id_ in ids
+            if id_ not in synced or now - synced[id_] > self.max_age
+        ]
+
+    def fetch(self, id_: str) -> dict | None:
+        """
+        ru: Запрос информации о работодателе (ошибки собираются в self.errors).
+        en: Request employer information (errors are collected in self.errors).
+        """
+        try:
+            return self.info_class(id_).info()
+        except (ApiBaseError, requests.RequestException) as e:
+            self.errors[id_] = str(e)
+            return None
+
+    def enrich(self, vacancies: list[JobObject], progress: callable = None) -> int:
+        """
+        ru: Дозагрузить и записать работодателей пачки вакансий.
+        en: Load and write employers of a batch of vacancies.
+        :param vacancies: список объектов вакансий
+        :param progress: функция прогресса progress(stage, done, total), stage = "employers"
+        :return: количество обновленных работодателей
+        """
+        return self.enrich_ids(self.collect_ids(vacancies), progress)
+
+    def enrich_ids(self, ids: list[str], progress: callable = None) -> int:
+        """
+        ru: Дозагрузить и записать работодателей по списку id (устаревшие и отсутствующие в базе).
+        en: Load and write employers by a list of ids (stale and missing from the database).
+        :param ids: id работодателей
+        :param progress: функция прогресса progress(stage, done, total), stage = "employers"
+        :return: количество обновленных работодателей
+        """
+        self.errors = {}
+        now = datetime.datetime.now(datetime.timezone.utc)
+        ids = self.pending_ids(ids, now)
+        if not ids:
+            return 0
+        items = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for i, item in enumerate(executor.map(self.fetch, ids)):
+                if item:
+                    items.append(item)
+                if progress:
+                    progress("employers", i + 1, len(ids))
+        employers = HHGenerateEmployersList(items).generate()
+        self.write_data.add_employers(employers)
+        self.db.upsert_many(
+            EMPLOYER_SYNC_FIELDS["name"],
+            [{"employer_id": employer.id_, "synced_at": now.isoformat()} for employer in employers],
+            EMPLOYER_SYNC_FIELDS["key"]
+        )
+        return len(employers)
 
 
 class ReadData:
@@ -191,6 +557,7 @@ class ReadData:
         """
         self.db = db
 
+    @metrics.timed("read_data_seconds")
     def get_area(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить локации из базы данных.
@@ -203,6 +570,7 @@ class ReadData:
             data = self.db.select_value(AREA_FIELDS["name"])
         return data
 
+    @metrics.timed("read_data_seconds")
     def get_experience(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить опыт работы из базы данных.
@@ -215,6 +583,7 @@ class ReadData:
             data = self.db.select_value(EXPERIENCE_FIELDS["name"])
         return data
 
+    @metrics.timed("read_data_seconds")
     def get_employment(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить тип занятости из базы данных.
@@ -227,6 +596,7 @@ class ReadData:
             data = self.db.select_value(EMPLOYMENT_FIELDS["name"])
         return data
 
+    @metrics.timed("read_data_seconds")
     def get_schedule(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить график работы из базы данных.
@@ -239,6 +609,7 @@ class ReadData:
             data = self.db.select_value(SCHEDULE_FIELDS["name"])
         return data
 
+    @metrics.timed("read_data_seconds")
     def get_salary(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить зарплаты из базы данных.
@@ -251,6 +622,33 @@ class ReadData:
             data = self.db.select_value(SALARY_FIELDS["name"])
         return data
 
+    @metrics.timed("read_data_seconds")
+    def get_address(self, key_value: dict[str, any] = None) -> list:
+        """
+        ru: Получить адреса (координаты) вакансий из базы данных.
+        en: Get vacancy addresses (coordinates) from the database.
+        :param key_value: ключ и значение для поиска
+        """
+        if key_value:
+            data = self.db.select_value(ADDRESS_FIELDS["name"], key_value)
+        else:
+            data = self.db.select_value(ADDRESS_FIELDS["name"])
+        return data
+
+    @metrics.timed("read_data_seconds")
+    def get_vacancy_cluster(self, key_value: dict[str, any] = None) -> list:
+        """
+        ru: Получить кластеры дублей вакансий из базы данных.
+        en: Get vacancy duplicate clusters from the database.
+        :param key_value: ключ и значение для поиска
+        """
+        if key_value:
+            data = self.db.select_value(VACANCY_CLUSTER_FIELDS["name"], key_value)
+        else:
+            data = self.db.select_value(VACANCY_CLUSTER_FIELDS["name"])
+        return data
+
+    @metrics.timed("read_data_seconds")
     def get_employer_url_logo(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить логотипы работодателей из базы данных.
@@ -263,6 +661,7 @@ class ReadData:
             data = self.db.select_value(EMPLOYER_URL_LOGO_FIELDS["name"])
         return data
 
+    @metrics.timed("read_data_seconds")
     def get_employer(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить работодателей из базы данных.
@@ -279,6 +678,7 @@ class ReadData:
             employer["logo_urls"] = logo
         return data
 
+    @metrics.timed("read_data_seconds")
     def get_vacancy(self, key_value: dict[str, any] = None) -> list:
         """
         ru: Получить вакансии из базы данных.
@@ -0,0 +1,31 @@
+import shutil
+import pytest
+from src.data_base import JsonDB, JsonLinesDB
+from src.hh_parser import HHGenerateVacanciesList
+from src.mock_server import make_vacancy
+from tests.benchmarks.data import SIZES, fill_db
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}")
+def items(request) -> list[dict]:
+    return [make_vacancy(i, employers=997, full=True) for i in range(request.param)]
+
+
+@pytest.fixture(scope="session")
+def vacancies(items) -> list:
+    return HHGenerateVacanciesList(items).generate()
+
+
+@pytest.fixture(scope="session", params=[JsonDB, JsonLinesDB], ids=lambda db_class: db_class.__name__)
+def filled_db_template(request, tmp_path_factory, vacancies) -> tuple[type, str]:
+    path = str(tmp_path_factory.mktemp("benchdb"))
+    fill_db(request.param(path), vacancies)
+    return request.param, path
+
+
+@pytest.fixture
+def filled_db(filled_db_template, tmp_path) -> JsonDB:
+    # копия заполненной базы на каждый тест: изменения одного теста не влияют на другие
+    # a copy of the filled database per test: changes of one test do not affect the others
+    db_class, path = filled_db_template
+    return db_class(shutil.copytree(path, tmp_path / "db"))
@@ -0,0 +1,42 @@
+"""
+ru: Заполнение базы для тестов производительности (вакансии - src.mock_server.make_vacancy).
+en: Database filling for benchmarks (vacancies come from src.mock_server.make_vacancy).
+"""
+
+import os
+from src.config import VACANCY_FIELDS, SALARY_FIELDS
+from src.utils import CreateDB, WriteData
+
+
+# размеры наборов данных, например HH_BENCH_SIZES=1000,10000,100000 / dataset sizes
+SIZES = [int(size) for size in os.environ.get("HH_BENCH_SIZES", "1000").split(",")]
+
+
+def vacancy_record(vacancy) -> dict:
+    return {
+        "id": vacancy.id_,
+        "name": vacancy.name,
+        "employer_id": vacancy.employer.id_,
+        "area_id": vacancy.area.id_,
+        "created_at": vacancy.created_at,
+        "published_at": vacancy.published_at,
+        "experience_id": vacancy.experience.id_,
+        "employment_id": vacancy.employment.id_,
+        "schedule_id": vacancy.schedule.id_,
+        "alternate_url": vacancy.alternate_url,
+        "description": vacancy.description
+    }
+
+
+def fill_db(db, vacancies: list):
+    CreateDB(db)
+    db.upsert_many(VACANCY_FIELDS["name"], [vacancy_record(vacancy) for vacancy in vacancies], VACANCY_FIELDS["key"])
+    salaries = [
+        vacancy.salary.get_dict() | {"vacancy_id": vacancy.id_} for vacancy in vacancies if vacancy.salary
+    ]
+    db.upsert_many(SALARY_FIELDS["name"], salaries, SALARY_FIELDS["key"])
+    employers = {vacancy.employer.id_: vacancy.employer for vacancy in vacancies}
+    WriteData(db).add_employers(list(employers.values()))
+    for vacancy in vacancies[:50]:
+        WriteData(db).add_vacancy(vacancy)
+    return db
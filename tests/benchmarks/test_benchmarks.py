@@ -0,0 +1,82 @@
+"""
+ru: Тесты производительности горячих путей (хранилище, гидратация, создание объектов).
+    Тесты помечены benchmark и не запускаются обычным pytest.
+    Запуск: pytest tests/benchmarks -m benchmark --benchmark-only
+    Сохранить базовую линию: pytest tests/benchmarks -m benchmark --benchmark-only --benchmark-save=baseline
+    Сравнить с порогом регрессии:
+        pytest tests/benchmarks -m benchmark --benchmark-only --benchmark-compare --benchmark-compare-fail=mean:20%
+    Размеры наборов данных: HH_BENCH_SIZES=1000,10000,100000
+en: Benchmarks of hot paths (storage, hydration, object construction).
+    The tests are marked benchmark and are not run by a plain pytest. See the commands above; baselines are saved to .benchmarks/ by pytest-benchmark.
+"""
+
+import pytest
+
+from src.data_base import JsonDB, JsonLinesDB
+from src.hh_parser import HHGenerateVacanciesList, HHSalary
+from src.html_text import HtmlTextConverter, html_to_text
+from src.utils import WriteData, ReadData
+from tests.benchmarks.data import fill_db
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestStorageBenchmarks:
+    def test_select_value_by_key(self, benchmark, filled_db, items):
+        key = {"key": "id", "value": items[len(items) // 2]["id"]}
+        result = benchmark(filled_db.select_value, "vacancy", key)
+        assert len(result) == 1
+
+    def test_select_value_all(self, benchmark, filled_db, items):
+        result = benchmark(filled_db.select_value, "vacancy")
+        assert len(result) == len(items)
+
+    @pytest.mark.parametrize("db_class", [JsonDB, JsonLinesDB], ids=lambda db_class: db_class.__name__)
+    def test_add_value(self, benchmark, tmp_path, db_class, vacancies):
+        db = fill_db(db_class(str(tmp_path)), vacancies)
+        counter = iter(range(len(vacancies), len(vacancies) * 2))
+
+        def add():
+            db.add_value("area", {"id": f"bench-{next(counter)}", "name": "Area", "url": "https://api.hh.ru/areas/0"})
+
+        benchmark.pedantic(add, rounds=20)
+
+    def test_update_value(self, benchmark, filled_db, items):
+        vacancy_id = items[len(items) // 2]["id"]
+        benchmark(filled_db.update_value, "vacancy", "name", "Senior Python developer", "id", vacancy_id)
+        assert filled_db.select_value("vacancy", {"key": "id", "value": vacancy_id})[0]["name"] == \
+            "Senior Python developer"
+
+
+class TestHydrationBenchmarks:
+    def test_add_vacancy(self, benchmark, filled_db, vacancies):
+        write_data = WriteData(filled_db)
+        benchmark(write_data.add_vacancy, vacancies[len(vacancies) // 2])
+
+    def test_get_vacancy_by_key(self, benchmark, filled_db, items):
+        read_data = ReadData(filled_db)
+        result = benchmark(read_data.get_vacancy, {"key": "id", "value": items[len(items) // 2]["id"]})
+        assert len(result) == 1
+
+
+class TestObjectBenchmarks:
+    def test_generate_vacancies(self, benchmark, items):
+        result = benchmark(lambda: HHGenerateVacanciesList(items).generate())
+        assert len(result) == len(items)
+
+    def test_sort_salaries(self, benchmark, vacancies):
+        salaries = [vacancy.salary for vacancy in vacancies if vacancy.salary]
+        result = benchmark(sorted, salaries)
+        assert all(isinstance(salary, HHSalary) for salary in result)
+
+    def test_html2txt(self, benchmark, items):
+        descriptions = [item["description"] for item in items[:1000]]
+        benchmark(lambda: [html_to_text(description) for description in descriptions])
+
+    def test_html2txt_cached(self, benchmark, items):
+        descriptions = [item["description"] for item in items[:1000]]
+        converter = HtmlTextConverter(cache_size=len(descriptions))
+        converter.texts(descriptions)
+        benchmark(converter.texts, descriptions)
@@ -0,0 +1,23 @@
+import pytest
+from src.data_base import JsonDB, JsonLinesDB
+from src.utils import CreateDB
+
+
+@pytest.fixture(params=[JsonDB, JsonLinesDB], ids=lambda db_class: db_class.__name__)
+def db_class(request) -> type:
+    return request.param
+
+
+@pytest.fixture
+def make_db(db_class, tmp_path) -> callable:
+    # новая база с таблицами в tmp_path / a new database with tables in tmp_path
+    def make(name: str = "testdb") -> JsonDB:
+        db = db_class(str(tmp_path / name))
+        CreateDB(db)
+        return db
+    return make
+
+
+@pytest.fixture
+def db(make_db) -> JsonDB:
+    return make_db()
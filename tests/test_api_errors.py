@@ -6,7 +6,8 @@ from src.api_errors import (
     ApiBaseError,
     ApiQueryError,
     AttrIntersectionError,
-    AttrValueRestrictionError
+    AttrValueRestrictionError,
+    CircuitOpenError
 )
 
 
@@ -24,6 +25,18 @@ def test_api_query_error():
     assert str(error) == "Test"
 
 
+def test_api_query_error_status():
+    assert ApiQueryError().status is None
+    assert ApiQueryError("Test", status=503).status == 503
+
+
+def test_circuit_open_error():
+    error = CircuitOpenError()
+    assert str(error) == "Circuit open"
+    error = CircuitOpenError("Test")
+    assert str(error) == "Test"
+
+
 def test_attr_intersection_error():
     error = AttrIntersectionError()
     assert str(error) == "Attributes intersect"
@@ -1,7 +1,27 @@
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
+import requests
 import requests_mock
-from src.api_parser import ApiBase, ApiFindBase, ApiInfoBase, JobObject, GenerateObjectsList
-from src.api_errors import ApiQueryError
+from src.api_parser import (
+    ApiBase,
+    ApiFindBase,
+    ApiInfoBase,
+    JobObject,
+    GenerateObjectsList,
+    TokenBucket,
+    RetryPolicy,
+    CircuitBreaker,
+    iter_json_items,
+    iter_json_items_ijson,
+    ChunksReader,
+    RequestsTransport,
+    HttpxTransport,
+    SingleFlight
+)
+from src.api_errors import ApiQueryError, CircuitOpenError
 
 
 @pytest.fixture
@@ -9,6 +29,15 @@ def api_base():
     return ApiBase("http://example.com/api")
 
 
+@pytest.fixture
+def api_retry_base():
+    api = ApiBase("http://example.com/api")
+    api.retry_policy = RetryPolicy(retries=2, backoff=0)
+    ApiBase.reset_stats()
+    ApiBase.reset_breakers()
+    return api
+
+
 @pytest.fixture
 def api_find_base():
     return ApiFindBase("http://example.com/api/search")
@@ -52,6 +81,149 @@ class TestApiBase:
             with pytest.raises(ApiQueryError):
                 api_base._query()
 
+    @staticmethod
+    def test_throttled_query_is_retried(api_retry_base):
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", [
+                {"status_code": 429, "headers": {"Retry-After": "0"}},
+                {"status_code": 503},
+                {"json": {"success": True}, "status_code": 200}
+            ])
+            assert api_retry_base._query() == {"success": True}
+        assert ApiBase.stats["requests"] == 3
+        assert ApiBase.stats["retries"] == 2
+        assert ApiBase.stats["throttled"] == 1
+
+    @staticmethod
+    def test_retries_are_limited(api_retry_base):
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", status_code=500)
+            with pytest.raises(ApiQueryError):
+                api_retry_base._query()
+            assert m.call_count == 3
+
+    @staticmethod
+    def test_timeout_is_retried_then_raised(api_retry_base):
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", exc=requests.exceptions.ConnectTimeout)
+            with pytest.raises(ApiQueryError) as error:
+                api_retry_base._query()
+        assert error.value.status is None
+        assert isinstance(error.value.__cause__, requests.exceptions.Timeout)
+        assert ApiBase.stats["timeouts"] == 3
+
+    @staticmethod
+    def test_open_circuit_rejects_without_request(api_retry_base):
+        api_retry_base.get_breaker(api_retry_base.breaker_scope).failure_threshold = 1
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", status_code=503)
+            with pytest.raises(ApiQueryError):
+                api_retry_base._query()
+            with pytest.raises(CircuitOpenError):
+                api_retry_base._query()
+            assert m.call_count == 3
+        assert ApiBase.stats["rejected"] == 1
+
+    @staticmethod
+    def test_client_errors_do_not_open_circuit(api_retry_base):
+        api_retry_base.get_breaker(api_retry_base.breaker_scope).failure_threshold = 1
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", status_code=404)
+            for _ in range(2):
+                with pytest.raises(ApiQueryError):
+                    api_retry_base._query()
+        assert api_retry_base.get_breaker(api_retry_base.breaker_scope).state == CircuitBreaker.CLOSED
+
+    @staticmethod
+    def test_parse_error_releases_half_open_trial(api_retry_base):
+        breaker = api_retry_base.get_breaker(api_retry_base.breaker_scope)
+        breaker.state, breaker.opened_at = CircuitBreaker.OPEN, 0.0
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", text="not json")
+            with pytest.raises(ValueError):
+                api_retry_base._query()
+            assert breaker.state == CircuitBreaker.OPEN
+            breaker.opened_at = 0.0
+            m.get("http://example.com/api", json={"ok": True})
+            assert api_retry_base._query() == {"ok": True}
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @staticmethod
+    def test_interrupt_does_not_touch_circuit(api_retry_base):
+        breaker = api_retry_base.get_breaker(api_retry_base.breaker_scope)
+        breaker.failure_threshold = 1
+
+        def interrupt():
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            api_retry_base._guarded(interrupt)
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+        breaker.state, breaker.opened_at = CircuitBreaker.OPEN, 0.0
+        with pytest.raises(KeyboardInterrupt):
+            api_retry_base._guarded(interrupt)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert api_retry_base._guarded(lambda: "trial") == "trial"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @staticmethod
+    def test_hedged_request_returns_first_response(api_retry_base):
+        calls = []
+
+        class SlowFirstTransport(RequestsTransport):
+            def get(self, url, headers, params, timeout, stream=False):
+                calls.append(url)
+                response = requests.Response()
+                response.status_code = 200
+                if len(calls) == 1:
+                    time.sleep(0.5)
+                    response._content = b'{"request": "primary"}'
+                else:
+                    response._content = b'{"request": "hedged"}'
+                return response
+
+        api_retry_base.transport = SlowFirstTransport()
+        api_retry_base.hedge = True
+        api_retry_base.hedge_default_delay = 0.05
+        assert api_retry_base._query() == {"request": "hedged"}
+        assert ApiBase.stats["hedged"] == 1
+
+
+class TestCircuitBreaker:
+    @staticmethod
+    def test_states():
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+        breaker.failure()
+        breaker.before("scope")
+        breaker.failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before("scope")
+        time.sleep(0.06)
+        breaker.before("scope")
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before("scope")
+        breaker.success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestRetryPolicy:
+    @staticmethod
+    def test_delay_honors_retry_after():
+        policy = RetryPolicy(backoff=1, max_backoff=10)
+        assert policy.delay(0, "3") == 3
+        assert policy.delay(0, "100") == 10
+        assert 0 <= policy.delay(3) <= 8
+
+
+class TestTokenBucket:
+    @staticmethod
+    def test_acquire_waits_when_empty():
+        bucket = TokenBucket(rate=100, capacity=1)
+        assert bucket.acquire() == 0
+        assert bucket.acquire() > 0
+
 
 def test_find_method_returns_correct_data(api_find_base):
     with requests_mock.Mocker() as m:
@@ -94,3 +266,162 @@ class TestGenerateObjectsList:
         objects_list = generator.generate()
         assert len(objects_list) == 2
         assert all(isinstance(obj, JobObject) for obj in objects_list)
+
+
+class TestStreaming:
+    @staticmethod
+    def response_data():
+        return {
+            "items": [{"id": str(i), "name": f"Вакансия {i}", "tags": [i, {"k": None}]} for i in range(20)],
+            "found": 20,
+            "pages": 1,
+            "arguments": {"items": []}
+        }
+
+    def test_iter_json_items_yields_items_from_chunks(self):
+        data = self.response_data()
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        for size in (1, 7, 1024):
+            meta = {}
+            chunks = (raw[i:i + size] for i in range(0, len(raw), size))
+            assert list(iter_json_items(chunks, "items", meta)) == data["items"]
+            assert meta == {"found": 20, "pages": 1, "arguments": {"items": []}}
+
+    def test_iter_json_items_ijson(self):
+        pytest.importorskip("ijson")
+        data = self.response_data()
+        meta = {}
+        items = list(iter_json_items_ijson(io.BytesIO(json.dumps(data).encode()), "items", meta))
+        assert items == data["items"]
+        assert meta == {"found": 20, "pages": 1, "arguments": {"items": []}}
+
+    def test_find_stream_returns_generator(self, api_find_base):
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api/search", json=self.response_data(), status_code=200)
+            items = api_find_base.find(stream=True, text="python")
+            assert [item["id"] for item in items] == [str(i) for i in range(20)]
+
+    def test_stream_breaker_outcome_after_body(self, api_find_base):
+        ApiBase.reset_breakers()
+        breaker = api_find_base.get_breaker(api_find_base.breaker_scope)
+        breaker.state, breaker.opened_at = CircuitBreaker.OPEN, 0.0
+        class BrokenBody(io.BytesIO):
+            def read(self, *args, **kwargs):
+                # соединение обрывается вместо конца тела / the connection breaks instead of the body end
+                data = super().read(*args, **kwargs)
+                if not data:
+                    raise requests.exceptions.ChunkedEncodingError("connection broken")
+                return data
+
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api/search", body=BrokenBody(b'{"items": [{"id": "1"}, {"id": "2"}'))
+            items = api_find_base.find(stream=True, text="python")
+            with pytest.raises(requests.exceptions.ChunkedEncodingError):
+                list(items)
+            assert breaker.state == CircuitBreaker.OPEN
+            breaker.opened_at = 0.0
+            m.get("http://example.com/api/search", text='{"items": [{"id": "1"}, {"id"')
+            items = api_find_base.find(stream=True, text="python")
+            assert next(items) == {"id": "1"}
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            # ошибка разбора не считается сбоем сервиса / a parsing error is not a service failure
+            # ValueError или ijson.IncompleteJSONError / ValueError or ijson.IncompleteJSONError
+            with pytest.raises(Exception):
+                list(items)
+            assert breaker.state == CircuitBreaker.HALF_OPEN and not breaker.trial
+            breaker.opened_at = 0.0
+            m.get("http://example.com/api/search", json=self.response_data())
+            items = api_find_base.find(stream=True, text="python")
+            next(items)
+            items.close()
+        assert breaker.state == CircuitBreaker.CLOSED
+        ApiBase.reset_breakers()
+
+
+class TestTransport:
+    def test_accept_encoding_and_wire_bytes(self, api_retry_base):
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", text='{"success": true}', status_code=200)
+            assert api_retry_base._query() == {"success": True}
+            assert "gzip" in m.last_request.headers["Accept-Encoding"]
+        assert api_retry_base.last_wire_bytes == len('{"success": true}')
+        assert ApiBase.stats["wire_bytes"] == api_retry_base.last_wire_bytes
+        assert ApiBase.wire_bytes[api_retry_base.breaker_scope] == api_retry_base.last_wire_bytes
+
+    def test_conditional_get_returns_cached_data_on_304(self, api_retry_base):
+        ApiBase.conditional_cache.clear()
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", [
+                {"json": {"success": True}, "status_code": 200, "headers": {"ETag": '"v1"'}},
+                {"status_code": 304}
+            ])
+            assert api_retry_base._query() == {"success": True}
+            assert api_retry_base._query() == {"success": True}
+            assert m.last_request.headers["If-None-Match"] == '"v1"'
+        assert ApiBase.stats["not_modified"] == 1
+
+    def test_conditional_cache_returns_copies(self, api_retry_base):
+        ApiBase.conditional_cache.clear()
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/api", [
+                {"json": {"items": [1]}, "status_code": 200, "headers": {"ETag": '"v1"'}},
+                {"status_code": 304},
+                {"status_code": 304}
+            ])
+            api_retry_base._query()["items"].append(2)
+            api_retry_base._query()["items"].append(3)
+            assert api_retry_base._query() == {"items": [1]}
+
+    def test_requests_session_per_thread(self):
+        transport = RequestsTransport()
+        assert transport.session is transport.session
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(lambda: transport.session).result() is not transport.session
+
+    def test_chunks_reader(self):
+        reader = ChunksReader([b"ab", b"cde", b"f"])
+        assert reader.read(3) == b"abc"
+        assert reader.read() == b"def"
+        assert reader.read(1) == b""
+
+    def test_httpx_transport(self, api_retry_base):
+        httpx = pytest.importorskip("httpx")
+        transport = HttpxTransport(http2=False)
+        transport.client = httpx.Client(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"query": request.url.params.get("text")})
+        ))
+        api_retry_base.transport = transport
+        api_retry_base.parameters = {"text": "python", "area": None}
+        assert api_retry_base._query() == {"query": "python"}
+        assert api_retry_base.last_wire_bytes > 0
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_requests_share_one_call(self, api_retry_base):
+        calls = []
+
+        class SlowTransport(RequestsTransport):
+            def get(self, url, headers, params, timeout, stream=False):
+                calls.append(params)
+                time.sleep(0.2)
+                response = requests.Response()
+                response.status_code = 200
+                response._content = b'{"id": "1"}'
+                return response
+
+        ApiBase.transport, transport = SlowTransport(), ApiBase.transport
+        try:
+            apis = [ApiInfoBase("http://example.com/api/info", "1") for _ in range(5)]
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                results = list(executor.map(lambda api: api.info(id_="1"), apis))
+        finally:
+            ApiBase.transport = transport
+        assert len(calls) == 1
+        assert results == [{"id": "1"}] * 5
+        assert ApiBase.stats["coalesced"] == 4
+
+    def test_error_is_shared_and_not_cached(self):
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            flight.do("key", lambda: (_ for _ in ()).throw(ValueError()))
+        assert flight.do("key", lambda: 1) == (1, False)
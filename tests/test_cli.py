@@ -0,0 +1,99 @@
+import io
+import json
+import pytest
+from src.api_parser import ApiBase, RetryPolicy
+from src.cli import Progress, main, open_db, parse_args, query_parameters
+from src.load_test import mock_scopes
+from src.mock_server import MockHHServer, make_vacancy
+from src.utils import ReadData
+
+
+@pytest.fixture
+def server():
+    with MockHHServer(vacancies=150, employers=5, seed=1) as server:
+        with mock_scopes(server.url):
+            yield server
+
+
+@pytest.fixture
+def options(tmp_path):
+    return ["--db", str(tmp_path / "db"), "--checkpoints", str(tmp_path / "checkpoints.json"), "--quiet"]
+
+
+class TestProgress:
+    def test_log_output_is_throttled(self):
+        stream = io.StringIO()
+        progress = Progress(stream, interval=60)
+        for done in range(1, 11):
+            progress("pages", done, 10)
+        assert stream.getvalue() == "pages: 1/10\npages: 10/10\n"
+
+    def test_quiet(self):
+        stream = io.StringIO()
+        progress = Progress(stream, quiet=True)
+        progress("pages", 1, 1)
+        progress.message("done")
+        assert stream.getvalue() == ""
+
+
+class TestCli:
+    def test_query_parameters_skip_empty(self):
+        args = parse_args(["harvest", "--text", "python", "--only-with-salary"])
+        assert query_parameters(args) == {"text": "python", "only_with_salary": True}
+
+    def test_harvest_enrich_export_stats(self, server, options, tmp_path, capsys):
+        assert main(options + ["harvest", "--text", "python", "--enrich"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"harvested": 150, "truncated": 0, "enriched": 5, "errors": 0}
+        assert main(options + ["enrich"]) == 0
+        assert json.loads(capsys.readouterr().out)["enriched"] == 0
+
+        output = tmp_path / "vacancies.ndjson"
+        assert main(options + ["export", "-o", str(output)]) == 0
+        lines = output.read_text().splitlines()
+        assert len(lines) == 150
+        assert json.loads(lines[0])["employer_name"]
+        # Россия (113) с вложенными локациями, без Алматы / Russia (113) with nested areas, without Almaty
+        assert main(options + ["export", "-o", str(output), "--area", "113"]) == 0
+        assert len(output.read_text().splitlines()) == 120
+
+        assert main(options + ["texts", "--processes", "2"]) == 0
+        assert json.loads(capsys.readouterr().out.splitlines()[-1]) == {"texts": 5}
+
+        assert main(options + ["stats"]) == 0
+        stats = json.loads(capsys.readouterr().out.splitlines()[-1])
+        assert stats["tables"]["vacancy"]["records"] == 150
+        # справочники из /areas и /dictionaries, а не из вакансий / references from /areas and /dictionaries
+        assert stats["tables"]["area"]["records"] == 7
+        assert stats["tables"]["employer_sync"]["records"] == 5
+        assert stats["tables"]["description_text"]["records"] > 0
+        assert stats["checkpoints"] == 1
+
+    def test_export_to_stdout(self, options, tmp_path, capsys):
+        assert main(options + ["export", "--format", "csv"]) == 0
+        assert capsys.readouterr().out.startswith("id,name,")
+        with pytest.raises(SystemExit):
+            parse_args(["export", "--format", "parquet"])
+
+    def test_import_dump(self, options, tmp_path, capsys):
+        dump = tmp_path / "dump.ndjson"
+        dump.write_text(json.dumps({"items": [make_vacancy(i, employers=3) for i in range(20)]}) + "\n")
+        assert main(options + ["import", str(dump), "--batch-size", "8"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["imported"] == 20 and report["tables"]["employer"] == 3
+        assert main(options + ["dedup"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"assigned": 20, "clusters": 20, "duplicates": 0}
+
+    def test_import_bad_dump_exit_code(self, options, tmp_path, capsys):
+        assert main(options + ["import", str(tmp_path / "missing.ndjson")]) == 1
+        dump = tmp_path / "dump.json"
+        dump.write_text('{"found": 0,\n "pages": 0}')
+        assert main(options + ["import", str(dump)]) == 1
+        assert "Key «items» not found" in capsys.readouterr().err
+
+    def test_api_error_exit_code(self, options, monkeypatch):
+        monkeypatch.setattr(ApiBase, "retry_policy", RetryPolicy(retries=1, backoff=0))
+        ApiBase.reset_breakers()
+        with MockHHServer(error_rate=1.0, seed=1) as server, mock_scopes(server.url):
+            assert main(options + ["harvest", "--text", "python"]) == 1
+        assert ReadData(open_db(options[1])).get_vacancy() == []
+        ApiBase.reset_breakers()
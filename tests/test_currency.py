@@ -0,0 +1,91 @@
+import pytest
+from src.api_errors import ApiQueryError
+from src.currency import CurrencyRates
+from src.hh_parser import HHGenerateVacanciesList, HHSalary
+from src.mock_server import make_vacancy
+from src.user_interface import UserInterface
+
+
+CURRENCIES = [
+    {"code": "RUR", "abbr": "₽", "name": "Рубли", "rate": 1.0},
+    {"code": "USD", "abbr": "$", "name": "Доллары", "rate": 0.01},
+    {"code": "KZT", "abbr": "₸", "name": "Тенге", "rate": 5.0}
+]
+
+
+class FakeCache:
+    def __init__(self, currencies=None, error=None):
+        self.currencies = currencies
+        self.error = error
+
+    def items(self, dictionary):
+        if self.error:
+            raise self.error
+        return self.currencies
+
+
+@pytest.fixture
+def rates():
+    return CurrencyRates.from_dictionaries(CURRENCIES)
+
+
+@pytest.fixture(autouse=True)
+def uninstall():
+    yield
+    CurrencyRates.uninstall()
+
+
+class TestCurrencyRates:
+    def test_to_base_currency(self, rates):
+        assert rates.to_base_currency([100, 1000, None, 10], ["USD", "KZT", "USD", "EUR"]) == [10000, 200, None, None]
+
+    def test_normalize_orders_mixed_currencies(self, rates):
+        usd = HHSalary(from_=1000, to=None, currency="USD")
+        rub = HHSalary(from_=50000, to=70000, currency="RUR")
+        kzt = HHSalary(from_=None, to=400000, currency="KZT")
+        assert sorted([usd, rub, kzt]) == [usd, rub, kzt]
+        rates.normalize([usd, rub, kzt, None])
+        assert sorted([usd, rub, kzt]) == [rub, kzt, usd]
+
+    def test_unknown_currency_sorts_last(self, rates):
+        eur = HHSalary(from_=10, to=None, currency="EUR")
+        usd = HHSalary(from_=1000, to=None, currency="USD")
+        rub = HHSalary(from_=50000, to=None, currency="RUR")
+        rates.normalize([eur, usd, rub])
+        assert sorted([eur, usd, rub]) == [rub, usd, eur]
+        assert not eur.known and usd.known
+        assert "known" not in eur.get_dict()
+
+    def test_install_converts_new_salaries(self, rates):
+        rates.install()
+        assert HHSalary(from_=1000, to=None, currency="USD") > HHSalary(from_=90000, to=None, currency="RUR")
+        assert "_key" not in HHSalary(from_=1000, to=None, currency="USD").get_dict()
+
+    def test_average(self, rates):
+        salaries = [HHSalary(from_=100, to=300, currency="USD"), HHSalary(from_=10000, to=None, currency="RUR"), None]
+        assert rates.average(salaries) == 15000
+
+    def test_load_saves_rates_and_falls_back_to_file_offline(self, tmp_path):
+        path = str(tmp_path / "rates.json")
+        assert CurrencyRates.load(FakeCache(CURRENCIES), path).rates["USD"] == 0.01
+        offline = CurrencyRates.load(FakeCache(error=ApiQueryError("Connection error")), path)
+        assert offline.to_base_currency([1], ["USD"]) == [100]
+
+
+class TestUserInterfaceSalarySort:
+    def test_local_vacancies_sorted_by_base_currency(self, rates, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.user_interface.DB_DIR", str(tmp_path / "db"))
+        monkeypatch.setattr(CurrencyRates, "load", classmethod(lambda cls: rates))
+        salaries = [("RUR", 90000), ("USD", 1000), ("EUR", 10), None, ("RUR", 50000)]
+        items = [
+            make_vacancy(i, employers=3) | {
+                "salary": {"from": salary[1], "to": None, "currency": salary[0], "gross": False} if salary else None
+            }
+            for i, salary in enumerate(salaries)
+        ]
+        ui = UserInterface()
+        ui.write_data.add_vacancies(HHGenerateVacanciesList(items).generate())
+        assert [vacancy.id_ for vacancy, _ in ui.local_vacancies()] == ["0", "1", "2", "3", "4"]
+        ui.sort_by_salary = True
+        assert [vacancy.id_ for vacancy, _ in ui.local_vacancies()] == ["1", "0", "4", "2", "3"]
+        assert ui.currency_rates is rates and HHSalary.rates is rates
@@ -1,7 +1,7 @@
 import pytest
 import json
 import os
-from src.data_base import JsonDB
+from src.data_base import JsonDB, JsonLinesDB, schema_validator
 
 
 class TestJsonDB:
@@ -116,3 +116,135 @@ class TestJsonDB:
         db.create_area(area_name, fields)
         with pytest.raises(TypeError):
             db.add_value(area_name, {"id": "one", "name": "Test"})
+
+    def test_schema_validator_is_compiled_once(self, capsys):
+        fields = {"id": "INTEGER NOT NULL", "name": "TEXT"}
+        validate = schema_validator(fields)
+        assert schema_validator(dict(fields)) is validate
+        validate({"id": 1, "name": None})
+        validate({"id": True, "name": "Test"})
+        with pytest.raises(TypeError, match="Fields"):
+            validate({"id": 1})
+        with pytest.raises(TypeError, match="name"):
+            validate({"id": 1, "name": 2})
+        validate.check_field("name", None)
+        with pytest.raises(TypeError, match="id"):
+            validate.check_field("id", None)
+        with pytest.raises(TypeError, match="Fields"):
+            validate.check_field("missing", 1)
+        assert capsys.readouterr().out == ""
+
+    def test_update_value_checks_type(self, setup_jsondb):
+        db, _ = setup_jsondb
+        db.create_area("test_area", {"id": "INTEGER", "name": "TEXT"})
+        db.add_value("test_area", {"id": 1, "name": "Test"})
+        with pytest.raises(TypeError):
+            db.update_value("test_area", "name", 1, "id", 1)
+        with pytest.raises(TypeError):
+            db.update_value("test_area", "missing", "x", "id", 1)
+        assert db.select_value("test_area") == [{"id": 1, "name": "Test"}]
+
+    def test_upsert_updates_changed_fields_by_key(self, setup_jsondb):
+        db, db_path = setup_jsondb
+        area_name = "test_area"
+        db.create_area(area_name, {"id": "INTEGER", "name": "TEXT"})
+        assert db.upsert(area_name, {"id": 1, "name": "Test"}, ["id"]) == {"id": 1, "name": "Test"}
+        assert db.upsert(area_name, {"id": 1, "name": "Test"}, ["id"]) == {}
+        assert db.upsert(area_name, {"id": 1, "name": "Updated"}, ["id"]) == {"name": "Updated"}
+        assert db.upsert(area_name, {"id": 1, "name": None}, ["id"], skip_none=True) == {}
+        assert db.select_value(area_name) == [{"id": 1, "name": "Updated"}]
+
+
+class TestJsonLinesDB:
+    @pytest.fixture
+    def setup_jsonlinesdb(self, tmp_path):
+        db_path = tmp_path / "testdb"
+        db = JsonLinesDB(str(db_path))
+        db.create_area("test_area", {"id": "TEXT NOT NULL", "name": "TEXT"})
+        return db, db_path
+
+    def test_create_area_creates_data_and_index_files(self, setup_jsonlinesdb):
+        db, db_path = setup_jsonlinesdb
+        assert (db_path / "test_area.jsonl").exists()
+        assert (db_path / "test_area.idx").exists()
+        with pytest.raises(FileExistsError):
+            db.create_area("test_area", {"id": "TEXT NOT NULL"})
+
+    def test_select_by_id_uses_index(self, setup_jsonlinesdb):
+        db, db_path = setup_jsonlinesdb
+        for i in range(50):
+            db.add_value("test_area", {"id": str(i), "name": f"Test{i}"})
+        assert os.path.getsize(db_path / "test_area.idx") == 0
+        assert os.path.getsize(db_path / "test_area.idx.delta") == 50 * JsonLinesDB.index_entry.size
+        assert db.select_value("test_area", {"key": "id", "value": "42"}) == [{"id": "42", "name": "Test42"}]
+        assert db.select_value("test_area", {"key": "id", "value": "100"}) == []
+        assert db.select_value("test_area", {"key": "name", "value": "Test7"}) == [{"id": "7", "name": "Test7"}]
+        assert len(db.select_value("test_area")) == 50
+
+    def test_index_delta_is_merged_at_limit(self, setup_jsonlinesdb, monkeypatch):
+        db, db_path = setup_jsonlinesdb
+        monkeypatch.setattr(JsonLinesDB, "index_delta_limit", 8)
+        for i in range(20):
+            db.add_value("test_area", {"id": str(i), "name": f"Test{i}"})
+        assert os.path.getsize(db_path / "test_area.idx") == 16 * JsonLinesDB.index_entry.size
+        assert os.path.getsize(db_path / "test_area.idx.delta") == 4 * JsonLinesDB.index_entry.size
+        assert all(db.select_value("test_area", {"key": "id", "value": str(i)}) for i in range(20))
+
+    def test_missing_or_stale_index_is_rebuilt(self, setup_jsonlinesdb):
+        db, db_path = setup_jsonlinesdb
+        db.add_value("test_area", {"id": "1", "name": "Test"})
+        os.remove(db_path / "test_area.idx")
+        assert db.select_value("test_area", {"key": "id", "value": "1"}) == [{"id": "1", "name": "Test"}]
+        os.remove(db_path / "test_area.idx")
+        db.add_value("test_area", {"id": "2", "name": "Test2"})
+        with open(db_path / "test_area.jsonl", 'ab') as file:
+            file.write(JsonLinesDB.encode_record({"id": "3", "name": "Test3"}))
+        os.utime(db_path / "test_area.idx.delta", ns=(0, 0))
+        os.utime(db_path / "test_area.idx", ns=(0, 0))
+        assert db.select_value("test_area", {"key": "id", "value": "3"}) == [{"id": "3", "name": "Test3"}]
+        assert db.select_value("test_area", {"key": "id", "value": "2"}) == [{"id": "2", "name": "Test2"}]
+        assert not (db_path / "test_area.idx.delta").exists()
+
+    def test_add_value_skips_duplicates(self, setup_jsonlinesdb):
+        db, _ = setup_jsonlinesdb
+        db.add_value("test_area", {"id": "1", "name": "Test"})
+        db.add_value("test_area", {"id": "1", "name": "Test"})
+        assert len(db.select_value("test_area")) == 1
+        with pytest.raises(TypeError):
+            db.add_value("test_area", {"id": 1, "name": "Test"})
+
+    def test_update_and_delete_rebuild_index(self, setup_jsonlinesdb):
+        db, _ = setup_jsonlinesdb
+        db.add_value("test_area", {"id": "1", "name": "Test"})
+        db.add_value("test_area", {"id": "2", "name": "Test2"})
+        db.update_value("test_area", "name", "Updated Test", "id", "1")
+        assert db.select_value("test_area", {"key": "id", "value": "1"}) == [{"id": "1", "name": "Updated Test"}]
+        db.delete_value("test_area", "id", "1")
+        assert db.select_value("test_area", {"key": "id", "value": "1"}) == []
+        assert db.select_value("test_area", {"key": "id", "value": "2"}) == [{"id": "2", "name": "Test2"}]
+
+    def test_upsert_updates_changed_fields_by_key(self, setup_jsonlinesdb):
+        db, _ = setup_jsonlinesdb
+        db.add_value("test_area", {"id": "1", "name": "Test"})
+        assert db.upsert("test_area", {"id": "2", "name": "Test2"}, ["id"]) == {"id": "2", "name": "Test2"}
+        assert db.upsert("test_area", {"id": "1", "name": "Updated"}, ["id"]) == {"name": "Updated"}
+        assert db.upsert("test_area", {"id": "1", "name": "Updated"}, ["id"]) == {}
+        assert db.select_value("test_area", {"key": "id", "value": "1"}) == [{"id": "1", "name": "Updated"}]
+        assert len(db.select_value("test_area")) == 2
+
+    def test_upsert_many_appends_and_updates(self, setup_jsonlinesdb):
+        db, _ = setup_jsonlinesdb
+        db.add_value("test_area", {"id": "1", "name": "Test"})
+        records = [{"id": "1", "name": "Test"}, {"id": "2", "name": "Test2"}]
+        assert db.upsert_many("test_area", records, ["id"]) == [{}, {"id": "2", "name": "Test2"}]
+        assert db.upsert_many("test_area", [{"id": "2", "name": "New"}], ["id"]) == [{"name": "New"}]
+        assert db.select_value("test_area", {"key": "id", "value": "2"}) == [{"id": "2", "name": "New"}]
+        assert len(db.select_value("test_area")) == 2
+
+    def test_delete_area_removes_index(self, setup_jsonlinesdb):
+        db, db_path = setup_jsonlinesdb
+        db.delete_area("test_area")
+        assert not (db_path / "test_area.jsonl").exists()
+        assert not (db_path / "test_area.idx").exists()
+        with pytest.raises(FileNotFoundError):
+            db.select_value("test_area")
@@ -0,0 +1,114 @@
+import pytest
+from src.dedup import VacancyDeduplicator
+from src.hh_parser import HHGenerateVacanciesList
+from src.importer import HHImporter
+from src.mock_server import make_vacancy
+from src.user_interface import UserInterface
+from src.utils import WriteData, ReadData
+
+DESCRIPTION = (
+    "<p>Ищем Python-разработчика в команду платформы данных. Задачи: разработка сервисов на FastAPI, "
+    "проектирование схем PostgreSQL, очереди Kafka, ревью кода и наставничество.</p>"
+    "<p>Требования: опыт коммерческой разработки от трех лет, asyncio, SQLAlchemy, Docker, CI.</p>"
+    "<p>Условия: удаленная работа, гибкий график, ДМС, обучение за счет компании.</p>"
+)
+OTHER_DESCRIPTION = (
+    "<p>Требуется бухгалтер на первичную документацию. Работа с 1С, сверка с контрагентами, "
+    "подготовка отчетности в налоговую, офис в центре города.</p>"
+)
+
+
+def vacancy(id_: str, name: str = "Python-разработчик", employer_id: str = "1", description: str = None) -> dict:
+    return {
+        "id": id_,
+        "name": name,
+        "alternate_url": f"https://hh.ru/vacancy/{id_}",
+        "published_at": "2024-06-01T10:00:00+0300",
+        "created_at": "2024-06-01T10:00:00+0300",
+        "employer_id": employer_id,
+        "area_id": id_,
+        "experience_id": "between1And3",
+        "employment_id": "full",
+        "schedule_id": "remote",
+        "description": description
+    }
+
+
+class TestVacancyDeduplicator:
+    def test_exact_key_normalizes_name(self, db):
+        dedup = VacancyDeduplicator(db)
+        salary = {"from": 100000, "to": None, "currency": "RUR"}
+        assert dedup.exact_key(vacancy("1", "Python-разработчик (Ёлка)"), salary) == \
+            dedup.exact_key(vacancy("2", "python разработчик  ёлка"), salary)
+        assert dedup.exact_key(vacancy("1"), salary) != dedup.exact_key(vacancy("1"), None)
+        assert dedup.exact_key(vacancy("1", employer_id=None), salary) is None
+
+    def test_exact_and_near_duplicates(self, db):
+        dedup = VacancyDeduplicator(db)
+        clusters = dedup.add([
+            vacancy("1", description=DESCRIPTION),
+            vacancy("2", "PYTHON-РАЗРАБОТЧИК"),
+            vacancy("3", "Backend developer", employer_id="2", description=DESCRIPTION + "<p>Офис в Москве.</p>"),
+            vacancy("4", "Бухгалтер", description=OTHER_DESCRIPTION),
+            vacancy("5", "Python-разработчик", employer_id="3")
+        ])
+        assert clusters == {"1": "1", "2": "1", "3": "1", "4": "4", "5": "5"}
+        assert dedup.clusters() == {"1": ["1", "2", "3"], "4": ["4"], "5": ["5"]}
+
+    def test_incremental_assignment_is_persisted(self, db):
+        VacancyDeduplicator(db).add([vacancy("1", description=DESCRIPTION), vacancy("2")])
+        dedup = VacancyDeduplicator(db)
+        assert dedup.cluster_of("2") == "1"
+        assert dedup.add([vacancy("3", "Data engineer", "9", DESCRIPTION)]) == {"3": "1"}
+        # у сохраненной вакансии добавляется сигнатура, кластер не меняется / a saved vacancy keeps its cluster
+        assert dedup.add([vacancy("2", description=OTHER_DESCRIPTION)]) == {"2": "1"}
+        records = ReadData(db).get_vacancy_cluster({"key": "vacancy_id", "value": "2"})
+        assert records[0]["cluster_id"] == "1" and records[0]["signature"]
+        assert len(ReadData(db).get_vacancy_cluster()) == 3
+
+    def test_bands_must_divide_signature(self, db):
+        with pytest.raises(ValueError):
+            VacancyDeduplicator(db, num_perm=64, bands=10)
+
+
+class TestDedupIngest:
+    def test_write_data_assigns_clusters(self, db):
+        items = [make_vacancy(i, employers=3) for i in range(6)]
+        items.append(items[0] | {"id": "100", "area": {"id": "2", "name": "Санкт-Петербург", "url": ""}})
+        dedup = VacancyDeduplicator(db)
+        write_data = WriteData(db, dedup=dedup)
+        write_data.add_vacancies(HHGenerateVacanciesList(items[:3]).generate())
+        for vacancy_ in HHGenerateVacanciesList(items[3:]).generate():
+            write_data.add_vacancy(vacancy_)
+        assert dedup.cluster_of("100") == "0"
+        assert len(dedup.clusters()) == 6
+
+    def test_populate_after_import(self, db):
+        items = [make_vacancy(i, employers=3) for i in range(4)] + [make_vacancy(0, employers=3) | {"id": "10"}]
+        importer = HHImporter(db)
+        importer.import_items(items)
+        importer.write()
+        dedup = VacancyDeduplicator(db)
+        assert dedup.populate() == 5
+        assert dedup.populate() == 0
+        assert dedup.cluster_of("10") == "0"
+        importer = HHImporter(db, dedup=dedup)
+        importer.import_items([make_vacancy(1, employers=3) | {"id": "11"}])
+        importer.write()
+        assert VacancyDeduplicator(db).cluster_of("11") == "1"
+
+
+class TestUserInterfaceClusters:
+    def test_clusters_are_assigned_once_per_write(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.user_interface.DB_DIR", str(tmp_path / "db"))
+        ui = UserInterface()
+        items = [make_vacancy(i, employers=3) for i in range(3)] + [make_vacancy(0, employers=3) | {"id": "10"}]
+        for vacancy_ in HHGenerateVacanciesList(items).generate():
+            ui.write_data.add_vacancy(vacancy_)
+        assert ui.write_data.dedup is None
+        assert ReadData(ui.db).get_vacancy_cluster() == []
+        assert ui.vacancy_clusters["10"] == "0"
+        monkeypatch.setattr(ui.dedup, "populate", lambda: pytest.fail("populate must not run again"))
+        assert ui.vacancy_clusters["10"] == "0"
+        ui.vacancies_saved()
+        assert "vacancy_clusters" not in vars(ui)
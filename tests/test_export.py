@@ -0,0 +1,58 @@
+import csv
+import json
+import pytest
+from src.export import export_vacancies, VacancyRows
+from src.hh_parser import HHGenerateVacanciesList
+from src.mock_server import make_vacancy
+from src.utils import WriteData
+
+
+@pytest.fixture
+def db(db):
+    items = [
+        make_vacancy(i, employers=1, full=True,
+                     salary={"from": 1000 * i, "to": None, "currency": "RUR", "gross": True} if i % 2 else None)
+        for i in range(25)
+    ]
+    write_data = WriteData(db)
+    for vacancy in HHGenerateVacanciesList(items).generate():
+        write_data.add_vacancy(vacancy)
+    return db
+
+
+class TestExport:
+    def test_rows_are_denormalized(self, db):
+        rows = {row["id"]: row for row in VacancyRows(db)}
+        assert len(rows) == 25
+        assert rows["3"]["salary_from"] == 3000 and rows["3"]["salary_currency"] == "RUR"
+        assert rows["2"]["salary_from"] is None
+        assert rows["2"]["area_name"] == "Новосибирск"
+        assert rows["2"]["schedule_name"] == "Гибкий график"
+        assert rows["2"]["employer_name"] == "Компания 0"
+        assert "description" not in rows["2"]
+
+    def test_ndjson_in_chunks(self, db, tmp_path):
+        path = tmp_path / "vacancies.ndjson"
+        assert export_vacancies(db, str(path), chunk_size=10, description=True) == 25
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(rows) == 25
+        assert rows[0]["description"].startswith("<p>")
+
+    def test_csv(self, db, tmp_path):
+        path = tmp_path / "vacancies.csv"
+        assert export_vacancies(db, str(path), "csv", chunk_size=7) == 25
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == 25
+        assert rows[0]["experience_name"] == "Нет опыта"
+
+    @pytest.mark.parametrize("format_", ["parquet", "arrow"])
+    def test_parquet_and_arrow(self, db, tmp_path, format_):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+        import pyarrow.parquet
+        path = str(tmp_path / f"vacancies.{format_}")
+        assert export_vacancies(db, path, format_, chunk_size=10) == 25
+        table = pyarrow.parquet.read_table(path) if format_ == "parquet" else pyarrow.ipc.open_file(path).read_all()
+        assert table.num_rows == 25
+        assert table.schema.field("salary_from").type == pyarrow.int64()
@@ -0,0 +1,60 @@
+import random
+import pytest
+from src.geo import GridIndex, haversine
+
+
+@pytest.fixture
+def points():
+    rnd = random.Random(1)
+    return {str(i): (rnd.uniform(54, 57), rnd.uniform(36, 39)) for i in range(500)}
+
+
+@pytest.fixture
+def index(points):
+    index = GridIndex(0.1)
+    for id_, (lat, lng) in points.items():
+        index.insert(id_, lat, lng)
+    return index
+
+
+class TestGridIndex:
+    def test_bbox_matches_linear_scan(self, index, points):
+        expected = {id_ for id_, (lat, lng) in points.items() if 55 <= lat <= 56 and 37 <= lng <= 37.5}
+        assert set(index.bbox(56, 55, 37, 37.5)) == expected
+
+    def test_nearest_matches_linear_scan(self, index, points):
+        for lat, lng in [(55.75, 37.61), (60.0, 30.0), (54.0, 36.0)]:
+            expected = sorted(points, key=lambda id_: haversine(lat, lng, *points[id_]))[:5]
+            assert [id_ for id_, _ in index.nearest(lat, lng, 5)] == expected
+
+    def test_insert_moves_and_remove(self, index):
+        index.insert("0", 10.0, 10.0)
+        assert index.bbox(11, 9, 9, 11) == ["0"]
+        index.remove("0")
+        assert index.bbox(11, 9, 9, 11) == []
+        assert len(index) == 499
+
+    def test_bbox_and_nearest_across_antimeridian(self, points):
+        index = GridIndex(0.5)
+        # точки в Москве занимают ячейки, поэтому поиск ближайших идет по кольцам
+        # points in Moscow occupy cells, so nearest search goes through rings
+        for id_, (lat, lng) in points.items():
+            index.insert(f"m{id_}", lat, lng)
+        for id_, lat, lng in [("1", 64.7, 177.5), ("2", 65.0, -179.9), ("3", 66.0, 190.0), ("4", 53.0, 158.6)]:
+            index.insert(id_, lat, lng)
+        assert index.points["3"] == (66.0, -170.0)
+        assert sorted(index.bbox(67, 64, 175, -175)) == ["1", "2"]
+        assert sorted(index.bbox(67, 64, 175, 185)) == ["1", "2"]
+        assert sorted(index.bbox(67, 52, 150, 200)) == ["1", "2", "3", "4"]
+        assert len(index.bbox(67, 52, -180, 180)) == 504
+        assert index.bbox(67, 64, -175, 175) == ["3"]
+        assert index.nearest(65.0, 179.9, 1)[0][0] == "2"
+        assert [id_ for id_, _ in index.nearest(65.0, 179.9, 2)] == ["2", "1"]
+
+    def test_from_records_skips_missing_coordinates(self):
+        index = GridIndex.from_records([
+            {"vacancy_id": "1", "lat": 55.75, "lng": 37.61},
+            {"vacancy_id": "2", "lat": None, "lng": None}
+        ])
+        assert len(index) == 1
+        assert index.nearest(55.7, 37.6, 3)[0][0] == "1"
@@ -0,0 +1,207 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock
+from src.data_base import JsonDB
+from src.utils import CreateDB, ReadData
+from src.mock_server import make_vacancy
+from src.harvester import CheckpointStore, HHHarvester, HHQuerySplitter, MAX_RESULTS
+from src.api_errors import ApiQueryError
+from src.reference import ReferenceCache
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = JsonDB(str(tmp_path / "testdb"))
+    CreateDB(db)
+    return db
+
+
+@pytest.fixture
+def checkpoints(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.json"))
+
+
+class TestCheckpointStore:
+    def test_query_key_ignores_order_and_empty_parameters(self):
+        assert (CheckpointStore.query_key({"text": "python", "area": "1", "salary": None})
+                == CheckpointStore.query_key({"area": "1", "text": "python"}))
+
+    def test_set_and_get_watermark(self, checkpoints):
+        assert checkpoints.get({"text": "python"}) is None
+        checkpoints.set({"text": "python"}, "2024-01-01T00:00:00+00:00")
+        assert checkpoints.get({"text": "python"}) == "2024-01-01T00:00:00+00:00"
+
+
+class TestHHHarvester:
+    def test_harvest_saves_vacancies_and_watermark(self, db, checkpoints):
+        finder = MagicMock()
+        finder.find.return_value = {
+            "items": [
+                make_vacancy(1, employers=1, published_at="2024-01-02T10:00:00+00:00"),
+                make_vacancy(2, employers=1, published_at="2024-01-03T10:00:00+00:00")
+            ],
+            "found": 2,
+            "pages": 1
+        }
+        harvester = HHHarvester(db, checkpoints, HHQuerySplitter(finder_factory=lambda: finder))
+        date_to = datetime.datetime(2024, 1, 4, tzinfo=datetime.timezone.utc)
+        assert harvester.harvest(date_to=date_to, text="python", page=5) == 2
+        assert len(ReadData(db).get_vacancy()) == 2
+        assert checkpoints.get({"text": "python"}) == "2024-01-03T10:00:00+00:00"
+        assert "page" not in checkpoints.load()[CheckpointStore.query_key({"text": "python"})]["parameters"]
+        # следующий запуск начинается с контрольной точки
+        harvester.harvest(date_to=date_to, text="python")
+        assert finder.find.call_args.kwargs["date_from"] == "2024-01-03T10:00:00+00:00"
+
+    def test_naive_date_to_is_utc_and_vacancies_are_written_in_batches(self, db, checkpoints):
+        finder = MagicMock()
+        finder.find.return_value = {
+            "items": [make_vacancy(i, employers=1, published_at=f"2024-01-0{i}T10:00:00+00:00") for i in range(1, 4)],
+            "found": 3,
+            "pages": 1
+        }
+        harvester = HHHarvester(db, checkpoints, HHQuerySplitter(finder_factory=lambda: finder), batch_size=2)
+        progress = MagicMock()
+        with pytest.MonkeyPatch.context() as patch:
+            add_vacancies = MagicMock(wraps=harvester.write_data.add_vacancies)
+            patch.setattr(harvester.write_data, "add_vacancies", add_vacancies)
+            assert harvester.harvest(date_to=datetime.datetime(2024, 1, 4), progress=progress, text="python") == 3
+        assert [len(call.args[0]) for call in add_vacancies.call_args_list] == [2, 1]
+        assert finder.find.call_args.kwargs["date_to"] == "2024-01-04T00:00:00+00:00"
+        progress.assert_any_call("write", 3, 3)
+        assert len(ReadData(db).get_vacancy()) == 3
+        assert checkpoints.get({"text": "python"}) == "2024-01-03T10:00:00+00:00"
+
+    def test_watermark_does_not_pass_truncated_window(self, db, checkpoints):
+        def find(**kwargs):
+            if kwargs["date_from"] >= "2024-01-03":
+                items = [make_vacancy(1, employers=1, published_at="2024-01-03T10:00:00+00:00")]
+                return {"items": items, "found": 1, "pages": 1}
+            items = [make_vacancy(2, employers=1, published_at="2024-01-02T10:00:00+00:00")]
+            return {"items": items, "found": 5000, "pages": 100}
+        finder = MagicMock()
+        finder.find.side_effect = find
+        splitter = HHQuerySplitter(finder_factory=lambda: finder, min_window=datetime.timedelta(days=2))
+        harvester = HHHarvester(db, checkpoints, splitter, initial_days=4)
+        harvester.harvest(date_to=datetime.datetime(2024, 1, 5, tzinfo=datetime.timezone.utc), text="python")
+        assert {part["date_from"] for part, _ in splitter.truncated} == {"2024-01-01T00:00:00+00:00"}
+        assert checkpoints.get({"text": "python"}) == "2024-01-01T00:00:00+00:00"
+
+    def test_references_are_populated_once_before_harvest(self, db, checkpoints, tmp_path):
+        finder = MagicMock()
+        finder.find.return_value = {
+            "items": [make_vacancy(1, employers=1, published_at="2024-01-02T10:00:00+00:00")], "found": 1, "pages": 1
+        }
+        references = MagicMock(spec=ReferenceCache)
+        harvester = HHHarvester(db, checkpoints, HHQuerySplitter(finder_factory=lambda: finder), references=references)
+        date_to = datetime.datetime(2024, 1, 4, tzinfo=datetime.timezone.utc)
+        harvester.harvest(date_to=date_to, text="python")
+        harvester.harvest(date_to=date_to, text="python")
+        references.populate.assert_called_once_with(db)
+        assert harvester.splitter.area_children == references.area_tree.return_value.children
+        assert not harvester.write_data.write_references
+        assert ReadData(db).get_area() == []
+
+    def test_unavailable_references_are_written_with_vacancies(self, db, checkpoints):
+        finder = MagicMock()
+        finder.find.return_value = {
+            "items": [make_vacancy(1, employers=1, published_at="2024-01-02T10:00:00+00:00")], "found": 1, "pages": 1
+        }
+        references = MagicMock(spec=ReferenceCache)
+        references.populate.side_effect = ApiQueryError("offline")
+        harvester = HHHarvester(db, checkpoints, HHQuerySplitter(finder_factory=lambda: finder), references=references)
+        harvester.harvest(date_to=datetime.datetime(2024, 1, 4, tzinfo=datetime.timezone.utc), text="python")
+        assert harvester.write_data.write_references
+        assert len(ReadData(db).get_area()) == 1
+
+
+class TestHHQuerySplitter:
+    @staticmethod
+    def finder(count: callable) -> MagicMock:
+        def find(**kwargs):
+            found = count(kwargs)
+            pages = min(-(-found // kwargs["per_page"]), MAX_RESULTS // kwargs["per_page"])
+            items = [
+                make_vacancy(
+                    i, employers=1, id=f"{kwargs}-{kwargs['page']}-{i}", published_at="2024-01-01T00:00:00+00:00"
+                )
+                for i in range(min(kwargs["per_page"], found))
+            ]
+            return {"items": items, "found": found, "pages": pages}
+
+        finder = MagicMock()
+        finder.find.side_effect = find
+        return finder
+
+    def test_partition_splits_dates_until_under_limit(self):
+        def count(kwargs):
+            days = (datetime.datetime.fromisoformat(kwargs["date_to"])
+                    - datetime.datetime.fromisoformat(kwargs["date_from"])).days
+            return days * 1500
+        finder = self.finder(count)
+        splitter = HHQuerySplitter(finder_factory=lambda: finder)
+        partitions = splitter.partition({
+            "experience": "noExperience",
+            "date_from": "2024-01-01T00:00:00+00:00",
+            "date_to": "2024-01-05T00:00:00+00:00"
+        })
+        assert len(partitions) == 4
+        assert all(first_page["found"] <= MAX_RESULTS for _, first_page in partitions)
+        assert partitions[0][0]["date_from"] == "2024-01-01T00:00:00+00:00"
+        assert partitions[-1][0]["date_to"] == "2024-01-05T00:00:00+00:00"
+
+    def test_partition_splits_by_experience_and_area_first(self):
+        def count(kwargs):
+            if kwargs.get("area") in ("2", "3"):
+                return 1500
+            return 3000
+        finder = self.finder(count)
+        splitter = HHQuerySplitter(
+            finder_factory=lambda: finder,
+            area_children=lambda area: ["2", "3"] if area == "1" else []
+        )
+        partitions = splitter.partition({"area": "1"})
+        assert len(partitions) == 8
+        assert {(part["experience"], part["area"]) for part, _ in partitions} == {
+            (experience, area) for experience in ("noExperience", "between1And3", "between3And6", "moreThan6")
+            for area in ("2", "3")
+        }
+
+    def test_parent_area_with_own_vacancies_is_split_by_dates(self):
+        def count(kwargs):
+            days = (datetime.datetime.fromisoformat(kwargs["date_to"])
+                    - datetime.datetime.fromisoformat(kwargs["date_from"])).days
+            # 500 вакансий в день привязаны к самой локации "1" / 500 vacancies a day are attached to area "1" itself
+            return days * (1500 if kwargs.get("area") == "1" else 500)
+        finder = self.finder(count)
+        splitter = HHQuerySplitter(finder_factory=lambda: finder, area_children=lambda area: ["2", "3"])
+        partitions = splitter.partition({
+            "area": "1",
+            "experience": "noExperience",
+            "date_from": "2024-01-01T00:00:00+00:00",
+            "date_to": "2024-01-03T00:00:00+00:00"
+        })
+        assert {part["area"] for part, _ in partitions} == {"1"}
+        assert sum(first_page["found"] for _, first_page in partitions) == 3000
+        assert splitter.truncated == []
+
+    def test_unsplittable_partition_is_reported(self):
+        finder = self.finder(lambda kwargs: 5000)
+        splitter = HHQuerySplitter(finder_factory=lambda: finder, min_window=datetime.timedelta(days=1))
+        splitter.fetch({
+            "experience": "noExperience",
+            "date_from": "2024-01-01T00:00:00+00:00",
+            "date_to": "2024-01-02T00:00:00+00:00"
+        })
+        assert [found for _, found in splitter.truncated] == [5000]
+
+    def test_fetch_gets_all_pages_and_dedupes(self):
+        finder = MagicMock()
+        finder.find.side_effect = lambda **kwargs: {
+            "items": [make_vacancy(kwargs["page"] % 2, employers=1, published_at="2024-01-01T00:00:00+00:00")],
+            "found": 3,
+            "pages": 3
+        }
+        items = HHQuerySplitter(finder_factory=lambda: finder, per_page=1).fetch({"text": "python"})
+        assert finder.find.call_count == 3
+        assert sorted(item["id"] for item in items) == ["0", "1"]
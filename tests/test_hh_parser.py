@@ -105,6 +105,12 @@ class TestHHGenerateVacanciesList:
         assert vacancies_list[0].id_ == vacancy_data["id"]
         assert vacancies_list[0].name == vacancy_data["name"]
 
+    def test_iter_generate_accepts_iterator(self, vacancy_data):
+        items = (vacancy_data | {"id": str(i)} for i in range(3))
+        vacancies = HHGenerateVacanciesList(items).iter_generate()
+        assert next(vacancies).id_ == "0"
+        assert [vacancy.id_ for vacancy in vacancies] == ["1", "2"]
+
 
 class TestHHGenerateEmployersList:
     def test_generate_employers_list_creates_employer_objects(self, employer_data):
@@ -0,0 +1,62 @@
+import pytest
+from src.hh_parser import HHGenerateVacanciesList
+from src.html_text import HtmlTextConverter, description_hash, html_to_text
+from src.mock_server import make_vacancy
+from src.utils import WriteData
+
+
+class TestHtmlTextConverter:
+    def test_text_is_stored_and_reused(self, db, monkeypatch):
+        converter = HtmlTextConverter(db)
+        assert converter.text("<p>Hello <b>world</b></p>").strip() == "Hello **world**"
+        assert db.select_value("description_text")[0]["id"] == description_hash("<p>Hello <b>world</b></p>")
+
+        monkeypatch.setattr("src.html_text.html_to_text", lambda html: pytest.fail("html parsed again"))
+        assert converter.text("<p>Hello <b>world</b></p>").strip() == "Hello **world**"
+        assert HtmlTextConverter(db).text("<p>Hello <b>world</b></p>").strip() == "Hello **world**"
+
+    def test_empty_description(self):
+        assert HtmlTextConverter().texts([None, "<p>a</p>"]) == [None, html_to_text("<p>a</p>")]
+
+    def test_lru_eviction(self):
+        converter = HtmlTextConverter(cache_size=2)
+        converter.texts(["<p>1</p>", "<p>2</p>"])
+        converter.text("<p>1</p>")
+        converter.text("<p>3</p>")
+        assert list(converter.cache) == [description_hash("<p>1</p>"), description_hash("<p>3</p>")]
+
+    def test_bulk_mode_matches_single(self, db):
+        htmls = [f"<ul><li>item {i}</li></ul>" for i in range(20)] + ["<ul><li>item 0</li></ul>"]
+        converter = HtmlTextConverter(db, processes=2, bulk_threshold=10)
+        assert converter.texts(htmls) == [html_to_text(html) for html in htmls]
+        assert len(db.select_value("description_text")) == 20
+
+    def test_only_missing_keys_are_read(self, db, monkeypatch):
+        htmls = [f"<p>{i}</p>" for i in range(5)]
+        HtmlTextConverter(db).texts(htmls)
+        expected = [html_to_text(html) for html in htmls[:2]]
+        monkeypatch.setattr("src.html_text.html_to_text", lambda html: pytest.fail("html parsed again"))
+        keys = [description_hash(html) for html in htmls[:2]]
+        assert set(HtmlTextConverter(db).stored(keys)) == set(keys)
+        assert HtmlTextConverter(db).texts(htmls[:2]) == expected
+
+    def test_new_texts_are_written_by_flush_size(self, db):
+        converter = HtmlTextConverter(db, flush_size=3)
+        converter.text("<p>1</p>")
+        converter.text("<p>2</p>")
+        assert db.select_value("description_text") == []
+        assert converter.text("<p>1</p>") == html_to_text("<p>1</p>")
+        converter.text("<p>3</p>")
+        assert len(db.select_value("description_text")) == 3
+        converter.text("<p>4</p>")
+        assert converter.flush() == 1
+        assert len(db.select_value("description_text")) == 4
+
+    def test_populate_prunes_stale_texts(self, db):
+        converter = HtmlTextConverter(db)
+        converter.text("<p>old</p>")
+        vacancy = make_vacancy(1, employers=1) | {"description": "<p>live</p>"}
+        WriteData(db).add_vacancies(HHGenerateVacanciesList([vacancy]).generate())
+        assert converter.populate() == 1
+        assert [record["id"] for record in db.select_value("description_text")] == [description_hash("<p>live</p>")]
+        assert description_hash("<p>old</p>") not in converter.cache
@@ -0,0 +1,73 @@
+import json
+import pytest
+from src.hh_parser import HHGenerateVacanciesList
+from src.importer import HHImporter, iter_items
+from src.mock_server import make_vacancy
+from src.utils import ReadData, WriteData
+
+
+@pytest.fixture
+def items():
+    return [make_vacancy(i, employers=3, salary={"from": 1000, "to": None, "currency": "RUR", "gross": False})
+            for i in range(30)]
+
+
+class TestIterItems:
+    def test_formats(self, tmp_path, items):
+        (tmp_path / "items.ndjson").write_text("".join(json.dumps(item) + "\n" for item in items[:10]))
+        (tmp_path / "pages.ndjson").write_text(json.dumps({"items": items[:5]}) + "\n" + json.dumps({"items": items[5:10]}))
+        (tmp_path / "page.json").write_text(json.dumps({"items": items[:10], "found": 10}, indent=4))
+        (tmp_path / "array.json").write_text(json.dumps(items[:10]))
+        for name in ("items.ndjson", "pages.ndjson", "page.json", "array.json"):
+            assert [item["id"] for item in iter_items(str(tmp_path / name))] == [str(i) for i in range(10)]
+
+    def test_array_is_streamed(self, tmp_path, items, monkeypatch):
+        monkeypatch.setattr("src.importer.CHUNK_SIZE", 64)
+        path = tmp_path / "array.json"
+        path.write_text(json.dumps(items, indent=4))
+        with open(path, 'rb') as file:
+            monkeypatch.setattr("src.importer.open", lambda *args, **kwargs: file, raising=False)
+            generator = iter_items(str(path))
+            assert next(generator)["id"] == "0"
+            assert file.tell() < path.stat().st_size
+            assert [item["id"] for item in generator] == [str(i) for i in range(1, 30)]
+
+
+class TestHHImporter:
+    def test_import_matches_add_vacancy(self, make_db, tmp_path, items):
+        path = tmp_path / "dump.ndjson"
+        path.write_text("".join(json.dumps(item) + "\n" for item in items))
+        imported_db = make_db("imported")
+        report = HHImporter(imported_db, batch_size=7).import_files([str(path)])
+        assert report["items"] == 30 and report["imported"] == 30 and report["invalid"] == 0
+        assert report["tables"]["employer"] == 3
+
+        expected_db = make_db("expected")
+        write_data = WriteData(expected_db)
+        for vacancy in HHGenerateVacanciesList(items).generate():
+            write_data.add_vacancy(vacancy)
+        for area_name in ("vacancy", "employer", "salary", "area", "address"):
+            assert imported_db.select_value(area_name) == expected_db.select_value(area_name)
+        assert ReadData(imported_db).get_vacancy({"key": "id", "value": "4"})[0]["employer"]["id"] == "1"
+
+    def test_invalid_items_are_skipped(self, make_db, tmp_path, items):
+        items[1].pop("name")
+        items[2]["salary"] = {"from": "1000", "to": None, "currency": "RUR", "gross": False}
+        db = make_db("db")
+        importer = HHImporter(db)
+        assert importer.import_items(items[:5]) == 3
+        importer.write()
+        assert set(importer.errors) == {"1", "2"}
+        assert [record["id"] for record in db.select_value("vacancy")] == ["0", "3", "4"]
+        assert [record["vacancy_id"] for record in db.select_value("salary")] == ["0", "3", "4"]
+
+    def test_reimport_keeps_saved_description(self, make_db, tmp_path, items):
+        db = make_db("db")
+        items[0]["description"] = "<p>full</p>"
+        importer = HHImporter(db)
+        importer.import_items(items[:1])
+        importer.write()
+        items[0]["description"] = None
+        importer.import_items(items[:1])
+        importer.write()
+        assert db.select_value("vacancy")[0]["description"] == "<p>full</p>"
@@ -0,0 +1,67 @@
+import json
+import pytest
+from src.data_base import JsonDB, JsonLinesDB
+from src.metrics import Metrics, metrics
+from src.hh_parser import HHInfoVacancy
+from src.utils import CreateDB, ReadData
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+class TestMetrics:
+    def test_disabled_records_nothing(self):
+        registry = Metrics()
+        registry.inc("events_total")
+        registry.observe("seconds", 0.1)
+        assert registry.timed("seconds")(lambda: 1)() == 1
+        assert registry.to_json() == {"counters": [], "histograms": []}
+
+    def test_prometheus_export(self):
+        registry = Metrics(enabled=True, buckets=(0.1, 1.0))
+        registry.inc("events_total", 2, event="retries")
+        registry.observe("request_seconds", 0.05, scope="find")
+        registry.observe("request_seconds", 0.5, scope="find")
+        text = registry.to_prometheus()
+        assert '# TYPE hh_events_total counter\nhh_events_total{event="retries"} 2\n' in text
+        assert 'hh_request_seconds_bucket{scope="find",le="0.1"} 1' in text
+        assert 'hh_request_seconds_bucket{scope="find",le="+Inf"} 2' in text
+        assert 'hh_request_seconds_count{scope="find"} 2' in text
+
+    def test_json_export(self):
+        registry = Metrics(enabled=True, buckets=(1.0,))
+        registry.observe("seconds", 0.5, operation="get")
+        data = json.loads(registry.dump(format_="json"))
+        assert data["histograms"][0]["labels"] == {"operation": "get"}
+        assert data["histograms"][0]["mean"] == 0.5
+
+    @pytest.mark.parametrize("db_class", [JsonDB, JsonLinesDB])
+    def test_db_operations_and_bytes(self, tmp_path, enabled, db_class):
+        db = db_class(str(tmp_path / "testdb"))
+        CreateDB(db)
+        db.add_value("area", {"id": "1", "name": "Москва", "url": "https://api.hh.ru/areas/1"})
+        ReadData(db).get_area({"key": "id", "value": "1"})
+        data = enabled.to_json()
+        operations = {
+            (histogram["name"], histogram["labels"].get("operation"), histogram["labels"].get("area"))
+            for histogram in data["histograms"]
+        }
+        assert ("hh_db_operation_seconds", "add_value", "area") in operations
+        assert ("hh_db_operation_seconds", "select_value", "area") in operations
+        assert ("hh_read_data_seconds", "get_area", None) in operations
+        counters = {(counter["name"], counter["labels"]["area"]): counter["value"] for counter in data["counters"]}
+        assert counters[("hh_db_bytes_written_total", "area")] > 0
+        assert counters[("hh_db_bytes_read_total", "area")] > 0
+
+    def test_api_request_metrics(self, enabled, requests_mock):
+        requests_mock.get("https://api.hh.ru/vacancies/1", json={"id": "1"})
+        HHInfoVacancy(1).info()
+        data = enabled.to_json()
+        assert {"operation": "query", "scope": "info_vacancy"} in [h["labels"] for h in data["histograms"]]
+        assert {"name": "hh_api_events_total", "labels": {"event": "requests"}, "value": 1} in data["counters"]
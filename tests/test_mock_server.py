@@ -0,0 +1,54 @@
+import pytest
+import requests
+from src.api_parser import ApiBase
+from src.hh_parser import API_URL, SCOPES, HHFindVacancy, HHInfoEmployer
+from src.load_test import mock_scopes, run_load
+from src.mock_server import MockHHServer
+
+
+@pytest.fixture
+def server():
+    with MockHHServer(vacancies=250, employers=10, seed=1) as server:
+        yield server
+
+
+class TestMockHHServer:
+    def test_pagination(self, server):
+        page = requests.get(f"{server.url}/vacancies", params={"page": 2, "per_page": 100}).json()
+        assert page["found"] == 250
+        assert page["pages"] == 3
+        assert [item["id"] for item in page["items"]] == [str(i) for i in range(200, 250)]
+        assert requests.get(f"{server.url}/vacancies", params={"page": 20, "per_page": 100}).status_code == 400
+
+    def test_info_and_not_found(self, server):
+        vacancy = requests.get(f"{server.url}/vacancies/7").json()
+        assert vacancy["id"] == "7" and vacancy["description"]
+        assert requests.get(f"{server.url}/employers/10").status_code == 404
+
+    def test_throttle_and_errors(self):
+        with MockHHServer(throttle_rate=0.5, error_rate=0.5, retry_after=3, seed=1) as server:
+            responses = [requests.get(f"{server.url}/vacancies/1") for _ in range(10)]
+        assert {response.status_code for response in responses} == {429, 503}
+        assert all(response.headers["Retry-After"] == "3" for response in responses if response.status_code == 429)
+        assert server.hits[429] + server.hits[503] == 10
+
+    def test_clients_through_mock_scopes(self, server):
+        with mock_scopes(server.url):
+            assert HHFindVacancy().find(per_page=10)["found"] == 250
+            meta = {}
+            assert len(list(HHFindVacancy().find(per_page=10, stream=True, meta=meta))) == 10
+            assert meta["found"] == 250 and meta["pages"] == 25
+            assert HHInfoEmployer(3).info()["id"] == "3"
+        assert SCOPES["find_vacancies"] == f"{API_URL}/vacancies"
+
+
+class TestLoadTest:
+    def test_run_load_report(self, server):
+        with mock_scopes(server.url):
+            report = run_load("info_vacancy", requests=20, concurrency=4)
+        assert report["requests"] == 20
+        assert report["errors"] == {}
+        assert report["p50"] <= report["p95"] <= report["p99"]
+        assert report["rps"] > 0
+        assert report["client"]["coalesced"] == 0
+        assert ApiBase.coalesce
@@ -0,0 +1,48 @@
+import json
+import os
+import pytest
+from src.profiling import ProfileSession, ScriptedInput
+from src.user_interface import WidgetCLI
+
+
+class FakeUI:
+    def start(self):
+        WidgetCLI("Главное меню", "", [{"text": "Список", "action": self.slow_list}]).show()
+
+    def slow_list(self):
+        total = sum(i * i for i in range(300000))
+        WidgetCLI("Список", str(total), [{"text": "Назад", "action": self.start}]).show()
+
+    def html2txt(self, html):
+        return html
+
+
+@pytest.fixture(autouse=True)
+def no_clear(monkeypatch):
+    monkeypatch.setattr(WidgetCLI, "clear", staticmethod(lambda: None))
+
+
+class TestProfileSession:
+    @pytest.mark.parametrize("profiler", ["sampling", "cprofile"])
+    def test_replay_session_writes_results(self, tmp_path, profiler, capsys):
+        output_dir = str(tmp_path / "profile")
+        with pytest.raises(SystemExit):
+            with ProfileSession(output_dir, profiler, interval=0.001, input_func=ScriptedInput(["1", "1", "1"])) as session:
+                session.instrument(FakeUI()).start()
+        with open(os.path.join(output_dir, "screens.json")) as file:
+            screens = json.load(file)
+        assert screens["start"]["count"] == 2
+        assert screens["slow_list"]["count"] == 2
+        assert "html2txt" not in screens
+        assert os.path.exists(os.path.join(output_dir, "memory.txt"))
+        if profiler == "sampling":
+            with open(os.path.join(output_dir, "stacks.folded")) as file:
+                assert "slow_list" in file.read()
+        else:
+            assert os.path.exists(os.path.join(output_dir, "session.prof"))
+
+    def test_scripted_input_from_file(self, tmp_path):
+        path = tmp_path / "replay.txt"
+        path.write_text("# сценарий\n2\n\npython\n")
+        replay = ScriptedInput.from_file(str(path))
+        assert [replay(), replay(), replay()] == ["2", "python", "exit"]
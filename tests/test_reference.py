@@ -0,0 +1,121 @@
+import datetime
+import json
+import pytest
+from src.data_base import JsonDB
+from src.utils import CreateDB, ReadData
+from src.reference import AreaTree, ReferenceCache, CACHE_VERSION
+
+
+DICTIONARIES = {
+    "experience": [{"id": "noExperience", "name": "Нет опыта"}, {"id": "between1And3", "name": "От 1 года до 3 лет"}],
+    "employment": [{"id": "full", "name": "Полная занятость"}],
+    "schedule": [{"id": "remote", "name": "Удаленная работа"}],
+    "currency": [{"code": "RUR", "abbr": "₽", "name": "Рубли", "rate": 1.0}]
+}
+AREAS = [
+    {"id": "113", "parent_id": None, "name": "Россия", "areas": [
+        {"id": "1", "parent_id": "113", "name": "Москва", "areas": []}
+    ]}
+]
+INDUSTRIES = [{"id": "7", "name": "IT", "industries": [{"id": "7.540", "name": "Разработка"}]}]
+
+
+def make_clients(calls: list) -> dict:
+    def client(data):
+        class Client:
+            def info(self):
+                calls.append(data)
+                return data
+        return Client
+    return {"dictionaries": client(DICTIONARIES), "areas": client(AREAS), "industries": client(INDUSTRIES)}
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def cache(tmp_path, calls):
+    return ReferenceCache(str(tmp_path / "reference.json"), clients=make_clients(calls))
+
+
+class TestReferenceCache:
+    def test_lookups(self, cache):
+        assert cache.name("experience", "noExperience") == "Нет опыта"
+        assert cache.id_("schedule", "Удаленная работа") == "remote"
+        assert cache.name("currency", "RUR") == "Рубли"
+        assert cache.name("area", "1") == "Москва"
+        assert cache.name("industry", "7.540") == "Разработка"
+        assert cache.name("area", "0") is None
+
+    def test_load_uses_disk_cache_until_ttl_or_version_change(self, tmp_path, cache, calls):
+        cache.load()
+        assert len(calls) == 3
+        ReferenceCache(cache.path, clients=make_clients(calls)).load()
+        assert len(calls) == 3
+        with open(cache.path) as file:
+            data = json.load(file)
+        data["loaded_at"] = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=2)).isoformat()
+        with open(cache.path, "w") as file:
+            json.dump(data, file)
+        ReferenceCache(cache.path, clients=make_clients(calls)).load()
+        assert len(calls) == 6
+        data["version"] = CACHE_VERSION + 1
+        assert not cache.is_fresh(data)
+
+    def test_sections_are_loaded_on_demand(self, cache, calls):
+        assert cache.items("currency")[0]["code"] == "RUR"
+        assert calls == [DICTIONARIES]
+        assert cache.name("area", "1") == "Москва"
+        assert calls == [DICTIONARIES, AREAS]
+        assert ReferenceCache(cache.path, clients=make_clients(calls)).name("experience", "noExperience")
+        assert len(calls) == 2
+
+    def test_populate_fills_reference_tables(self, tmp_path, cache):
+        db = JsonDB(str(tmp_path / "testdb"))
+        CreateDB(db)
+        assert cache.populate(db) == {"experience": 2, "employment": 1, "schedule": 1, "area": 2}
+        read_data = ReadData(db)
+        assert read_data.get_area({"key": "id", "value": "1"})[0]["url"] == "https://api.hh.ru/areas/1"
+        assert len(read_data.get_experience()) == 2
+
+
+TREE = [
+    {"id": "113", "name": "Россия", "areas": [
+        {"id": "1", "name": "Москва", "areas": []},
+        {"id": "1146", "name": "Сибирь", "areas": [
+            {"id": "4", "name": "Новосибирск", "areas": []},
+            {"id": "1217", "name": "Алтайский край", "areas": [{"id": "11", "name": "Барнаул", "areas": []}]}
+        ]}
+    ]},
+    {"id": "40", "name": "Казахстан", "areas": []}
+]
+
+
+class TestAreaTree:
+    def test_hierarchy(self):
+        tree = AreaTree(TREE)
+        assert len(tree) == 7
+        assert tree.children() == ["113", "40"]
+        assert tree.children("1146") == ["4", "1217"]
+        assert tree.parent("11") == "1217"
+        assert tree.ancestors("11") == ["1217", "1146", "113"]
+        assert tree.descendants("1146") == ["1146", "4", "1217", "11"]
+
+    def test_is_descendant(self):
+        tree = AreaTree(TREE)
+        assert tree.is_descendant("11", "1146")
+        assert tree.is_descendant("1146", "1146")
+        assert not tree.is_descendant("1", "1146")
+        assert not tree.is_descendant("40", "113")
+        assert not tree.is_descendant("999", "113")
+
+    def test_filter(self):
+        tree = AreaTree(TREE)
+        items = [{"id": "1", "area": {"id": "11"}}, {"id": "2", "area_id": "1"}, {"id": "3", "area": None}]
+        assert tree.filter(items, "1146") == items[:1]
+        assert tree.filter(items, "113") == items[:2]
+
+    def test_cache_area_tree(self, cache):
+        assert cache.area_tree().children("113") == ["1"]
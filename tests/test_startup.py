@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from src.config import ROOT_DIR
+from src.user_interface import UserInterface
+
+# бюджет времени импорта main.py в мс / main.py import time budget in ms
+IMPORT_BUDGET_MS = int(os.environ.get("HH_IMPORT_BUDGET_MS", "500"))
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """
+    Cumulative import time in microseconds by module (python -X importtime).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    def test_main_import_budget(self):
+        times = import_times("import main")
+        assert "html2text" not in times
+        assert "src.profiling" not in times
+        for module in ("src.currency", "src.reference", "src.dedup", "src.html_text"):
+            assert module not in times
+        assert times["main"] / 1000 < IMPORT_BUDGET_MS
+
+    def test_user_interface_is_lazy(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.user_interface.DB_DIR", str(tmp_path / "db"))
+        ui = UserInterface()
+        assert not os.path.exists(tmp_path / "db")
+        assert ui.read_data.db is ui.write_data.db
+        assert os.path.exists(tmp_path / "db" / "vacancy.json")
+        assert ui.html2txt("<p>text</p>").strip() == "text"
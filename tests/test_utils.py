@@ -0,0 +1,165 @@
+import pytest
+import requests
+from unittest.mock import patch
+from src.data_base import JsonDB
+from src.hh_parser import HHVacancy, HHGenerateVacanciesList
+from src.geo import GridIndex
+from src.api_errors import ApiQueryError, CircuitOpenError
+from src.utils import CreateDB, WriteData, ReadData, SyncData, EmployerEnricher
+
+
+@pytest.fixture
+def vacancy_data():
+    return {
+        "id": "1",
+        "name": "Software Engineer",
+        "created_at": "2021-01-01T00:00:00",
+        "published_at": "2021-01-01T00:00:00",
+        "alternate_url": "http://example.com/vacancy/1",
+        "employer": {"id": "1", "name": "ExampleCorp", "alternate_url": "http://example.com/employer/1"},
+        "salary": {"from": 1000, "to": 2000, "currency": "USD"},
+        "area": {"id": "1", "name": "Remote", "url": "http://example.com/area/1"},
+        "experience": {"id": "1", "name": "No experience"},
+        "employment": {"id": "1", "name": "Full time"},
+        "schedule": {"id": "1", "name": "Flexible"},
+        "description": "Job description here"
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = JsonDB(str(tmp_path / "testdb"))
+    CreateDB(db)
+    return db
+
+
+class TestWriteData:
+    def test_add_vacancy_does_not_duplicate_refetched_vacancy(self, db, vacancy_data):
+        write_data = WriteData(db)
+        write_data.add_vacancy(HHVacancy.create(**vacancy_data))
+        changed = vacancy_data | {"published_at": "2021-02-01T00:00:00", "salary": {"from": 1500, "to": 2000, "currency": "USD"}}
+        changes = write_data.add_vacancy(HHVacancy.create(**changed))
+        assert changes == {"published_at": "2021-02-01T00:00:00", "salary": {"from": 1500}}
+        vacancies = ReadData(db).get_vacancy()
+        assert len(vacancies) == 1
+        assert vacancies[0]["salary"]["from"] == 1500
+
+    def test_add_vacancy_keeps_saved_description(self, db, vacancy_data):
+        write_data = WriteData(db)
+        write_data.add_vacancy(HHVacancy.create(**vacancy_data))
+        assert write_data.add_vacancy(HHVacancy.create(**(vacancy_data | {"description": None}))) == {}
+        assert ReadData(db).get_vacancy()[0]["description"] == "Job description here"
+
+    def test_add_vacancy_without_reference_writes(self, db, vacancy_data):
+        WriteData(db, write_references=False).add_vacancy(HHVacancy.create(**vacancy_data))
+        read_data = ReadData(db)
+        assert len(read_data.get_vacancy()) == 1
+        assert read_data.get_area() == []
+        assert read_data.get_experience() == []
+
+    def test_add_vacancy_persists_address(self, db, vacancy_data):
+        address = {"lat": 55.75, "lng": 37.61, "city": "Москва", "raw": "Москва, Красная площадь"}
+        vacancy = HHGenerateVacanciesList([vacancy_data | {"address": address}]).generate()[0]
+        WriteData(db).add_vacancy(vacancy)
+        assert ReadData(db).get_address() == [{"vacancy_id": "1"} | address]
+        assert GridIndex.from_db(db).nearest(55.7, 37.6, 1)[0][0] == "1"
+
+    def test_add_vacancies_writes_each_table_once(self, db, vacancy_data):
+        items = [vacancy_data | {"id": str(i)} for i in range(1, 4)]
+        with patch.object(db, "dump_area", wraps=db.dump_area) as dump_area:
+            written = WriteData(db).add_vacancies(HHGenerateVacanciesList(items).generate())
+        assert written["vacancy"] == 3 and written["salary"] == 3
+        assert dump_area.call_count == len(written)
+        assert [vacancy["id"] for vacancy in ReadData(db).get_vacancy()] == ["1", "2", "3"]
+
+
+class TestSyncData:
+    def test_sync_vacancies_writes_only_changed(self, db, vacancy_data):
+        WriteData(db).add_vacancy(HHVacancy.create(**vacancy_data))
+        with patch("src.hh_parser.HHInfoVacancy.info") as mock_info:
+            mock_info.return_value = vacancy_data | {"name": "Senior Software Engineer"}
+            result = SyncData(db).sync_vacancies()
+        assert result == {"1": {"name": "Senior Software Engineer"}}
+        assert ReadData(db).get_vacancy()[0]["name"] == "Senior Software Engineer"
+
+    def test_sync_vacancies_collects_errors(self, db, vacancy_data):
+        WriteData(db).add_vacancy(HHVacancy.create(**vacancy_data))
+        with patch("src.hh_parser.HHInfoVacancy.info") as mock_info:
+            mock_info.side_effect = ApiQueryError("Not Found")
+            sync = SyncData(db)
+            assert sync.sync_vacancies() == {}
+        assert sync.errors == {"1": "Not Found"}
+
+
+class TestEmployerEnricher:
+    def test_enrich_fetches_each_unseen_employer_once(self, db, vacancy_data):
+        vacancies = [
+            HHVacancy.create(**(vacancy_data | {"id": str(i), "employer": vacancy_data["employer"] | {"id": str(i % 2)}}))
+            for i in range(6)
+        ]
+        employer_info = {
+            "name": "ExampleCorp",
+            "alternate_url": "http://example.com/employer/1",
+            "description": "Employer description",
+            "site_url": "http://example.com",
+            "logo_urls": {"original": "http://example.com/logo.png"}
+        }
+        calls = []
+
+        class InfoEmployer:
+            def __init__(self, id_):
+                self.id_ = id_
+
+            def info(self):
+                calls.append(self.id_)
+                return employer_info | {"id": self.id_}
+
+        enricher = EmployerEnricher(db, info_class=InfoEmployer)
+        assert enricher.enrich(vacancies) == 2
+        assert sorted(calls) == ["0", "1"]
+        employers = ReadData(db).get_employer()
+        assert {employer["description"] for employer in employers} == {"Employer description"}
+        assert employers[0]["logo_urls"]["original"] == "http://example.com/logo.png"
+        # повторный запуск не делает запросов, пока данные не устарели
+        assert enricher.enrich(vacancies) == 0
+        assert len(calls) == 2
+
+    def test_employer_without_description_is_not_refetched(self, db, vacancy_data):
+        vacancies = [HHVacancy.create(**vacancy_data)]
+        calls = []
+
+        class InfoEmployer:
+            def __init__(self, id_):
+                self.id_ = id_
+
+            def info(self):
+                calls.append(self.id_)
+                return {"id": self.id_, "name": "ExampleCorp", "alternate_url": "", "description": ""}
+
+        enricher = EmployerEnricher(db, info_class=InfoEmployer)
+        assert enricher.enrich(vacancies) == 1
+        assert enricher.enrich(vacancies) == 0
+        assert calls == ["1"]
+
+    def test_fetch_collects_network_and_circuit_errors(self, db):
+        class InfoEmployer:
+            def __init__(self, id_):
+                self.id_ = id_
+
+            def info(self):
+                if self.id_ == "1":
+                    raise requests.ConnectionError("offline")
+                raise CircuitOpenError("circuit open")
+
+        enricher = EmployerEnricher(db, info_class=InfoEmployer)
+        assert enricher.enrich_ids(["1", "2"]) == 0
+        assert set(enricher.errors) == {"1", "2"}
+
+
+class TestUpsertMany:
+    def test_upsert_many_writes_once_and_reports_changes(self, db):
+        records = [{"id": str(i), "name": f"Area {i}", "url": f"http://example.com/area/{i}"} for i in range(3)]
+        assert WriteData(db).db.upsert_many("area", records, ["id"]) == records
+        changed = records[:2] + [records[2] | {"name": "Renamed"}]
+        assert db.upsert_many("area", changed, ["id"]) == [{}, {}, {"name": "Renamed"}]
+        assert ReadData(db).get_area({"key": "id", "value": "2"})[0]["name"] == "Renamed"